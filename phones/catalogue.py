@@ -0,0 +1,171 @@
+from __future__ import annotations
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Sequence, Tuple
+import threading
+import uuid
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import F
+
+from .models import CatalogueVersion, Phone
+from .rescore import STORED_SCORE_FIELDS, stored_or_scored
+
+_VERSION_PK = 1
+
+# Process-local state: the current snapshot plus structures derived from it
+_lock = threading.Lock()
+_snapshot: "Catalogue | None" = None
+_derived: Dict[str, Tuple[str, Any]] = {}
+_batch = threading.local()
+
+
+# Catalogue version
+# Read the (version, token) pair; a missing row means an untouched catalogue.
+def _version_query():
+    return CatalogueVersion.objects.filter(pk=_VERSION_PK).values_list("version", "token")
+
+def _read_version() -> Tuple[int, str]:
+    return _version_query().first() or (0, "")
+
+def _stamp(version: int, token: str) -> str:
+    return f"{version}-{token}" if token else str(version)
+
+def catalogue_version() -> int:
+    return _read_version()[0]
+
+# Version plus token, unique across rollbacks; use this for cache keys.
+def catalogue_stamp() -> str:
+    return _stamp(*_read_version())
+
+async def acatalogue_stamp() -> str:
+    return _stamp(*(await _version_query().afirst() or (0, "")))
+
+def bump_catalogue_version() -> int:
+    token = uuid.uuid4().hex
+    with transaction.atomic():
+        updated = CatalogueVersion.objects.filter(pk=_VERSION_PK).update(
+            version=F("version") + 1, token=token,
+        )
+        if not updated:
+            CatalogueVersion.objects.create(pk=_VERSION_PK, version=1, token=token)
+    return catalogue_version()
+
+# Called on every Phone write; defers the bump while a batch is open.
+def notify_catalogue_changed() -> None:
+    if getattr(_batch, "depth", 0):
+        _batch.dirty = True
+    else:
+        bump_catalogue_version()
+
+# Group many Phone writes (e.g. an import) into a single version bump.
+@contextmanager
+def catalogue_batch():
+    depth = getattr(_batch, "depth", 0)
+    if depth == 0:
+        _batch.dirty = False
+    _batch.depth = depth + 1
+    try:
+        yield
+    finally:
+        _batch.depth = depth
+        if depth == 0 and _batch.dirty:
+            _batch.dirty = False
+            bump_catalogue_version()
+
+
+# In-memory snapshot
+@dataclass(frozen=True)
+class Catalogue:
+    stamp: str
+    version: int
+    # Serialized phones plus "id" and precomputed scores, ordered by pk.
+    # Row position is the bit position used by the in-memory indexes.
+    rows: Sequence[Dict[str, Any]] = field(default_factory=list)
+    by_id: Dict[int, int] = field(default_factory=dict)
+    by_slug: Dict[str, int] = field(default_factory=dict)
+
+    def __len__(self) -> int:
+        return len(self.rows)
+
+# Rows come from plain values_list tuples (the lean ranking path) plus the stored score
+# columns; no Phone instances or serializers, since this runs under _lock on every bump
+def _build_catalogue(version: int, stamp: str) -> Catalogue:
+    from .ranking import LEAN_FIELDS, card_from_row, spec_from_row
+
+    rows, by_id, by_slug = [], {}, {}
+    width = len(LEAN_FIELDS)
+    qs = Phone.objects.order_by("pk").values_list(*LEAN_FIELDS, *STORED_SCORE_FIELDS)
+    for pos, row in enumerate(qs.iterator(chunk_size=2000)):
+        # Raw/value scores do not depend on the requested mode; reuse stored ones when fresh
+        smartbuy, raw, breakdown = stored_or_scored(row[width:], lambda: spec_from_row(row))
+        data = card_from_row(row)
+        data["id"] = row[0]
+        data["smartbuy_score"] = float(smartbuy)
+        data["raw_score"] = float(raw)
+        data["score_breakdown"] = breakdown
+        rows.append(data)
+        by_id[row[0]] = pos
+        by_slug[data["slug"]] = pos
+    return Catalogue(stamp=stamp, version=version, rows=rows, by_id=by_id, by_slug=by_slug)
+
+def _index(rows: Sequence[Dict[str, Any]]) -> Tuple[Dict[int, int], Dict[str, int]]:
+    by_id, by_slug = {}, {}
+    for pos, row in enumerate(rows):
+        by_id[row["id"]] = pos
+        by_slug[row["slug"]] = pos
+    return by_id, by_slug
+
+# With CATALOGUE_SNAPSHOT_PATH set, rows come from the shared mmap'd file; the
+# first process to see a new version rebuilds from the ORM and swaps the file.
+def _load_catalogue(version: int, stamp: str) -> Catalogue:
+    path = getattr(settings, "CATALOGUE_SNAPSHOT_PATH", None)
+    if not path:
+        return _build_catalogue(version, stamp)
+    from .snapshot import open_snapshot, write_snapshot
+
+    mapped = open_snapshot(path)
+    if mapped is None or mapped[0] != stamp:
+        built = _build_catalogue(version, stamp)
+        write_snapshot(path, stamp, built.rows)
+        mapped = open_snapshot(path)
+        if mapped is None or mapped[0] != stamp:
+            # Another process swapped in a different version meanwhile
+            return built
+    rows = mapped[1]
+    by_id, by_slug = _index(rows)
+    return Catalogue(stamp=stamp, version=version, rows=rows, by_id=by_id, by_slug=by_slug)
+
+# Build the current catalogue from the ORM and write it to the snapshot file at ``path``
+def write_catalogue_snapshot(path: str) -> Catalogue:
+    from .snapshot import write_snapshot
+
+    version, token = _read_version()
+    catalogue = _build_catalogue(version, _stamp(version, token))
+    write_snapshot(path, catalogue.stamp, catalogue.rows)
+    return catalogue
+
+# Return the snapshot for the current version, rebuilding it after a bump.
+def get_catalogue() -> Catalogue:
+    global _snapshot
+    version, token = _read_version()
+    stamp = _stamp(version, token)
+    snap = _snapshot
+    if snap is not None and snap.stamp == stamp:
+        return snap
+    with _lock:
+        if _snapshot is None or _snapshot.stamp != stamp:
+            _snapshot = _load_catalogue(version, stamp)
+            _derived.clear()
+        return _snapshot
+
+# Memoize a structure built from the snapshot until the next version bump.
+def derived(name: str, build: Callable[[Catalogue], Any], catalogue: Catalogue | None = None) -> Any:
+    cat = catalogue if catalogue is not None else get_catalogue()
+    hit = _derived.get(name)
+    if hit is not None and hit[0] == cat.stamp:
+        return hit[1]
+    value = build(cat)
+    _derived[name] = (cat.stamp, value)
+    return value
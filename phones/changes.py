@@ -0,0 +1,71 @@
+from __future__ import annotations
+from contextlib import ExitStack, contextmanager
+from typing import Any, Dict, Iterable, List, Tuple
+
+from django.db import transaction
+
+from .catalogue import catalogue_batch, catalogue_version
+from .models import CatalogueChange, Phone
+from .ranking import LEAN_FIELDS, card_from_row, spec_from_row
+from .rescore import STORED_SCORE_FIELDS, stored_or_scored, write_scores
+from .scoring import SCORING_PROFILE_VERSION
+
+Snapshot = Dict[str, Tuple[Dict[str, Any], float]]
+
+
+# Card (API representation) and raw score for each slug that exists. Scores come from the
+# stored columns; only stale rows are scored, and with ``store`` those scores are written
+# back so the rescore after an import doesn't compute them again.
+def _snapshot(slugs: Iterable[str], store: bool = False) -> Snapshot:
+    out: Snapshot = {}
+    scored = []
+    rows = Phone.objects.filter(slug__in=list(slugs)).values_list(*LEAN_FIELDS, *STORED_SCORE_FIELDS)
+    for row in rows:
+        stored = row[len(LEAN_FIELDS):]
+        smartbuy, raw, breakdown = stored_or_scored(stored, lambda: spec_from_row(row))
+        if store and stored[-1] != SCORING_PROFILE_VERSION:
+            scored.append((row[0], float(raw), float(smartbuy), breakdown))
+        card = card_from_row(row)
+        out[card["slug"]] = (card, float(raw))
+    if scored:
+        write_scores([scored])
+    return out
+
+def diff_snapshots(before: Snapshot, after: Snapshot, version: int) -> List[CatalogueChange]:
+    changes = []
+    for slug in sorted(before.keys() | after.keys()):
+        old_card, old_score = before.get(slug, ({}, None))
+        new_card, new_score = after.get(slug, ({}, None))
+        fields = {
+            k: [old_card.get(k), new_card.get(k)]
+            for k in old_card.keys() | new_card.keys()
+            if old_card.get(k) != new_card.get(k)
+        }
+        if not fields and old_score == new_score:
+            continue
+        action = (CatalogueChange.CREATED if not old_card
+                  else CatalogueChange.DELETED if not new_card else CatalogueChange.UPDATED)
+        changes.append(CatalogueChange(
+            version=version, slug=slug, action=action, changed_fields=dict(sorted(fields.items())),
+            old_score=old_score, new_score=new_score,
+        ))
+    return changes
+
+@contextmanager
+def record_changes(slugs: Iterable[str]):
+    """Append a CatalogueChange row per phone among ``slugs`` that differs on exit.
+
+    The writes run in a ``catalogue_batch``; its version bump and the change rows
+    commit in one transaction, so the feed never lags the version it describes.
+    Open this inside the ``transaction.atomic()`` that publishes the writes, if
+    there is one, and the data commits with them too.
+    """
+    slugs = set(slugs)
+    before = _snapshot(slugs)
+    with ExitStack() as batch:
+        batch.enter_context(catalogue_batch())
+        yield
+        with transaction.atomic():
+            batch.close()
+            changes = diff_snapshots(before, _snapshot(slugs, store=True), catalogue_version())
+            CatalogueChange.objects.bulk_create(changes, batch_size=500)
@@ -0,0 +1,70 @@
+from __future__ import annotations
+from typing import Any, Dict, List, Sequence
+
+from .catalogue import Catalogue
+
+# Upper bound on phones per comparison (GET and POST)
+COMPARE_MAX_SLUGS = 50
+
+# Columns where lower is better; every other winner column is higher-is-better
+_LOWER_IS_BETTER = {"price_sgd"}
+_SCORE_COLUMNS = ("raw_score", "smartbuy_score", "price_sgd")
+# Snapshot keys that are not spec columns
+_HIDDEN = {"id", "score_breakdown"}
+
+
+# Accept "a,b,c" or ["a", "b"]; strip, drop blanks and keep first-seen order
+def parse_slugs(value: Any) -> List[str]:
+    if isinstance(value, str):
+        value = value.split(",")
+    if not isinstance(value, (list, tuple)):
+        raise ValueError("slugs must be a list or comma-separated string")
+    seen: Dict[str, None] = {}
+    for s in value:
+        if not isinstance(s, str):
+            raise ValueError("slugs must be strings")
+        if s.strip():
+            seen.setdefault(s.strip(), None)
+    return list(seen)
+
+def _number(value: Any) -> float | None:
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return None
+
+# Slugs sharing the best value in a column; None when nothing is comparable
+def _winners(slugs: Sequence[str], values: Sequence[Any], lower: bool = False) -> List[str] | None:
+    nums = [(n, s) for s, v in zip(slugs, values) if (n := _number(v)) is not None and not (lower and n <= 0)]
+    if not nums:
+        return None
+    best = min(n for n, _ in nums) if lower else max(n for n, _ in nums)
+    return [s for n, s in nums if n == best]
+
+def compare(catalogue: Catalogue, slugs: Sequence[str]) -> Dict[str, Any]:
+    """Columnar comparison of the given phones; unknown slugs are listed in ``missing``.
+
+    ``columns`` maps each spec field to one value per phone (in request order),
+    ``breakdown`` does the same per score section, and ``winners`` names the
+    phone(s) with the best value per section and headline score.
+    """
+    found = [catalogue.rows[catalogue.by_slug[s]] for s in slugs if s in catalogue.by_slug]
+    missing = [s for s in slugs if s not in catalogue.by_slug]
+    order = [row["slug"] for row in found]
+
+    columns: Dict[str, List[Any]] = {}
+    for row in found:
+        for key, value in row.items():
+            if key not in _HIDDEN:
+                columns.setdefault(key, []).append(value)
+
+    sections: List[str] = []
+    for row in found:
+        sections += [s for s in (row.get("score_breakdown") or {}) if s not in sections]
+    breakdown = {s: [(row.get("score_breakdown") or {}).get(s) for row in found] for s in sections}
+
+    winners = {s: _winners(order, vals) for s, vals in breakdown.items()}
+    for col in _SCORE_COLUMNS:
+        winners[col] = _winners(order, columns.get(col, []), lower=col in _LOWER_IS_BETTER)
+
+    return {"slugs": order, "missing": missing, "columns": columns, "breakdown": breakdown, "winners": winners}
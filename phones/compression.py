@@ -0,0 +1,60 @@
+import gzip
+
+try:
+    import brotli
+except ImportError:  # optional dependency; gzip only without it
+    brotli = None
+
+# Bodies smaller than this are not worth compressing
+MIN_COMPRESS_SIZE = 200
+GZIP_LEVEL = 9
+BROTLI_QUALITY = 9
+
+# Supported content codings, preferred first
+def available_encodings() -> tuple:
+    return ("br", "gzip") if brotli is not None else ("gzip",)
+
+# Pick a content coding from an Accept-Encoding header ("identity" when none fits)
+def negotiate_encoding(accept_encoding: str | None) -> str:
+    prefs = {}
+    for part in (accept_encoding or "").split(","):
+        token, _, params = part.strip().partition(";")
+        q = 1.0
+        if params.strip().startswith("q="):
+            try:
+                q = float(params.strip()[2:])
+            except ValueError:
+                q = 0.0
+        if token:
+            prefs[token.strip().lower()] = q
+
+    best, best_q = "identity", 0.0
+    for enc in available_encodings():
+        q = prefs.get(enc, prefs.get("*", 0.0))
+        if q > best_q:
+            best, best_q = enc, q
+    return best
+
+def compress(body: bytes, encoding: str) -> bytes:
+    if encoding == "gzip":
+        return gzip.compress(body, compresslevel=GZIP_LEVEL, mtime=0)
+    if encoding == "br":
+        return brotli.compress(body, quality=BROTLI_QUALITY)
+    return body
+
+def decompress(body: bytes, encoding: str | None) -> bytes:
+    if encoding == "gzip":
+        return gzip.decompress(body)
+    if encoding == "br":
+        return brotli.decompress(body)
+    return body
+
+# Raw bytes plus compressed variants (all supported codings by default),
+# built once so cached payloads are never recompressed per request
+def encode_variants(body: bytes, encodings=None) -> dict:
+    variants = {"identity": body}
+    if len(body) >= MIN_COMPRESS_SIZE:
+        for enc in encodings or available_encodings():
+            if enc != "identity":
+                variants[enc] = compress(body, enc)
+    return variants
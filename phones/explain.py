@@ -0,0 +1,164 @@
+from __future__ import annotations
+from dataclasses import replace
+from typing import Any, Dict, List, Tuple
+
+from .catalogue import Catalogue, derived
+from .scoring import (
+    _BATTERY_TIERS, _CAMERA_RAW_MAX, _CHARGING_TIERS, _IP_SCORES, _MOHS_FLOOR, _MOHS_TIERS,
+    _OLED_UNKNOWN_BASELINE, _PIPELINE_PRIOR, _PPI_TIERS, _RAM_TIERS, _REFRESH_TIERS,
+    _RES_TIERS, _ROM_TIERS, _SOC_TIERS, _W, _camera_raw_score, _glass_baseline, _ip_score,
+    MAX_SCORE, SCORING_PROFILE_VERSION, PhoneSpec, calculate_raw_score, calculate_smartbuy_score,
+)
+
+# Explanations kept per catalogue version before the cache is reset
+MAX_CACHED_EXPLANATIONS = 1024
+
+# (section, factor, PhoneSpec field, tier table, points below the lowest tier)
+_TIERED: Tuple[Tuple[str, str, str, tuple, float], ...] = (
+    ("soc", "soc_score", "soc_score", _SOC_TIERS, 0.0),
+    ("ram", "ram_gb", "ram_gb", _RAM_TIERS, 0.0),
+    ("storage", "storage_gb", "storage_gb", _ROM_TIERS, 0.0),
+    ("display", "refresh_hz", "refresh_hz", _REFRESH_TIERS, 0.0),
+    ("display", "resolution", "short_side", _RES_TIERS, 0.0),
+    ("display", "ppi", "ppi", _PPI_TIERS, 0.0),
+    ("battery", "battery_mah", "battery_mah", _BATTERY_TIERS, 0.0),
+    ("charging", "charging_w", "charging_w", _CHARGING_TIERS, 0.0),
+    ("durability", "mohs", "mohs", _MOHS_TIERS, _MOHS_FLOOR),
+)
+# (section, factor, PhoneSpec field) for yes/no factors
+_FLAGS: Tuple[Tuple[str, str, str], ...] = (
+    ("display", "oled", "oled"),
+    ("camera", "ois", "has_ois"),
+    ("camera", "ultrawide", "useful_ultrawide"),
+    ("extras", "5g", "has_5g"),
+    ("extras", "nfc", "has_nfc"),
+    ("extras", "stereo_speakers", "has_stereo_speakers"),
+)
+# Main camera megapixels at which the MP component saturates
+_CAMERA_FULL_MP = 50.0
+_SELFIE_FULL_MP = 32.0
+_IP_LADDER = sorted((k for k in _IP_SCORES if k != "UNKNOWN"), key=_IP_SCORES.get)
+
+
+# Overall raw score change if ``spec`` had ``field`` set to ``value``
+def _gain(spec: PhoneSpec, raw: float, field: str, value: Any) -> float:
+    return round(calculate_raw_score(replace(spec, **{field: value}))[0] - raw, 4)
+
+# Tier hit and the next threshold up for one table-driven factor
+def _tier_factor(spec: PhoneSpec, raw: float, name: str, field: str, tiers: tuple,
+                 floor: float) -> Dict[str, Any]:
+    value = getattr(spec, field)
+    hit = len(tiers) if value is None else next(
+        (i for i, (threshold, _) in enumerate(tiers) if value >= threshold), len(tiers),
+    )
+    if hit < len(tiers):
+        points = tiers[hit][1]
+    else:
+        points = floor if value is not None else 0.0
+    factor: Dict[str, Any] = {
+        "factor": name,
+        "input": value,
+        "tier": tiers[hit][0] if hit < len(tiers) else None,
+        "points": points,
+        "level": len(tiers) - hit,
+        "levels": len(tiers),
+        "next": None,
+    }
+    # An unknown input is not a tier the phone can climb from
+    if value is not None and hit > 0:
+        threshold, _ = tiers[hit - 1]
+        factor["next"] = {
+            "target": threshold, "gap": round(threshold - value, 4),
+            "score_gain": _gain(spec, raw, field, threshold),
+        }
+    return factor
+
+def _flag_factor(spec: PhoneSpec, raw: float, name: str, field: str) -> Dict[str, Any]:
+    value = bool(getattr(spec, field))
+    return {
+        "factor": name,
+        "input": value,
+        "next": None if value else {"target": True, "score_gain": _gain(spec, raw, field, True)},
+    }
+
+# Camera: linear MP component, flag bonuses, selfie component and brand prior, capped
+def _camera_factors(spec: PhoneSpec, raw: float) -> List[Dict[str, Any]]:
+    mp = {"factor": "main_mp", "input": spec.main_mp, "next": None}
+    if spec.main_mp < _CAMERA_FULL_MP:
+        mp["next"] = {
+            "target": _CAMERA_FULL_MP, "gap": round(_CAMERA_FULL_MP - spec.main_mp, 4),
+            "score_gain": _gain(spec, raw, "main_mp", _CAMERA_FULL_MP),
+        }
+    selfie = {"factor": "front_mp", "input": spec.front_mp, "next": None}
+    if spec.front_mp < _SELFIE_FULL_MP:
+        selfie["next"] = {
+            "target": _SELFIE_FULL_MP, "gap": round(_SELFIE_FULL_MP - spec.front_mp, 4),
+            "score_gain": _gain(spec, raw, "front_mp", _SELFIE_FULL_MP),
+        }
+    uncapped = _camera_raw_score(spec.main_mp, spec.has_ois, spec.useful_ultrawide, spec.brand, spec.front_mp)
+    prior = {
+        "factor": "brand_prior", "input": spec.brand,
+        "points": _PIPELINE_PRIOR.get((spec.brand or "").lower(), 0.0), "next": None,
+    }
+    return [mp, selfie, prior, {"factor": "cap", "input": round(uncapped, 4), "tier": _CAMERA_RAW_MAX,
+                                "capped": uncapped > _CAMERA_RAW_MAX, "next": None}]
+
+def _protection_factor(spec: PhoneSpec, raw: float) -> Dict[str, Any]:
+    current = _ip_score(spec.ip_rating)
+    higher = [ip for ip in _IP_LADDER if _IP_SCORES[ip] > current]
+    factor = {"factor": "ip_rating", "input": spec.ip_rating, "next": None}
+    if higher:
+        factor["next"] = {"target": higher[0], "score_gain": _gain(spec, raw, "ip_rating", higher[0])}
+    return factor
+
+def _durability_glass(spec: PhoneSpec) -> Dict[str, Any]:
+    return {"factor": "glass_type", "input": spec.glass_type,
+            "points": _glass_baseline(spec.glass_type), "next": None}
+
+# Tier trace for every scored section of one phone
+def explain_spec(spec: PhoneSpec) -> Dict[str, Any]:
+    smartbuy, raw, breakdown = calculate_smartbuy_score(spec)
+    sections: Dict[str, Dict[str, Any]] = {
+        name: {
+            "score": round(breakdown[name], 4),
+            "weight": weight,
+            # Share of the overall 0–10 raw score this section contributes
+            "contribution": round(breakdown[name] * weight / MAX_SCORE, 4),
+            "factors": [],
+        }
+        for name, weight in _W.items()
+    }
+
+    for section, name, field, tiers, floor in _TIERED:
+        sections[section]["factors"].append(_tier_factor(spec, raw, name, field, tiers, floor))
+    for section, name, field in _FLAGS:
+        sections[section]["factors"].append(_flag_factor(spec, raw, name, field))
+
+    sections["camera"]["factors"].extend(_camera_factors(spec, raw))
+    sections["durability"]["factors"].insert(0, _durability_glass(spec))
+    sections["protection"]["factors"].append(_protection_factor(spec, raw))
+    # An OLED panel with unknown resolution gets a flat baseline instead of its components
+    if spec.short_side == 0 and spec.oled:
+        sections["display"]["baseline"] = _OLED_UNKNOWN_BASELINE
+
+    return {
+        "raw_score": round(raw, 4),
+        "smartbuy_score": round(smartbuy, 4),
+        "profile": SCORING_PROFILE_VERSION,
+        "sections": sections,
+    }
+
+# Explanation for ``slug`` from the catalogue snapshot, built on first request and
+# memoized until the catalogue version (or scoring profile) changes; None if unknown
+def explain(catalogue: Catalogue, slug: str) -> Dict[str, Any] | None:
+    pos = catalogue.by_slug.get(slug)
+    if pos is None:
+        return None
+    cache = derived("explain", lambda _: {}, catalogue)
+    key = (slug, SCORING_PROFILE_VERSION)
+    if key not in cache:
+        if len(cache) >= MAX_CACHED_EXPLANATIONS:
+            cache.clear()
+        result = explain_spec(PhoneSpec.from_dict(catalogue.rows[pos]))
+        cache[key] = {"slug": slug, "catalogue": catalogue.stamp, **result}
+    return cache[key]
@@ -0,0 +1,123 @@
+from __future__ import annotations
+from decimal import Decimal
+import io
+from typing import Any, BinaryIO, Dict, Iterable, Iterator, List
+
+from django.db import models
+
+from .models import Phone
+from .renderers import encode_json
+from .rescore import current_scores
+from .similar import SECTIONS
+
+# Arrow/Parquet output is optional; NDJSON always works
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:  # pragma: no cover - exercised only without pyarrow
+    pa = pq = None
+
+# Phones fetched per database round-trip and rows per Arrow record batch
+EXPORT_CHUNK_SIZE = 500
+
+# Every concrete Phone column, then the scores and one column per breakdown section
+_STORED_SCORES = {"raw_score", "smartbuy_score", "score_breakdown", "scoring_profile"}
+PHONE_FIELDS = [f for f in Phone._meta.concrete_fields if f.attname not in _STORED_SCORES]
+SCORE_COLUMNS = ["raw_score", "smartbuy_score"] + [f"breakdown_{s}" for s in SECTIONS]
+COLUMNS = [f.attname for f in PHONE_FIELDS] + SCORE_COLUMNS
+
+def available_formats() -> List[str]:
+    return ["ndjson", "arrow", "parquet"] if pa is not None else ["ndjson"]
+
+# One flat dict per phone, streamed in pk order with bounded memory. Scores come from the
+# stored columns; only phones still stale since their last write are scored here.
+def export_rows(chunk_size: int = EXPORT_CHUNK_SIZE) -> Iterator[Dict[str, Any]]:
+    for phone in Phone.objects.order_by("pk").iterator(chunk_size=chunk_size):
+        row = {}
+        for f in PHONE_FIELDS:
+            value = getattr(phone, f.attname)
+            row[f.attname] = float(value) if isinstance(value, Decimal) else value
+        smartbuy, raw, breakdown = current_scores(phone)
+        row["raw_score"] = float(raw)
+        row["smartbuy_score"] = float(smartbuy)
+        for s in SECTIONS:
+            row[f"breakdown_{s}"] = float(breakdown.get(s, 0.0))
+        yield row
+
+def iter_ndjson(rows: Iterable[Dict[str, Any]]) -> Iterator[bytes]:
+    for row in rows:
+        yield encode_json(row) + b"\n"
+
+
+# Arrow
+_ARROW_TYPES = {
+    models.AutoField: "int64", models.BigAutoField: "int64", models.IntegerField: "int64",
+    models.FloatField: "float64", models.DecimalField: "float64", models.BooleanField: "bool_",
+}
+
+def arrow_schema():
+    fields = []
+    for f in PHONE_FIELDS:
+        if isinstance(f, models.DateTimeField):
+            typ = pa.timestamp("us", tz="UTC")
+        else:
+            name = next((t for cls, t in _ARROW_TYPES.items() if isinstance(f, cls)), "string")
+            typ = getattr(pa, name)()
+        fields.append(pa.field(f.attname, typ, nullable=f.null))
+    fields += [pa.field(c, pa.float64(), nullable=False) for c in SCORE_COLUMNS]
+    return pa.schema(fields)
+
+def _batches(rows: Iterable[Dict[str, Any]], schema, size: int):
+    chunk: List[Dict[str, Any]] = []
+    for row in rows:
+        chunk.append(row)
+        if len(chunk) >= size:
+            yield pa.RecordBatch.from_pylist(chunk, schema=schema)
+            chunk = []
+    if chunk:
+        yield pa.RecordBatch.from_pylist(chunk, schema=schema)
+
+# Write rows to ``sink`` as an Arrow IPC stream or a Parquet file, one batch per chunk
+def write_columnar(rows: Iterable[Dict[str, Any]], sink: BinaryIO, fmt: str,
+                   chunk_size: int = EXPORT_CHUNK_SIZE) -> int:
+    if pa is None:
+        raise RuntimeError("pyarrow is required for Arrow/Parquet export")
+    schema = arrow_schema()
+    writer = pq.ParquetWriter(sink, schema) if fmt == "parquet" else pa.ipc.new_stream(sink, schema)
+    written = 0
+    try:
+        for batch in _batches(rows, schema, chunk_size):
+            writer.write_batch(batch)
+            written += batch.num_rows
+    finally:
+        writer.close()
+    return written
+
+# File-like sink that hands back whatever was written since the last drain
+class _ChunkSink(io.RawIOBase):
+    def __init__(self):
+        self.parts: List[bytes] = []
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, b) -> int:
+        self.parts.append(bytes(b))
+        return len(b)
+
+    def drain(self) -> bytes:
+        out, self.parts = b"".join(self.parts), []
+        return out
+
+# Arrow IPC stream as byte chunks (one per record batch), for streaming HTTP responses
+def iter_arrow(rows: Iterable[Dict[str, Any]], chunk_size: int = EXPORT_CHUNK_SIZE) -> Iterator[bytes]:
+    if pa is None:
+        raise RuntimeError("pyarrow is required for Arrow/Parquet export")
+    schema = arrow_schema()
+    sink = _ChunkSink()
+    writer = pa.ipc.new_stream(sink, schema)
+    for batch in _batches(rows, schema, chunk_size):
+        writer.write_batch(batch)
+        yield sink.drain()
+    writer.close()
+    yield sink.drain()
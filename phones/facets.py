@@ -0,0 +1,195 @@
+from __future__ import annotations
+from bisect import bisect_left, bisect_right
+from decimal import Decimal, InvalidOperation
+from typing import Any, Callable, Dict, Iterable, List, Mapping, Tuple
+
+from .catalogue import Catalogue, derived
+from .scoring import _normalize_ip
+
+# Bitsets are plain Python ints: bit i is set when catalogue row i matches.
+
+def positions_to_bits(positions: Iterable[int], n: int) -> int:
+    buf = bytearray((n + 7) // 8)
+    for p in positions:
+        buf[p >> 3] |= 1 << (p & 7)
+    return int.from_bytes(buf, "little")
+
+def bits_to_positions(bits: int) -> List[int]:
+    out = []
+    raw = bits.to_bytes((bits.bit_length() + 7) // 8, "little")
+    for i, byte in enumerate(raw):
+        while byte:
+            low = byte & -byte
+            out.append((i << 3) + low.bit_length() - 1)
+            byte ^= low
+    return out
+
+_TRUE_STRS  = {"1", "true", "yes", "y"}
+_FALSE_STRS = {"0", "false", "no", "n"}
+
+def _parse_bool(v: str) -> bool:
+    s = v.strip().lower()
+    if s in _TRUE_STRS:
+        return True
+    if s in _FALSE_STRS:
+        return False
+    raise ValueError(f"not a boolean: {v!r}")
+
+
+# Boolean features: query parameter -> row predicate
+BOOLEAN_FACETS: Dict[str, Callable[[Mapping[str, Any]], bool]] = {
+    "has_5g":                lambda r: bool(r.get("has_5g")),
+    "has_nfc":               lambda r: bool(r.get("has_nfc")),
+    "has_ois":               lambda r: bool(r.get("has_ois")),
+    "has_wireless_charging": lambda r: bool(r.get("has_wireless_charging")),
+    "has_stereo_speakers":   lambda r: bool(r.get("has_stereo_speakers")),
+    "oled":                  lambda r: "oled" in str(r.get("display_type") or "").lower(),
+}
+
+# Categorical features: query parameter -> row key (comma-separated values are OR-ed)
+KEYED_FACETS: Dict[str, Callable[[Mapping[str, Any]], str | None]] = {
+    "ip_rating": lambda r: _normalize_ip(r.get("ip_rating")),
+}
+
+# Numeric bounds: query parameter -> (row field, bound); bounds are inclusive
+RANGE_FILTERS: Dict[str, Tuple[str, str]] = {
+    "min_ram":      ("ram_gb", "lo"),
+    "min_storage":  ("storage_gb", "lo"),
+    "min_refresh":  ("refresh_hz", "lo"),
+    "min_battery":  ("battery_mah", "lo"),
+    "min_charging": ("charging_w", "lo"),
+    "min_price":    ("price_sgd", "lo"),
+    "max_price":    ("price_sgd", "hi"),
+    "min_score":    ("raw_score", "lo"),
+    "max_score":    ("raw_score", "hi"),
+    "min_value":    ("smartbuy_score", "lo"),
+}
+
+# Parse a numeric bound, rejecting NaN/infinity like the DB filters did
+def parse_bound(v: str) -> float:
+    try:
+        d = Decimal(v.strip())
+    except InvalidOperation:
+        raise ValueError(f"not a number: {v!r}")
+    if not d.is_finite():
+        raise ValueError(f"not a finite number: {v!r}")
+    return float(d)
+
+
+class RangeIndex:
+    """Sorted (value, row) arrays for one numeric field; rows with no value are left out."""
+
+    def __init__(self, rows: List[Mapping[str, Any]], key: str):
+        pairs = []
+        for pos, row in enumerate(rows):
+            try:
+                v = row.get(key)
+                if v is not None:
+                    pairs.append((float(v), pos))
+            except (TypeError, ValueError):
+                continue
+        pairs.sort()
+        self.values = [v for v, _ in pairs]
+        self.positions = [p for _, p in pairs]
+        # Value per row position (None when missing) for per-candidate checks
+        self.column: List[float | None] = [None] * len(rows)
+        for v, p in pairs:
+            self.column[p] = v
+
+    # Row positions with lo <= value <= hi (either bound may be None)
+    def between(self, lo: float | None = None, hi: float | None = None) -> List[int]:
+        i = 0 if lo is None else bisect_left(self.values, lo)
+        j = len(self.values) if hi is None else bisect_right(self.values, hi)
+        return self.positions[i:j]
+
+    def contains(self, pos: int, lo: float | None = None, hi: float | None = None) -> bool:
+        v = self.column[pos]
+        return v is not None and (lo is None or v >= lo) and (hi is None or v <= hi)
+
+
+class FacetIndex:
+    def __init__(self, catalogue: Catalogue):
+        rows = catalogue.rows
+        self.n = len(rows)
+        self.all = (1 << self.n) - 1
+        self.ids = [r["id"] for r in rows]
+        self.by_id = catalogue.by_id
+
+        self.flags = {
+            name: positions_to_bits((i for i, r in enumerate(rows) if pred(r)), self.n)
+            for name, pred in BOOLEAN_FACETS.items()
+        }
+
+        self.keyed: Dict[str, Dict[str, int]] = {}
+        for name, key_of in KEYED_FACETS.items():
+            buckets: Dict[str, List[int]] = {}
+            for i, r in enumerate(rows):
+                k = key_of(r)
+                if k is not None:
+                    buckets.setdefault(k, []).append(i)
+            self.keyed[name] = {k: positions_to_bits(ps, self.n) for k, ps in buckets.items()}
+
+        self.ranges = {field: RangeIndex(rows, field) for field, _ in RANGE_FILTERS.values()}
+
+    # Resolve every filter present in params to sorted row positions; None when none were given.
+    def select(self, params: Mapping[str, str]) -> List[int] | None:
+        bits = self._select_bits(params)
+
+        bounds: Dict[str, List[float | None]] = {}
+        for name, (field, side) in RANGE_FILTERS.items():
+            if (v := params.get(name)):
+                lo_hi = bounds.setdefault(field, [None, None])
+                lo_hi[0 if side == "lo" else 1] = parse_bound(v)
+
+        if not bounds:
+            return None if bits is None else bits_to_positions(bits)
+
+        # The narrowest band drives (O(log n + k)); other bounds are checked per candidate
+        slices = {field: self.ranges[field].between(lo, hi) for field, (lo, hi) in bounds.items()}
+        driver = min(slices, key=lambda f: len(slices[f]))
+        others = [(self.ranges[f], lo, hi) for f, (lo, hi) in bounds.items() if f != driver]
+        mask = None if bits is None else bits.to_bytes((self.n + 7) // 8, "little")
+        out = [
+            p for p in slices[driver]
+            if all(idx.contains(p, lo, hi) for idx, lo, hi in others)
+            and (mask is None or mask[p >> 3] >> (p & 7) & 1)
+        ]
+        out.sort()
+        return out
+
+    # Intersect the boolean and keyed facets; None when none were given.
+    def _select_bits(self, params: Mapping[str, str]) -> int | None:
+        bits, used = self.all, False
+
+        for name, flag in self.flags.items():
+            if (v := params.get(name)):
+                bits &= flag if _parse_bool(v) else ~flag
+                used = True
+
+        for name, buckets in self.keyed.items():
+            if (v := params.get(name)):
+                wanted = 0
+                for token in v.split(","):
+                    key = _normalize_ip(token) if name == "ip_rating" else token.strip()
+                    wanted |= buckets.get(key or "", 0)
+                bits &= wanted
+                used = True
+
+        return (bits & self.all) if used else None
+
+    def ids_for(self, positions: Iterable[int]) -> List[int]:
+        return [self.ids[p] for p in positions]
+
+    def bits_for_ids(self, ids: Iterable[int]) -> int:
+        return positions_to_bits((self.by_id[i] for i in ids if i in self.by_id), self.n)
+
+    # Facet counts within a result set
+    def counts(self, bits: int) -> Dict[str, Any]:
+        out: Dict[str, Any] = {name: (bits & flag).bit_count() for name, flag in self.flags.items()}
+        for name, buckets in self.keyed.items():
+            out[name] = {k: c for k, b in sorted(buckets.items()) if (c := (bits & b).bit_count())}
+        return out
+
+
+def get_facet_index(catalogue: Catalogue | None = None) -> FacetIndex:
+    return derived("facets", FacetIndex, catalogue)
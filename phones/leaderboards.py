@@ -0,0 +1,121 @@
+from __future__ import annotations
+from typing import Any, Dict, List, Mapping, Tuple
+
+from django.db import IntegrityError, transaction
+
+from .catalogue import Catalogue, derived, get_catalogue
+from .models import LeaderboardSnapshot
+from .ranking import RANKED_PARAMS, blend_one, page_bounds, parse_mode, tiebreak_price
+from .scoring import SCORING_PROFILE_VERSION
+
+# Modes the frontend offers
+MODES = ("budget", "midrange", "flagship")
+# Leaderboard key for the unfiltered list
+ALL_BRANDS = None
+
+# (mode, lowercased brand or ALL_BRANDS) -> [(phone id, blended score)], best first
+Leaderboards = Dict[Tuple[str, Any], List[Tuple[int, float]]]
+
+
+# Every (mode, brand) ordering in one pass: the raw and value sorts are shared by
+# all modes, and bucketing them by brand keeps each brand's order without resorting.
+def build_leaderboards(catalogue: Catalogue) -> Leaderboards:
+    ids, raw, val, price, brand = [], [], [], [], []
+    for row in catalogue.rows:
+        ids.append(row["id"])
+        raw.append(row["raw_score"])
+        val.append(row["smartbuy_score"])
+        price.append(tiebreak_price(row["price_sgd"]))
+        brand.append((row["brand"] or "").lower() or ALL_BRANDS)
+
+    groups: Dict[Any, List[int]] = {ALL_BRANDS: list(range(len(ids)))}
+    for pos, b in enumerate(brand):
+        if b is not ALL_BRANDS:
+            groups.setdefault(b, []).append(pos)
+
+    # Stable sorts, so ties keep pk order like blend_scores
+    by_raw = sorted(range(len(ids)), key=raw.__getitem__, reverse=True)
+    by_val = sorted(range(len(ids)), key=val.__getitem__, reverse=True)
+    raw_order: Dict[Any, List[int]] = {g: [] for g in groups}
+    val_order: Dict[Any, List[int]] = {g: [] for g in groups}
+    for pos in by_raw:
+        raw_order[ALL_BRANDS].append(pos)
+        if brand[pos] is not ALL_BRANDS:
+            raw_order[brand[pos]].append(pos)
+    for pos in by_val:
+        val_order[ALL_BRANDS].append(pos)
+        if brand[pos] is not ALL_BRANDS:
+            val_order[brand[pos]].append(pos)
+
+    boards: Leaderboards = {}
+    for g, positions in groups.items():
+        if not positions:
+            boards.update(((mode, g), []) for mode in MODES)
+            continue
+        r_order, v_order = raw_order[g], val_order[g]
+        raw_rank = {p: i for i, p in enumerate(r_order)}
+        val_rank = {p: i for i, p in enumerate(v_order)}
+        bounds = (raw[r_order[-1]], raw[r_order[0]], val[v_order[-1]], val[v_order[0]])
+        max_rank = len(positions) - 1 or 1
+        for mode in MODES:
+            keys = {
+                p: (*blend_one(raw[p], val[p], raw_rank[p], val_rank[p], bounds, max_rank, mode), -price[p])
+                for p in positions
+            }
+            ordered = sorted(positions, key=keys.__getitem__, reverse=True)
+            boards[(mode, g)] = [(ids[p], keys[p][0]) for p in ordered]
+    return boards
+
+# Build for the current catalogue and store it in the database, where every worker
+# process can read it (the default cache is per process); run after an import
+def materialize_leaderboards(catalogue: Catalogue | None = None) -> Leaderboards:
+    catalogue = catalogue if catalogue is not None else get_catalogue()
+    boards = build_leaderboards(catalogue)
+    stored = [[mode, brand, board] for (mode, brand), board in boards.items()]
+    try:
+        with transaction.atomic():
+            LeaderboardSnapshot.objects.create(
+                stamp=catalogue.stamp, profile=SCORING_PROFILE_VERSION, boards=stored,
+            )
+            # Only the latest version is ever read
+            LeaderboardSnapshot.objects.exclude(stamp=catalogue.stamp).delete()
+    except IntegrityError:
+        # Another process stored the same version first
+        pass
+    return boards
+
+def _stored_leaderboards(stamp: str) -> Leaderboards | None:
+    stored = (
+        LeaderboardSnapshot.objects.filter(stamp=stamp, profile=SCORING_PROFILE_VERSION)
+        .values_list("boards", flat=True).first()
+    )
+    if stored is None:
+        return None
+    return {(mode, brand): [(pid, score) for pid, score in board] for mode, brand, board in stored}
+
+# Per-process copy of the stored leaderboards, materialized on first use after a version bump
+def get_leaderboards(catalogue: Catalogue | None = None) -> Leaderboards:
+    def load(cat: Catalogue) -> Leaderboards:
+        boards = _stored_leaderboards(cat.stamp)
+        return boards if boards is not None else materialize_leaderboards(cat)
+    return derived("leaderboards", load, catalogue)
+
+# Slice and hydrate a stored ordering for plain mode/brand queries; None when the query
+# needs the full ranking path (facets, ranges, other views). Raises ValueError on bad input.
+def leaderboard_results(params: Mapping[str, str]) -> List[Dict[str, Any]] | None:
+    offset, limit = page_bounds(params)
+    if any(k in params for k in RANKED_PARAMS - {"mode", "brand", "offset", "limit"}):
+        return None
+    mode, _ = parse_mode(params)
+    if mode not in MODES:
+        return None
+
+    catalogue = get_catalogue()
+    board = get_leaderboards(catalogue).get((mode, (params.get("brand") or "").lower() or ALL_BRANDS), [])
+    end = None if limit is None else offset + limit
+    results = []
+    for pid, score in board[offset:end]:
+        data = {k: v for k, v in catalogue.rows[catalogue.by_id[pid]].items() if k != "id"}
+        data["score"] = score
+        results.append(data)
+    return results
@@ -0,0 +1,44 @@
+import sys
+
+from django.core.management.base import BaseCommand, CommandError
+from phones.export import EXPORT_CHUNK_SIZE, available_formats, export_rows, iter_ndjson, write_columnar
+from phones.rescore import rescore
+
+# File extensions that imply an output format
+_EXTENSIONS = {".ndjson": "ndjson", ".jsonl": "ndjson", ".arrow": "arrow", ".parquet": "parquet"}
+
+# Management command: stream the scored catalogue to a file for analytics
+class Command(BaseCommand):
+    help = "Export every phone with its scores and breakdown as NDJSON, Arrow IPC or Parquet"
+
+    def add_arguments(self, parser):
+        parser.add_argument("output", help="Output path, or - for stdout")
+        parser.add_argument("--format", dest="fmt", choices=["ndjson", "arrow", "parquet"],
+                            help="Defaults to the output extension, else ndjson")
+        parser.add_argument("--chunk-size", type=int, default=EXPORT_CHUNK_SIZE,
+                            help="Phones per database fetch / record batch")
+
+    def handle(self, output, fmt=None, chunk_size=EXPORT_CHUNK_SIZE, **kwargs):
+        fmt = fmt or next((f for ext, f in _EXTENSIONS.items() if output.endswith(ext)), "ndjson")
+        if fmt not in available_formats():
+            raise CommandError(f"{fmt} export needs pyarrow; install it or use --format ndjson")
+        if output == "-" and fmt == "parquet":
+            raise CommandError("Parquet needs a real output file")
+
+        # Score anything stale up front, so the export only reads stored columns
+        rescore(stale_only=True)
+        rows = export_rows(chunk_size=chunk_size)
+        sink = sys.stdout.buffer if output == "-" else open(output, "wb")
+        try:
+            if fmt == "ndjson":
+                count = 0
+                for line in iter_ndjson(rows):
+                    sink.write(line)
+                    count += 1
+            else:
+                count = write_columnar(rows, sink, fmt, chunk_size=chunk_size)
+        finally:
+            if sink is not sys.stdout.buffer:
+                sink.close()
+
+        self.stderr.write(self.style.SUCCESS(f"Exported {count} phones as {fmt}"))
@@ -0,0 +1,98 @@
+import json
+import os
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+from phones.changes import record_changes
+from phones.leaderboards import materialize_leaderboards
+from phones.models import Phone
+from phones.offers import OfferRow, ingest_offers, observe_best_prices
+from phones.prices import parse_price
+from phones.quarantine import (
+    BAD_TYPE, INVALID, MISSING, MISSING_SLUG, NOT_AN_OBJECT, quarantined, report, write_quarantine,
+)
+from phones.rescore import rescore
+
+
+# Reason codes for one offer item; an empty list means it can be ingested
+def offer_reasons(o):
+    if not isinstance(o, dict):
+        return [NOT_AN_OBJECT]
+    if not o.get("slug"):
+        return [MISSING_SLUG]
+    if not isinstance(o["slug"], str):
+        return [f"{BAD_TYPE}:slug"]
+    reasons = []
+    retailer = o.get("retailer")
+    if retailer is None or (isinstance(retailer, str) and not retailer.strip()):
+        reasons.append(f"{MISSING}:retailer")
+    elif not isinstance(retailer, str):
+        reasons.append(f"{BAD_TYPE}:retailer")
+    if parse_price(o.get("price_sgd")) is None:
+        reasons.append(f"{INVALID}:price_sgd")
+    if o.get("seen_at") is not None:
+        if not isinstance(o["seen_at"], str):
+            reasons.append(f"{BAD_TYPE}:seen_at")
+        else:
+            try:
+                if parse_datetime(o["seen_at"]) is None:
+                    reasons.append(f"{INVALID}:seen_at")
+            except ValueError:
+                reasons.append(f"{INVALID}:seen_at")
+    return reasons
+
+
+# Management command: bulk-load retailer offers and re-materialize best prices
+class Command(BaseCommand):
+    help = "Import retailer offers from a JSON list of {slug, retailer, price_sgd, url, seen_at}"
+
+    def add_arguments(self, parser):
+        parser.add_argument("json_file", help="Path to offers JSON")
+        parser.add_argument("--quarantine",
+                            help="Where rejected items are written (default: <json_file>.quarantine.json)")
+
+    # Malformed items are quarantined; offers for phones not in the catalogue are skipped
+    def handle(self, json_file, quarantine=None, **kwargs):
+        with open(json_file, encoding="utf-8") as f:
+            data = json.load(f)
+        if not isinstance(data, list):
+            raise CommandError("JSON must be a list of offer objects.")
+
+        valid, rejected = [], []
+        for o in data:
+            if reasons := offer_reasons(o):
+                rejected.append(quarantined(o, reasons))
+            else:
+                valid.append(o)
+
+        ids = dict(Phone.objects.filter(slug__in={o["slug"] for o in valid}).values_list("slug", "pk"))
+        now = timezone.now()
+        rows, skipped = [], 0
+        for o in valid:
+            pid = ids.get(o["slug"])
+            if pid is None:
+                skipped += 1
+                continue
+            seen_at = parse_datetime(o["seen_at"]) if o.get("seen_at") else now
+            rows.append(OfferRow(pid, o["retailer"], o["price_sgd"], o.get("url"), seen_at))
+
+        # Offers, best prices, the version bump and the change feed publish together
+        with transaction.atomic(), record_changes(ids):
+            moved = ingest_offers(rows)
+            observe_best_prices({pid: now for pid in moved})
+        # New prices change value scores; refresh them before the leaderboards read them
+        rescore(stale_only=True)
+        materialize_leaderboards()
+
+        self.stdout.write(self.style.SUCCESS(
+            f"Offers imported. offers={len(rows)} skipped={skipped} best_price_changes={len(moved)} "
+            f"quarantined={len(rejected)}"
+        ))
+        if rejected:
+            quarantine = quarantine or f"{os.path.splitext(json_file)[0]}.quarantine.json"
+            write_quarantine(quarantine, rejected)
+            self.stdout.write(self.style.WARNING(
+                f"Quarantined {len(rejected)} items ({report(rejected)}) to {quarantine}"
+            ))
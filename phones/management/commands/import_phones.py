@@ -1,14 +1,32 @@
 import json
+import os
 import re
-from django.core.management.base import BaseCommand
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, NamedTuple
+from django.core.management import call_command
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from django.utils import timezone
 from django.utils.dateparse import parse_datetime
+from phones.changes import record_changes
+from phones.leaderboards import materialize_leaderboards
 from phones.models import Phone
+from phones.offers import OfferRow, ingest_offers, observe_best_prices
+from phones.quarantine import (
+    BAD_TYPE, INVALID, MISSING_SLUG, NOT_AN_OBJECT, check_values, quarantined, report, write_quarantine,
+)
+from phones.rescore import rescore
+from phones.staging import PhoneStaging
 
 # Pattern matchers for numeric tokens, IP ratings, and resolutions
 _num = re.compile(r"[-+]?\d*\.?\d+")
 _ip = re.compile(r"\bIP\s*([0-9]{2})\s*[A-Z]?\b", re.IGNORECASE)
 _res = re.compile(r"(\d+)\s*[x×]\s*(\d+)", re.IGNORECASE)
 
+# Retailer recorded for the price carried in final_spec JSON
+DEFAULT_RETAILER = "lazada"
+
 # Values treated as empty/unknown when coalescing
 SKIP_STRS = {"", "-", "—", "N/A", "n/a", "na", "None", "none", "unknown", "Unknown"}
 
@@ -66,6 +84,171 @@ def parse_resolution(v):
         return (None, None)
     return (to_int(m.group(1)), to_int(m.group(2)))
 
+# Normalise one final_spec item into Phone field values (everything but slug)
+def phone_defaults(item):
+    # Camera MPs: keep original string and derive numeric main MP
+    camera_main_mp_str = first_nonempty(item.get("camera_main_mp"))
+    main_mp_num = to_int(camera_main_mp_str) or to_int(item.get("main_mp"))
+
+    # Resolution: prefer numeric fields, otherwise parse pretty string
+    res_w = to_int(first_nonempty(item.get("res_w")))
+    res_h = to_int(first_nonempty(item.get("res_h")))
+    if res_w is None or res_h is None:
+        w2, h2 = parse_resolution(first_nonempty(item.get("resolution")))
+        res_w = res_w or w2
+        res_h = res_h or h2
+
+    # Payload for update_or_create (or a staging row with --atomic)
+    return {
+        # Identity / source
+        "model": item.get("model"),
+        "brand": item.get("brand"),
+        "source_url": item.get("source_url"),
+
+        # Platform
+        "soc_score": item.get("soc_score"),
+        "chipset": item.get("chipset"),
+        "gpu": item.get("gpu"),
+        "bt_ver": to_float(first_nonempty(item.get("bt_ver"), item.get("bluetooth_version"))),
+
+        # Memory / storage
+        "ram_gb": to_float(first_nonempty(item.get("ram_gb"), item.get("ram"))),
+        "storage_gb": to_float(first_nonempty(item.get("storage_gb"), item.get("storage"))),
+
+        # Display
+        "display_in": to_float(first_nonempty(item.get("display_in"), item.get("display_size"))),
+        "refresh_hz": to_int(first_nonempty(item.get("refresh_hz"), item.get("refresh_rate"))),
+        "ppi": to_int(first_nonempty(item.get("ppi"), item.get("pixel_density"))),
+        "display_type": norm_lower(first_nonempty(item.get("display_type"))),
+
+        # Resolution
+        "res_w": res_w,
+        "res_h": res_h,
+
+        # Battery / charging
+        "battery_mah": to_int(first_nonempty(item.get("battery_mah"), item.get("battery"))),
+        "charging_w": to_int(first_nonempty(item.get("charging_w"), item.get("charging_speed"))),
+
+        # Camera
+        "main_mp": main_mp_num,
+        "front_mp": to_int(first_nonempty(item.get("front_mp"), item.get("camera_front_mp"))),
+        "camera_main_mp": camera_main_mp_str,
+        "has_ois": item.get("has_ois"),
+
+        # Features
+        "has_5g": item.get("has_5g"),
+        "has_nfc": item.get("has_nfc"),
+        "has_fast_charging": item.get("has_fast_charging"),
+        "has_wireless_charging": item.get("has_wireless_charging"),
+        "has_reverse_wireless_charging": item.get("has_reverse_wireless_charging"),
+        "has_stereo_speakers": item.get("has_stereo_speakers"),
+        "has_aptx": item.get("has_aptx"),
+        "has_ldac": item.get("has_ldac"),
+
+        # Protection / durability
+        "glass_type": first_nonempty(
+            item.get("glass_type"),
+            item.get("display_protection"),
+            item.get("front_glass"),
+        ),
+        "ip_rating": norm_ip(first_nonempty(item.get("ip_rating"), item.get("ip"))),
+        "mohs": to_float(item.get("mohs")),
+
+        # Physical
+        "weight_g": to_float(first_nonempty(item.get("weight_g"), item.get("weight"))),
+        "thickness_mm": to_float(first_nonempty(item.get("thickness_mm"), item.get("thickness"))),
+
+        # Pricing
+        "price_sgd": item.get("price_sgd"),
+        "price_url": item.get("price_url"),
+
+        # Metadata
+        "scraped_at": parse_datetime(item.get("scraped_at")) if item.get("scraped_at") else None,
+        "warranty": first_nonempty(item.get("warranty")),
+        "android_version": first_nonempty(item.get("android_version")),
+    }
+
+
+# Phone fields an import writes besides slug
+PHONE_FIELDS = tuple(phone_defaults({}))
+# Set from the feed only when a phone is created; after that materialize_best_prices owns
+# them and the feed's price arrives as a DEFAULT_RETAILER offer like any other
+FEED_PRICE_FIELDS = ("price_sgd", "price_url")
+IMPORT_CHUNK_SIZE = 500
+IMPORT_WORKERS = os.cpu_count() or 1
+# Files this many chunks or smaller are normalised in-process; a pool isn't worth starting
+IMPORT_POOL_MIN_CHUNKS = 2
+
+
+# The price a final_spec item quotes, published as a DEFAULT_RETAILER offer
+class FeedOffer(NamedTuple):
+    price_sgd: object
+    url: str
+    seen_at: object            # scraped_at, None when missing
+
+
+class NormalizedChunk(NamedTuple):
+    rows: List[tuple]          # PhoneStaging-prepared rows, one per slug
+    seen: Dict[str, FeedOffer]
+    rejected: List[dict]       # quarantined items tagged with reason codes
+
+# Normalise raw items into ready-to-insert rows, holding back any that fail validation;
+# runs in the pool workers
+def normalize_chunk(items):
+    staging = PhoneStaging(PHONE_FIELDS, insert_only=FEED_PRICE_FIELDS)
+    rows, seen, rejected, candidates = {}, {}, [], []
+    for item in items:
+        if not isinstance(item, dict):
+            rejected.append(quarantined(item, [NOT_AN_OBJECT]))
+        elif not item.get("slug"):
+            rejected.append(quarantined(item, [MISSING_SLUG]))
+        elif not isinstance(item["slug"], str):
+            rejected.append(quarantined(item, [f"{BAD_TYPE}:slug"]))
+        else:
+            try:
+                candidates.append((item, phone_defaults(item)))
+            except (TypeError, ValueError):
+                rejected.append(quarantined(item, [INVALID]))
+
+    # One pass per column over the whole chunk
+    checked = check_values(PHONE_FIELDS, [values for _, values in candidates])
+    for (item, values), reasons in zip(candidates, checked):
+        slug = item["slug"]
+        if not reasons:
+            try:
+                # Later duplicates win, as with sequential upserts
+                rows[slug] = staging.prepare(slug, values)
+            except ValueError:
+                reasons = [INVALID]
+        if reasons:
+            rejected.append(quarantined(item, reasons))
+            continue
+        seen[slug] = FeedOffer(values["price_sgd"], values["price_url"], values["scraped_at"])
+    return NormalizedChunk(list(rows.values()), seen, rejected)
+
+# Pool workers only need Django's app registry, not a DB connection
+def _init_worker():
+    import django
+    django.setup()
+
+# Normalized chunks in file order. With workers and a large enough file, chunks are
+# normalised on a process pool while the caller writes; at most ``workers * 2`` pending
+# chunks are queued ahead.
+def normalized_chunks(items, workers, chunk_size):
+    chunks = (items[i:i + chunk_size] for i in range(0, len(items), chunk_size))
+    if workers <= 0 or len(items) <= chunk_size * IMPORT_POOL_MIN_CHUNKS:
+        yield from map(normalize_chunk, chunks)
+        return
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker) as pool:
+        pending = deque()
+        for chunk in chunks:
+            pending.append(pool.submit(normalize_chunk, chunk))
+            if len(pending) >= workers * 2:
+                yield pending.popleft().result()
+        while pending:
+            yield pending.popleft().result()
+
+
 # Management command: import/merge phones from a final_spec JSON file
 class Command(BaseCommand):
     help = "Import phones from a final_spec JSON file (idempotent upsert)."
@@ -73,9 +256,21 @@ class Command(BaseCommand):
     # CLI: path to JSON file
     def add_arguments(self, parser):
         parser.add_argument("json_file", help="Path to final_spec JSON")
+        parser.add_argument("--warm", action="store_true",
+                            help="Prime the recommendation cache after importing")
+        parser.add_argument("--atomic", action="store_true",
+                            help="Load into a staging table, validate, then publish everything in one transaction")
+        parser.add_argument("--workers", type=int, default=IMPORT_WORKERS,
+                            help="Normalisation processes for files over a couple of chunks "
+                                 "(0 always normalises in this process)")
+        parser.add_argument("--chunk-size", type=int, default=IMPORT_CHUNK_SIZE,
+                            help="Items per normalisation chunk / write batch")
+        parser.add_argument("--quarantine",
+                            help="Where rejected items are written (default: <json_file>.quarantine.json)")
 
-    # Read JSON, normalise fields, and upsert Phone rows by slug
-    def handle(self, json_file, *args, **kwargs):
+    # Read JSON, normalise fields on the pool, and upsert Phone rows by slug from this thread
+    def handle(self, json_file, *args, warm=False, atomic=False, workers=IMPORT_WORKERS,
+               chunk_size=IMPORT_CHUNK_SIZE, quarantine=None, **kwargs):
         with open(json_file, encoding="utf-8") as f:
             data = json.load(f)
 
@@ -87,102 +282,96 @@ class Command(BaseCommand):
         else:
             raise SystemExit("JSON must be a list or dict of phone objects.")
 
-        created = updated = skipped = 0
-
-        for item in items:
-            slug = item.get("slug")
-            if not slug:
-                skipped += 1
-                continue
-
-            # Camera MPs: keep original string and derive numeric main MP
-            camera_main_mp_str = first_nonempty(item.get("camera_main_mp"))
-            main_mp_num = to_int(camera_main_mp_str) or to_int(item.get("main_mp"))
-
-            # Resolution: prefer numeric fields, otherwise parse pretty string
-            res_w = to_int(first_nonempty(item.get("res_w")))
-            res_h = to_int(first_nonempty(item.get("res_h")))
-            if res_w is None or res_h is None:
-                w2, h2 = parse_resolution(first_nonempty(item.get("resolution")))
-                res_w = res_w or w2
-                res_h = res_h or h2
-
-            # Payload for update_or_create
-            defaults = {
-                # Identity / source
-                "model": item.get("model"),
-                "brand": item.get("brand"),
-                "source_url": item.get("source_url"),
-
-                # Platform
-                "soc_score": item.get("soc_score"),
-                "chipset": item.get("chipset"),
-                "gpu": item.get("gpu"),
-                "bt_ver": to_float(first_nonempty(item.get("bt_ver"), item.get("bluetooth_version"))),
-
-                # Memory / storage
-                "ram_gb": to_float(first_nonempty(item.get("ram_gb"), item.get("ram"))),
-                "storage_gb": to_float(first_nonempty(item.get("storage_gb"), item.get("storage"))),
-
-                # Display
-                "display_in": to_float(first_nonempty(item.get("display_in"), item.get("display_size"))),
-                "refresh_hz": to_int(first_nonempty(item.get("refresh_hz"), item.get("refresh_rate"))),
-                "ppi": to_int(first_nonempty(item.get("ppi"), item.get("pixel_density"))),
-                "display_type": norm_lower(first_nonempty(item.get("display_type"))),
-
-                # Resolution
-                "res_w": res_w,
-                "res_h": res_h,
-
-                # Battery / charging
-                "battery_mah": to_int(first_nonempty(item.get("battery_mah"), item.get("battery"))),
-                "charging_w": to_int(first_nonempty(item.get("charging_w"), item.get("charging_speed"))),
-
-                # Camera
-                "main_mp": main_mp_num,
-                "front_mp": to_int(first_nonempty(item.get("front_mp"), item.get("camera_front_mp"))),
-                "camera_main_mp": camera_main_mp_str,
-                "has_ois": item.get("has_ois"),
-
-                # Features
-                "has_5g": item.get("has_5g"),
-                "has_nfc": item.get("has_nfc"),
-                "has_fast_charging": item.get("has_fast_charging"),
-                "has_wireless_charging": item.get("has_wireless_charging"),
-                "has_reverse_wireless_charging": item.get("has_reverse_wireless_charging"),
-                "has_stereo_speakers": item.get("has_stereo_speakers"),
-                "has_aptx": item.get("has_aptx"),
-                "has_ldac": item.get("has_ldac"),
-
-                # Protection / durability
-                "glass_type": first_nonempty(
-                    item.get("glass_type"),
-                    item.get("display_protection"),
-                    item.get("front_glass"),
-                ),
-                "ip_rating": norm_ip(first_nonempty(item.get("ip_rating"), item.get("ip"))),
-                "mohs": to_float(item.get("mohs")),
-
-                # Physical
-                "weight_g": to_float(first_nonempty(item.get("weight_g"), item.get("weight"))),
-                "thickness_mm": to_float(first_nonempty(item.get("thickness_mm"), item.get("thickness"))),
-
-                # Pricing
-                "price_sgd": item.get("price_sgd"),
-                "price_url": item.get("price_url"),
-
-                # Metadata
-                "scraped_at": parse_datetime(item.get("scraped_at")) if item.get("scraped_at") else None,
-                "warranty": first_nonempty(item.get("warranty")),
-                "android_version": first_nonempty(item.get("android_version")),
-            }
-
-            # Upsert by slug
-            _, was_created = Phone.objects.update_or_create(slug=slug, defaults=defaults)
-            created += int(was_created)
-            updated += int(not was_created)
+        now = timezone.now()
+        # Only items that can pass quarantine; the rest never reach the change feed
+        slugs = [i["slug"] for i in items if isinstance(i, dict) and i.get("slug") and isinstance(i["slug"], str)]
+        chunks = normalized_chunks(items, workers, max(1, chunk_size))
+        staging = PhoneStaging(PHONE_FIELDS, insert_only=FEED_PRICE_FIELDS)
+        rejected = []
+        quarantine = quarantine or f"{os.path.splitext(json_file)[0]}.quarantine.json"
+        try:
+            if atomic:
+                created, updated, changed = self._import_atomic(staging, chunks, slugs, now, rejected)
+            else:
+                created, updated, changed = self._import_streaming(staging, chunks, slugs, now, rejected)
+        except ValueError as e:
+            raise CommandError(f"Import rejected: {e}")
+        finally:
+            # Whatever was written, the held-back rows can be fixed and imported on their own
+            if rejected:
+                write_quarantine(quarantine, rejected)
 
         # Summary output
         self.stdout.write(self.style.SUCCESS(
-            f"Phones imported successfully. updated={updated} created={created} skipped={skipped}"
+            f"Phones imported successfully. updated={updated} created={created} quarantined={len(rejected)} "
+            f"price_changes={len(changed)}"
         ))
+        if rejected:
+            self.stdout.write(self.style.WARNING(
+                f"Quarantined {len(rejected)} items ({report(rejected)}) to {quarantine}"
+            ))
+
+        # Refresh stored scores for rows whose scoring inputs changed, so the catalogue
+        # build and exports read them instead of recomputing
+        rescore(workers=workers, stale_only=True)
+
+        # Mode x brand orderings for the new version, built once and stored for every worker
+        materialize_leaderboards()
+
+        # Post-import hook: rank common queries before users hit the cold path
+        if warm:
+            try:
+                call_command("warm_recommendations", stdout=self.stdout)
+            except CommandError as e:
+                # The import itself succeeded; say why nothing was warmed
+                self.stdout.write(self.style.WARNING(f"Skipped warming: {e}"))
+
+    # Upsert chunk by chunk; each chunk commits on its own and rejected rows are set aside
+    def _import_streaming(self, staging, chunks, slugs, now, rejected):
+        created = updated = 0
+        seen = {}
+
+        # One catalogue version bump for the whole run, committed with a change-feed row per
+        # changed phone; the chunks themselves commit as they go
+        with record_changes(slugs):
+            for chunk in chunks:
+                rejected += chunk.rejected
+                c, u = staging.upsert(chunk.rows)
+                created, updated = created + c, updated + u
+                seen.update(chunk.seen)
+            changed = self._publish_offers(seen, now)
+        return created, updated, changed
+
+    # Bulk-load a staging table, validate it, then publish the upsert, offers and price
+    # history in one transaction: readers see the old catalogue or the new one, never a mix.
+    # All or nothing, so any quarantined item rejects the whole file.
+    def _import_atomic(self, staging, chunks, slugs, now, rejected):
+        seen = {}
+        with staging.table():
+            for chunk in chunks:
+                rejected += chunk.rejected
+                staging.load(chunk.rows, replace=seen.keys() & chunk.seen.keys())
+                seen.update(chunk.seen)
+            if rejected:
+                raise ValueError(f"nothing was written: {len(rejected)} items quarantined ({report(rejected)})")
+            if not seen:
+                return 0, 0, []
+            try:
+                staging.validate()
+            except ValueError as e:
+                raise ValueError(f"nothing was written: {e}")
+
+            with transaction.atomic(), record_changes(slugs):
+                created, updated = staging.swap()
+                changed = self._publish_offers(seen, now)
+        return created, updated, changed
+
+    # Cheapest offer across retailers becomes the phone's price; history keeps only changes
+    def _publish_offers(self, seen, now):
+        offers, at = [], {}
+        for slug, pk in Phone.objects.filter(slug__in=list(seen)).values_list("slug", "pk"):
+            feed = seen[slug]
+            at[pk] = feed.seen_at or now
+            offers.append(OfferRow(pk, DEFAULT_RETAILER, feed.price_sgd, feed.url, at[pk]))
+        ingest_offers(offers)
+        return observe_best_prices(at)
@@ -0,0 +1,22 @@
+import os
+import time
+
+from django.core.management.base import BaseCommand
+from phones.rescore import RESCORE_CHUNK_SIZE, rescore
+
+# Management command: recompute stored scores after a scoring table change
+class Command(BaseCommand):
+    help = "Recompute stored raw/value scores and breakdowns for all phones"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--workers", type=int, default=os.cpu_count() or 1,
+                            help="Scoring processes (0 scores in this process)")
+        parser.add_argument("--chunk-size", type=int, default=RESCORE_CHUNK_SIZE,
+                            help="Phones per worker task")
+        parser.add_argument("--stale-only", action="store_true",
+                            help="Only phones saved since their last rescore or scored under an older profile")
+
+    def handle(self, *args, workers, chunk_size, stale_only, **kwargs):
+        t0 = time.perf_counter()
+        written = rescore(workers=workers, chunk_size=chunk_size, stale_only=stale_only)
+        self.stdout.write(self.style.SUCCESS(f"Rescored {written} phones in {time.perf_counter() - t0:.1f}s"))
@@ -0,0 +1,17 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from phones.catalogue import write_catalogue_snapshot
+
+# Management command: write the mmap'd catalogue file before workers start
+class Command(BaseCommand):
+    help = "Write the scored catalogue to the binary snapshot file workers map at startup"
+
+    def add_arguments(self, parser):
+        parser.add_argument("path", nargs="?", help="Defaults to settings.CATALOGUE_SNAPSHOT_PATH")
+
+    def handle(self, path=None, **kwargs):
+        path = path or settings.CATALOGUE_SNAPSHOT_PATH
+        if not path:
+            raise CommandError("No path given and CATALOGUE_SNAPSHOT_PATH is not set")
+        catalogue = write_catalogue_snapshot(path)
+        self.stdout.write(self.style.SUCCESS(f"Wrote {len(catalogue)} phones at {catalogue.stamp} to {path}"))
@@ -0,0 +1,88 @@
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from django.conf import settings
+from django.core.cache import cache, caches
+from django.core.cache.backends.dummy import DummyCache
+from django.core.cache.backends.locmem import LocMemCache
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connections
+from phones.catalogue import catalogue_stamp, get_catalogue
+from phones.facets import get_facet_index
+from phones.leaderboards import MODES, get_leaderboards
+from phones.models import Phone
+from phones.ranking import ranked_cache_key, ranked_variants
+
+# Backends whose entries never leave the process that wrote them
+PROCESS_LOCAL_CACHES = (LocMemCache, DummyCache)
+
+# Every mode x (all brands + each brand) x (no cap + each price cap)
+def common_queries(brands, price_caps):
+    for mode in MODES:
+        for brand in [None, *brands]:
+            for cap in [None, *price_caps]:
+                params = {"mode": mode}
+                if brand:
+                    params["brand"] = brand
+                if cap is not None:
+                    params["max_price"] = str(cap)
+                yield params
+
+# Pool workers open their own DB connections
+def _init_worker():
+    import django
+    django.setup()
+    connections.close_all()
+
+def _rank(params):
+    return params, ranked_variants(params)
+
+# Management command: precompute common ranked payloads into the response cache
+class Command(BaseCommand):
+    help = (
+        "Precompute mode x brand x price-cap recommendation payloads into the response cache. "
+        "Run before switching traffic. Needs a cache backend shared with the web workers."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--workers", type=int, default=os.cpu_count() or 1,
+                            help="Ranking processes (0 ranks in this process)")
+        parser.add_argument("--price-caps", default=",".join(str(c) for c in settings.WARM_PRICE_CAPS),
+                            help="Comma-separated max_price values to warm")
+
+    def handle(self, *args, workers, price_caps, **kwargs):
+        if isinstance(caches["default"], PROCESS_LOCAL_CACHES):
+            raise CommandError(
+                f"The default cache ({settings.CACHES['default']['BACKEND']}) is local to this process, "
+                "so warmed payloads would never reach the web workers; configure a shared backend."
+            )
+        t0 = time.perf_counter()
+        caps = [c.strip() for c in price_caps.split(",") if c.strip()]
+        brands = sorted(set(Phone.objects.values_list("brand", flat=True).distinct()) - {None, ""})
+        queries = list(common_queries(brands, caps))
+        stamp = catalogue_stamp()
+
+        if workers > 0:
+            # Build the catalogue and its indexes once here; forked workers inherit them
+            # instead of each building their own
+            get_leaderboards(get_catalogue())
+            get_facet_index()
+            # Children must not inherit this process's DB connection
+            connections.close_all()
+            with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker) as pool:
+                results = pool.map(_rank, queries, chunksize=max(1, len(queries) // (workers * 4)))
+                warmed = self._store(stamp, results)
+        else:
+            warmed = self._store(stamp, map(_rank, queries))
+
+        self.stdout.write(self.style.SUCCESS(
+            f"Warmed {warmed} recommendation queries in {time.perf_counter() - t0:.1f}s"
+        ))
+
+    def _store(self, stamp, results):
+        warmed = 0
+        for params, variants in results:
+            cache.set(ranked_cache_key(stamp, params), variants, settings.RANKED_CACHE_TIMEOUT)
+            warmed += 1
+        return warmed
@@ -0,0 +1,34 @@
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("phones", "0005_catalogueversion"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="phone",
+            name="price_min_90d",
+            field=models.DecimalField(blank=True, decimal_places=2, max_digits=10, null=True),
+        ),
+        migrations.AddField(
+            model_name="phone",
+            name="price_avg_90d",
+            field=models.DecimalField(blank=True, decimal_places=2, max_digits=10, null=True),
+        ),
+        migrations.CreateModel(
+            name="PriceObservation",
+            fields=[
+                ("id", models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name="ID")),
+                ("price_sgd", models.DecimalField(decimal_places=2, max_digits=10)),
+                ("observed_at", models.DateTimeField()),
+                ("phone", models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name="price_history", to="phones.phone")),
+            ],
+            options={
+                "indexes": [models.Index(fields=["phone", "observed_at"], name="price_phone_time_idx")],
+            },
+        ),
+    ]
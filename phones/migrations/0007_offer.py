@@ -0,0 +1,31 @@
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("phones", "0006_pricehistory"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="phone",
+            name="price_retailer",
+            field=models.CharField(blank=True, max_length=64, null=True),
+        ),
+        migrations.CreateModel(
+            name="Offer",
+            fields=[
+                ("id", models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name="ID")),
+                ("retailer", models.CharField(max_length=64)),
+                ("price_sgd", models.DecimalField(decimal_places=2, max_digits=10)),
+                ("url", models.URLField()),
+                ("seen_at", models.DateTimeField()),
+                ("phone", models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name="offers", to="phones.phone")),
+            ],
+            options={
+                "constraints": [models.UniqueConstraint(fields=("phone", "retailer"), name="offer_phone_retailer_uniq")],
+            },
+        ),
+    ]
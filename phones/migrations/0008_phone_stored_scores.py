@@ -0,0 +1,31 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("phones", "0007_offer"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="phone",
+            name="raw_score",
+            field=models.FloatField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name="phone",
+            name="smartbuy_score",
+            field=models.FloatField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name="phone",
+            name="score_breakdown",
+            field=models.JSONField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name="phone",
+            name="scoring_profile",
+            field=models.PositiveIntegerField(default=0),
+        ),
+    ]
@@ -0,0 +1,24 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("phones", "0008_phone_stored_scores"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="CatalogueChange",
+            fields=[
+                ("id", models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name="ID")),
+                ("version", models.PositiveIntegerField(db_index=True)),
+                ("slug", models.SlugField()),
+                ("action", models.CharField(choices=[("created", "Created"), ("updated", "Updated"), ("deleted", "Deleted")], max_length=8)),
+                ("changed_fields", models.JSONField(default=dict)),
+                ("old_score", models.FloatField(blank=True, null=True)),
+                ("new_score", models.FloatField(blank=True, null=True)),
+                ("created_at", models.DateTimeField(auto_now_add=True)),
+            ],
+        ),
+    ]
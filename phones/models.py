@@ -56,13 +56,103 @@ class Phone(models.Model):
     ip_rating = models.CharField(max_length=32, null=True, blank=True)   
     mohs = models.FloatField(null=True, blank=True)                      
 
-    # Pricing info
+    # Pricing info: the cheapest current Offer, materialized whenever offers change
     price_sgd = models.DecimalField(max_digits=10, decimal_places=2)
     price_url = models.URLField()
+    price_retailer = models.CharField(max_length=64, null=True, blank=True)
+    # Rolling window over PriceObservation, refreshed with each price import
+    price_min_90d = models.DecimalField(max_digits=10, decimal_places=2, null=True, blank=True)
+    price_avg_90d = models.DecimalField(max_digits=10, decimal_places=2, null=True, blank=True)
 
     # Metadata / scraping info
     scraped_at = models.DateTimeField()
     android_version = models.CharField(max_length=32, null=True, blank=True)
 
+    # Stored default-mode scores written by the rescore command. They are only
+    # trusted while scoring_profile equals scoring.SCORING_PROFILE_VERSION; any
+    # save() resets it to 0 (stale).
+    raw_score = models.FloatField(null=True, blank=True)
+    smartbuy_score = models.FloatField(null=True, blank=True)
+    score_breakdown = models.JSONField(null=True, blank=True)
+    scoring_profile = models.PositiveIntegerField(default=0)
+
     def __str__(self) -> str:
         return f"{self.brand} {self.model} ({self.slug})"
+
+
+class CatalogueVersion(models.Model):
+    # Single-row counter bumped whenever the phone catalogue changes.
+    # ``token`` is regenerated on every bump so a rolled-back bump can never
+    # be confused with a later one that reuses the same number.
+    version = models.PositiveIntegerField(default=0)
+    token = models.CharField(max_length=32, blank=True, default="")
+    updated_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self) -> str:
+        return f"catalogue v{self.version}"
+
+
+class Offer(models.Model):
+    # Latest price seen at one retailer; re-ingesting a retailer replaces its offer
+    phone = models.ForeignKey(Phone, on_delete=models.CASCADE, related_name="offers")
+    retailer = models.CharField(max_length=64)
+    price_sgd = models.DecimalField(max_digits=10, decimal_places=2)
+    url = models.URLField()
+    seen_at = models.DateTimeField()
+
+    class Meta:
+        constraints = [models.UniqueConstraint(fields=["phone", "retailer"], name="offer_phone_retailer_uniq")]
+
+    def __str__(self) -> str:
+        return f"{self.phone_id} {self.retailer} S${self.price_sgd}"
+
+
+class PriceObservation(models.Model):
+    # One row per price change (unchanged refreshes are not stored); the price
+    # holds from ``observed_at`` until the phone's next observation.
+    phone = models.ForeignKey(Phone, on_delete=models.CASCADE, related_name="price_history")
+    price_sgd = models.DecimalField(max_digits=10, decimal_places=2)
+    observed_at = models.DateTimeField()
+
+    class Meta:
+        indexes = [models.Index(fields=["phone", "observed_at"], name="price_phone_time_idx")]
+
+    def __str__(self) -> str:
+        return f"{self.phone_id} S${self.price_sgd} @ {self.observed_at:%Y-%m-%d}"
+
+
+class CatalogueChange(models.Model):
+    # Append-only feed of per-phone changes written by the importers; ``id`` is
+    # the cursor, ``version`` the catalogue version the change landed in.
+    CREATED, UPDATED, DELETED = "created", "updated", "deleted"
+    ACTIONS = [(CREATED, "Created"), (UPDATED, "Updated"), (DELETED, "Deleted")]
+
+    version = models.PositiveIntegerField(db_index=True)
+    slug = models.SlugField()
+    action = models.CharField(max_length=8, choices=ACTIONS)
+    # {field: [old, new]} in API representation
+    changed_fields = models.JSONField(default=dict)
+    old_score = models.FloatField(null=True, blank=True)
+    new_score = models.FloatField(null=True, blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    def __str__(self) -> str:
+        return f"v{self.version} {self.action} {self.slug}"
+
+
+class LeaderboardSnapshot(models.Model):
+    # Every mode x brand ordering for one catalogue stamp and scoring profile, written
+    # after an import so all web workers load the same boards instead of rebuilding them
+    stamp = models.CharField(max_length=48)
+    profile = models.PositiveIntegerField()
+    # [[mode, lowercased brand or null, [[phone id, score], ...]], ...]
+    boards = models.JSONField()
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=["stamp", "profile"], name="leaderboard_stamp_profile_uniq"),
+        ]
+
+    def __str__(self) -> str:
+        return f"leaderboards {self.stamp} p{self.profile}"
@@ -0,0 +1,10 @@
+import re
+from typing import Optional
+
+# Fix common casing issues in model strings
+def tidy_model_case(m: Optional[str]) -> Optional[str]:
+    if not m:
+        return None
+    m = re.sub(r"\biphone\b", "iPhone", m, flags=re.I)
+    m = re.sub(r"gb\b", "GB", m, flags=re.I)
+    return m.strip()
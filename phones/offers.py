@@ -0,0 +1,69 @@
+from __future__ import annotations
+from datetime import datetime
+from typing import Dict, Iterable, List, NamedTuple
+
+from django.utils import timezone
+
+from .models import Offer, Phone
+from .prices import parse_price, record_prices, refresh_rolling_prices
+from .signals import bulk_update_phones
+
+
+class OfferRow(NamedTuple):
+    phone_id: int
+    retailer: str
+    price_sgd: object
+    url: str
+    seen_at: datetime | None = None
+
+
+# Upsert one offer per (phone, retailer) in a single statement, then re-materialize touched phones
+def ingest_offers(rows: Iterable[OfferRow]) -> List[int]:
+    now = timezone.now()
+    latest: Dict[tuple, Offer] = {}
+    for row in rows:
+        price = parse_price(row.price_sgd)
+        retailer = (row.retailer or "").strip().lower()
+        if price is None or not retailer:
+            continue
+        latest[(row.phone_id, retailer)] = Offer(
+            phone_id=row.phone_id, retailer=retailer, price_sgd=price,
+            url=row.url or "", seen_at=row.seen_at or now,
+        )
+    if not latest:
+        return []
+    Offer.objects.bulk_create(
+        latest.values(), batch_size=500, update_conflicts=True,
+        unique_fields=["phone", "retailer"], update_fields=["price_sgd", "url", "seen_at"],
+    )
+    return materialize_best_prices({pid for pid, _ in latest})
+
+# Copy each phone's cheapest offer into price_sgd / price_url / price_retailer.
+# Only phones whose best offer moved are written; returns their ids.
+def materialize_best_prices(phone_ids: Iterable[int]) -> List[int]:
+    ids = list(phone_ids)
+    best: Dict[int, tuple] = {}
+    offers = (
+        Offer.objects.filter(phone_id__in=ids)
+        .order_by("phone_id", "price_sgd", "-seen_at")
+        .values_list("phone_id", "price_sgd", "url", "retailer")
+    )
+    for pid, price, url, retailer in offers:
+        best.setdefault(pid, (price, url, retailer))
+
+    changed = []
+    phones = Phone.objects.filter(pk__in=best).only("pk", "price_sgd", "price_url", "price_retailer", "scoring_profile")
+    for phone in phones:
+        price, url, retailer = best[phone.pk]
+        if (phone.price_sgd, phone.price_url, phone.price_retailer) != (price, url, retailer):
+            phone.price_sgd, phone.price_url, phone.price_retailer = price, url, retailer
+            changed.append(phone)
+    bulk_update_phones(changed, ["price_sgd", "price_url", "price_retailer"])
+    return [p.pk for p in changed]
+
+# Record the materialized price of each phone in ``seen`` (phone id -> time) in the price history
+def observe_best_prices(seen: Dict[int, datetime]) -> List[int]:
+    current = Phone.objects.filter(pk__in=list(seen)).values_list("pk", "price_sgd")
+    changed = record_prices((pid, price, seen[pid]) for pid, price in current)
+    refresh_rolling_prices(changed)
+    return changed
@@ -0,0 +1,55 @@
+from __future__ import annotations
+from bisect import bisect_right
+from itertools import groupby
+from typing import Any, Dict, Iterable, List, Tuple
+
+from .catalogue import Catalogue, derived
+
+# Distinct filter sets kept per catalogue version before the cache is reset
+MAX_CACHED_FILTERS = 256
+
+# Layer 0 is the Pareto frontier on (raw_score up, price down): no other phone
+# is both at least as cheap and at least as strong. Layer 1 is the frontier of
+# what remains, and so on.
+
+def pareto_layers(points: Iterable[Tuple[float, float, int]]) -> Dict[int, int]:
+    """Map each key of (price, raw_score, key) points to its frontier layer.
+
+    One sweep in price order; ``neg_best[L]`` holds minus the best raw score seen
+    so far in layer L, which stays sorted, so each point finds its layer by
+    bisection. Exact duplicates don't dominate each other, so they share a layer.
+    """
+    ordered = sorted(points, key=lambda p: (p[0], -p[1]))
+    neg_best: List[float] = []
+    layers: Dict[int, int] = {}
+    for (_, raw), group in groupby(ordered, key=lambda p: (p[0], p[1])):
+        layer = bisect_right(neg_best, -raw)
+        if layer == len(neg_best):
+            neg_best.append(-raw)
+        else:
+            neg_best[layer] = -raw
+        for *_, key in group:
+            layers[key] = layer
+    return layers
+
+def _price(row: Dict[str, Any]) -> float | None:
+    try:
+        p = float(row.get("price_sgd"))
+    except (TypeError, ValueError):
+        return None
+    return p if p > 0 else None
+
+# Frontier layers for a filtered set of catalogue positions, cached per filter key
+def frontier(catalogue: Catalogue, positions: Iterable[int], filter_key: Any) -> Dict[int, int]:
+    cache = derived("pareto", lambda _: {}, catalogue)
+    if filter_key not in cache:
+        if len(cache) >= MAX_CACHED_FILTERS:
+            cache.clear()
+        rows = catalogue.rows
+        points = (
+            (price, rows[pos]["raw_score"], pos)
+            for pos in positions
+            if (price := _price(rows[pos])) is not None
+        )
+        cache[filter_key] = pareto_layers(points)
+    return cache[filter_key]
@@ -0,0 +1,124 @@
+from __future__ import annotations
+from datetime import datetime, timedelta
+from decimal import Decimal
+from typing import Any, Dict, Iterable, List, Tuple
+
+from django.db.models import OuterRef, Subquery
+from django.utils import timezone
+
+from .models import Phone, PriceObservation
+from .signals import bulk_update_phones
+
+# Window for the rolling min/avg columns on Phone
+PRICE_WINDOW_DAYS = 90
+_CENTS = Decimal("0.01")
+
+
+# Positive price rounded to cents, or None for blanks and junk
+def parse_price(value: Any) -> Decimal | None:
+    try:
+        price = Decimal(str(value)).quantize(_CENTS)
+    except (ArithmeticError, TypeError, ValueError):
+        return None
+    return price if price.is_finite() and price > 0 else None
+
+# Store (phone_id, price, observed_at) only where the price differs from the phone's latest observation
+def record_prices(observations: Iterable[Tuple[int, Any, datetime]]) -> List[int]:
+    pending: Dict[int, Tuple[Decimal, datetime]] = {}
+    for phone_id, price, observed_at in observations:
+        if (price := parse_price(price)) is not None:
+            pending[phone_id] = (price, observed_at)
+    if not pending:
+        return []
+
+    latest = PriceObservation.objects.filter(phone=OuterRef("pk")).order_by("-observed_at")
+    last_seen = dict(
+        Phone.objects.filter(pk__in=pending)
+        .annotate(last_price=Subquery(latest.values("price_sgd")[:1]))
+        .values_list("pk", "last_price")
+    )
+    changed = [pid for pid, (price, _) in pending.items() if last_seen.get(pid) != price]
+    PriceObservation.objects.bulk_create(
+        PriceObservation(phone_id=pid, price_sgd=pending[pid][0], observed_at=pending[pid][1])
+        for pid in changed
+    )
+    return changed
+
+# Time-weighted average and minimum of a step series over [start, end]
+def _window_stats(steps: List[Tuple[datetime, Decimal]], start: datetime, end: datetime):
+    # The price in effect at ``start`` is the last observation at or before it
+    inside = [(max(t, start), p) for t, p in steps if t <= end]
+    while len(inside) > 1 and inside[1][0] <= start:
+        inside.pop(0)
+    if not inside:
+        return None, None
+    total = Decimal(0)
+    span = 0.0
+    for (t, p), (t_next, _) in zip(inside, inside[1:] + [(end, None)]):
+        seconds = (t_next - t).total_seconds()
+        total += p * Decimal(seconds)
+        span += seconds
+    low = min(p for _, p in inside)
+    avg = (total / Decimal(span)).quantize(_CENTS) if span else inside[-1][1]
+    return low, avg
+
+# Recompute price_min_90d / price_avg_90d for the given phones (all when None)
+def refresh_rolling_prices(phone_ids: Iterable[int] | None = None, now: datetime | None = None) -> int:
+    now = now or timezone.now()
+    start = now - timedelta(days=PRICE_WINDOW_DAYS)
+    phones = Phone.objects.all() if phone_ids is None else Phone.objects.filter(pk__in=list(phone_ids))
+
+    history: Dict[int, List[Tuple[datetime, Decimal]]] = {}
+    rows = (
+        PriceObservation.objects.filter(phone__in=phones)
+        .order_by("phone_id", "observed_at")
+        .values_list("phone_id", "observed_at", "price_sgd")
+    )
+    for pid, t, price in rows.iterator(chunk_size=2000):
+        history.setdefault(pid, []).append((t, price))
+
+    changed = []
+    for phone in phones.only("pk", "price_min_90d", "price_avg_90d", "scoring_profile"):
+        low, avg = _window_stats(history.get(phone.pk, []), start, now)
+        if (low, avg) != (phone.price_min_90d, phone.price_avg_90d):
+            phone.price_min_90d, phone.price_avg_90d = low, avg
+            changed.append(phone)
+    bulk_update_phones(changed, ["price_min_90d", "price_avg_90d"])
+    return len(changed)
+
+# Downsample a phone's price steps into at most ``points`` buckets over the last ``days``
+def price_history(phone: Phone, days: int, points: int, now: datetime | None = None) -> List[Dict[str, Any]]:
+    now = now or timezone.now()
+    start = now - timedelta(days=days)
+    steps = list(
+        PriceObservation.objects.filter(phone=phone, observed_at__lte=now)
+        .order_by("observed_at")
+        .values_list("observed_at", "price_sgd")
+    )
+    # Keep the step in effect at ``start`` and everything after it
+    first = 0
+    while first + 1 < len(steps) and steps[first + 1][0] <= start:
+        first += 1
+    steps = steps[first:]
+    if not steps:
+        return []
+    start = max(start, steps[0][0])
+
+    width = (now - start) / points
+    out: List[Dict[str, Any]] = []
+    i = 0
+    price = steps[0][1]
+    for b in range(points):
+        lo, hi = start + width * b, start + width * (b + 1)
+        low = high = price
+        while i < len(steps) and steps[i][0] < hi:
+            price = steps[i][1]
+            low, high = min(low, price), max(high, price)
+            i += 1
+        # Consecutive flat buckets collapse into one point
+        if out and out[-1]["min"] == out[-1]["max"] == low == high == out[-1]["price"]:
+            continue
+        out.append({"t": lo, "price": price, "min": low, "max": high})
+        if width <= timedelta(0):
+            break
+    return out
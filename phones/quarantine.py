@@ -0,0 +1,111 @@
+from __future__ import annotations
+import json
+import re
+from collections import Counter
+from datetime import datetime
+from functools import lru_cache
+from typing import Any, Dict, FrozenSet, List, Sequence
+
+from django.conf import settings
+from django.db import models
+
+from .models import Phone
+
+# Reason codes written to the quarantine file; field-level codes are "code:field"
+NOT_AN_OBJECT = "not_an_object"
+MISSING_SLUG = "missing_slug"
+MISSING = "missing"
+BAD_TYPE = "bad_type"
+OUT_OF_RANGE = "out_of_range"
+UNKNOWN_CHIPSET = "unknown_chipset"
+INVALID = "invalid"
+
+# Key under which a quarantined item carries its reasons
+REASONS_KEY = "_quarantine"
+
+# Plausible bounds (inclusive) for normalised values
+RANGES = {
+    "battery_mah": (1000, 20000),
+    "refresh_hz": (30, 240),
+    # Positive, and within the DecimalField's max_digits
+    "price_sgd": (0.01, 99999999.99),
+}
+
+_paren = re.compile(r"\([^)]*\)")
+
+
+# Chipset lookup key: case, spacing and suffixes like "(Global)" don't matter
+def chipset_key(name: str) -> str:
+    return " ".join(_paren.sub(" ", name).lower().split())
+
+# Chipset keys from the soc_scores map; None when the check is disabled
+@lru_cache(maxsize=4)
+def known_chipsets(path) -> FrozenSet[str] | None:
+    if path is None:
+        return None
+    with open(path, encoding="utf-8") as fh:
+        return frozenset(chipset_key(name) for name in json.load(fh))
+
+def _numeric(v) -> bool:
+    return isinstance(v, (int, float)) and not isinstance(v, bool)
+
+# Whether a non-null value has the Python type the field stores
+def _type_check(field):
+    if isinstance(field, models.BooleanField):
+        return lambda v: isinstance(v, bool)
+    if isinstance(field, models.IntegerField):
+        return lambda v: _numeric(v) and float(v).is_integer()
+    if isinstance(field, (models.FloatField, models.DecimalField)):
+        return _numeric
+    if isinstance(field, models.DateTimeField):
+        return lambda v: isinstance(v, datetime)
+    return lambda v: isinstance(v, str)
+
+# Reasons per row for a chunk of normalised values (as from phone_defaults), checked a
+# column at a time; an empty list means the row can be written
+def check_values(names: Sequence[str], values: Sequence[Dict[str, Any]]) -> List[List[str]]:
+    reasons: List[List[str]] = [[] for _ in values]
+    for name in names:
+        field = Phone._meta.get_field(name)
+        column = [v.get(name) for v in values]
+        present = [(i, x) for i, x in enumerate(column) if x is not None]
+        if not field.null and len(present) < len(column):
+            for i, x in enumerate(column):
+                if x is None:
+                    reasons[i].append(f"{MISSING}:{name}")
+
+        ok = _type_check(field)
+        typed = []
+        for i, x in present:
+            if ok(x):
+                typed.append((i, x))
+            else:
+                reasons[i].append(f"{BAD_TYPE}:{name}")
+
+        if name in RANGES:
+            lo, hi = RANGES[name]
+            for i, x in typed:
+                if not lo <= x <= hi:
+                    reasons[i].append(f"{OUT_OF_RANGE}:{name}")
+
+        if name == "chipset" and (known := known_chipsets(settings.SOC_SCORES_PATH)) is not None:
+            for i, x in typed:
+                if chipset_key(x) not in known:
+                    reasons[i].append(UNKNOWN_CHIPSET)
+    return reasons
+
+# The raw item as it goes to the quarantine file, tagged with why it was held back
+def quarantined(item, reasons: List[str]) -> Dict[str, Any]:
+    entry = dict(item) if isinstance(item, dict) else {"item": item}
+    entry[REASONS_KEY] = reasons
+    return entry
+
+# Compact per-code counts, e.g. "out_of_range=2, unknown_chipset=1"
+def report(rejected: Sequence[Dict[str, Any]]) -> str:
+    counts = Counter(r.split(":", 1)[0] for entry in rejected for r in entry[REASONS_KEY])
+    return ", ".join(f"{code}={n}" for code, n in sorted(counts.items()))
+
+# Quarantined items as a final_spec-style list: fix them and import the file on its own
+def write_quarantine(path: str, rejected: Sequence[Dict[str, Any]]) -> None:
+    with open(path, "w", encoding="utf-8") as fh:
+        json.dump(list(rejected), fh, ensure_ascii=False, indent=2, default=str)
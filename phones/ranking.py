@@ -0,0 +1,264 @@
+from __future__ import annotations
+from typing import Any, Dict, Iterable, List, Mapping, Tuple
+import asyncio
+import hashlib
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from operator import itemgetter
+from urllib.parse import urlencode
+
+from django.conf import settings
+from rest_framework import serializers
+
+from .catalogue import Catalogue, get_catalogue
+from .compression import encode_variants
+from .facets import BOOLEAN_FACETS, KEYED_FACETS, RANGE_FILTERS, FacetIndex, get_facet_index
+from .pareto import frontier
+from .renderers import encode_json
+from .models import Phone
+from .scoring import SCORING_PROFILE_VERSION, PhoneSpec, calculate_smartbuy_score
+from .serializers import PhoneSerializer
+
+# Query parameters handled by the facet index
+FACET_PARAMS = frozenset(BOOLEAN_FACETS) | frozenset(KEYED_FACETS) | frozenset(RANGE_FILTERS)
+FILTER_PARAMS = FACET_PARAMS | {"brand"}
+# Parameters that change the ranked payload; anything else shares a cache entry
+RANKED_PARAMS = FILTER_PARAMS | {"mode", "facets", "view", "layers", "offset", "limit"}
+PARETO_MAX_LAYERS = 10
+
+# Lean path: pk, the card projection, then whatever else scoring reads
+CARD_FIELDS = tuple(PhoneSerializer.Meta.fields)
+LEAN_FIELDS = ("pk",) + CARD_FIELDS + tuple(f for f in PhoneSpec.ROW_FIELDS if f not in CARD_FIELDS)
+_card_values = itemgetter(*range(1, len(CARD_FIELDS) + 1))
+_spec_values = itemgetter(*(LEAN_FIELDS.index(f) for f in PhoneSpec.ROW_FIELDS))
+
+_executor: ThreadPoolExecutor | None = None
+
+
+# Normalized (mode, scoring_mode) from the query string
+def parse_mode(params: Mapping[str, str]) -> Tuple[str, str]:
+    mode = (params.get("mode", "budget") or "budget").lower()
+    return mode, "mid" if mode == "midrange" else mode
+
+def wants_facets(params: Mapping[str, str]) -> bool:
+    return params.get("facets") in ("1", "true")
+
+# (offset, limit) slice of the ranked list; limit None means to the end. Raises ValueError on bad input
+def page_bounds(params: Mapping[str, str]) -> Tuple[int, int | None]:
+    offset = int(params.get("offset") or 0)
+    limit = int(v) if (v := params.get("limit")) else None
+    if offset < 0 or (limit is not None and limit < 0):
+        raise ValueError("offset/limit")
+    return offset, limit
+
+# Digest of the normalized query, the catalogue stamp and the scoring profile
+def _query_digest(stamp: str, params: Mapping[str, str]) -> str:
+    query = sorted((k, params[k].lower() if k in ("mode", "brand") else params[k])
+                   for k in RANKED_PARAMS if params.get(k))
+    query += [("_stamp", stamp), ("_profile", str(SCORING_PROFILE_VERSION))]
+    return hashlib.sha1(urlencode(query).encode()).hexdigest()
+
+# Cache key for a ranked payload
+def ranked_cache_key(stamp: str, params: Mapping[str, str]) -> str:
+    return f"ranked:{_query_digest(stamp, params)}"
+
+# Strong ETag for a ranked payload in a given content coding; computable without ranking anything
+def ranked_etag(stamp: str, params: Mapping[str, str], encoding: str = "identity") -> str:
+    digest = _query_digest(stamp, params)
+    return f'"{digest}"' if encoding == "identity" else f'"{digest}-{encoding}"'
+
+# Apply brand plus facet/range filters; raises ValueError on bad input
+def filtered_queryset(params: Mapping[str, str]):
+    qs = Phone.objects.all()
+    if (v := params.get("brand")):
+        qs = qs.filter(brand__iexact=v)
+
+    # Facet and price/score range filters resolve to a candidate id set via the in-memory index
+    index = None
+    if wants_facets(params) or any(k in params for k in FACET_PARAMS):
+        index = get_facet_index()
+        if (selected := index.select(params)) is not None:
+            qs = qs.filter(pk__in=index.ids_for(selected))
+    return qs, index
+
+# Plain value tuples in LEAN_FIELDS order; no Phone instances are built
+def lean_values(qs):
+    return qs.values_list(*LEAN_FIELDS)
+
+# Serializer fields whose representation differs from the DB value (decimals, datetimes)
+def _card_converters() -> List[Tuple[str, Any]]:
+    fields = PhoneSerializer().fields
+    return [
+        (name, fields[name].to_representation)
+        for name in CARD_FIELDS
+        if isinstance(fields[name], (serializers.DecimalField, serializers.DateTimeField, serializers.DateField))
+    ]
+
+_CARD_CONVERTERS = _card_converters()
+
+# Same dict PhoneSerializer(phone).data would produce, straight from a lean row
+def card_from_row(row: Tuple[Any, ...]) -> Dict[str, Any]:
+    data = dict(zip(CARD_FIELDS, _card_values(row)))
+    for name, convert in _CARD_CONVERTERS:
+        if data[name] is not None:
+            data[name] = convert(data[name])
+    return data
+
+def spec_from_row(row: Tuple[Any, ...]) -> PhoneSpec:
+    return PhoneSpec.from_row(_spec_values(row))
+
+# Score, blend and sort lean_values() rows; wraps with facet counts when requested
+def rank_phones(rows: Iterable[Tuple[Any, ...]], params: Mapping[str, str], index: FacetIndex | None = None):
+    mode, scoring_mode = parse_mode(params)
+    want_facets = wants_facets(params)
+    offset, limit = page_bounds(params)
+
+    # Compute raw and SmartBuy scores
+    results = []
+    result_ids = []
+    for row in rows:
+        result_ids.append(row[0])
+        spec = spec_from_row(row)
+        smartbuy, raw, breakdown = calculate_smartbuy_score(spec, mode=scoring_mode)
+        data = card_from_row(row)
+        data["smartbuy_score"] = float(smartbuy)
+        data["raw_score"] = float(raw)
+        data["score_breakdown"] = breakdown
+        data["_id"] = data.get("slug") or str(data.get("id"))  # stable identifier
+        results.append(data)
+
+    if results:
+        blend_scores(results, mode)
+    page = results[offset:None if limit is None else offset + limit]
+    return with_facets(page, index, result_ids) if want_facets else page
+
+# Encoded and precompressed ranked payload for one query; raises ValueError on bad input
+def ranked_variants(params: Mapping[str, str]) -> Dict[str, bytes]:
+    from .leaderboards import leaderboard_results
+
+    # Plain mode/brand lists are slices of the precomputed leaderboards
+    results = leaderboard_results(params)
+    if results is None:
+        qs, index = filtered_queryset(params)
+        results = rank_phones(lean_values(qs), params, index)
+    return encode_variants(encode_json(results))
+
+# Bounded pool that keeps CPU-bound ranking off the event loop
+def _ranking_executor() -> ThreadPoolExecutor:
+    global _executor
+    if _executor is None:
+        _executor = ThreadPoolExecutor(max_workers=settings.RANKING_WORKERS, thread_name_prefix="ranking")
+    return _executor
+
+async def arank_phones(rows: List[Tuple[Any, ...]], params: Mapping[str, str], index: FacetIndex | None = None):
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(_ranking_executor(), partial(rank_phones, rows, params, index))
+
+# Share of the blended score given to raw performance per mode; the rest is value
+_MODE_RAW_WEIGHT = {"budget": 0.30, "midrange": 0.50, "flagship": 0.90}
+
+def _norm(x, lo, hi):
+    return 0.5 if hi <= lo else (x - lo) / (hi - lo)
+
+# (score, raw_norm, val_norm) for one phone, given the bounds and ranks of the whole result set
+def blend_one(raw: float, val: float, raw_rank: int, val_rank: int,
+              bounds: Tuple[float, float, float, float], max_rank: int, mode: str) -> Tuple[float, float, float]:
+    raw_min, raw_max, val_min, val_max = bounds
+    raw_norm_c = _norm(raw, raw_min, raw_max)
+    val_norm_c = _norm(val, val_min, val_max)
+    raw_norm_r = 1 - (raw_rank / max_rank)
+    val_norm_r = 1 - (val_rank / max_rank)
+
+    # Blend continuous + rank-based
+    raw_norm = 0.7 * raw_norm_c + 0.3 * raw_norm_r
+    val_norm = 0.7 * val_norm_c + 0.3 * val_norm_r
+
+    # Guardrails adjust value normalization
+    if raw < 6.0:
+        val_norm *= 0.85
+    elif raw >= 7.5:
+        val_norm *= 1.05
+
+    # Mode-specific weighting of raw vs value
+    w = _MODE_RAW_WEIGHT.get(mode, 0.30)
+    score = w * raw_norm + (1 - w) * val_norm
+    return round(score, 6), round(raw_norm, 6), round(val_norm, 6)
+
+# Safe price parsing for tiebreakers
+def tiebreak_price(value: Any) -> float:
+    try:
+        return float(value if value is not None else float("inf"))
+    except (TypeError, ValueError):
+        return float("inf")
+
+# Blend raw and value scores in place and sort best first
+def blend_scores(results: List[Dict[str, Any]], mode: str) -> None:
+    # Continuous normalizers
+    raw_vals = [p["raw_score"] for p in results]
+    val_vals = [p["smartbuy_score"] for p in results]
+    bounds = (min(raw_vals), max(raw_vals), min(val_vals), max(val_vals))
+
+    # Rank-based normalizers
+    ranked_by_raw = sorted(results, key=lambda x: x["raw_score"], reverse=True)
+    ranked_by_val = sorted(results, key=lambda x: x["smartbuy_score"], reverse=True)
+    raw_ranks = {p["_id"]: i for i, p in enumerate(ranked_by_raw)}
+    val_ranks = {p["_id"]: i for i, p in enumerate(ranked_by_val)}
+    max_rank = len(results) - 1 or 1
+
+    # Final blended scoring
+    for p in results:
+        score, raw_norm, val_norm = blend_one(
+            p["raw_score"], p["smartbuy_score"], raw_ranks[p["_id"]], val_ranks[p["_id"]],
+            bounds, max_rank, mode,
+        )
+        p["_raw_norm"] = raw_norm
+        p["_val_norm"] = val_norm
+        p["_price"] = tiebreak_price(p.get("price_sgd"))
+        p["score"] = score
+
+    # Sort with deterministic tiebreakers
+    results.sort(
+        key=lambda x: (x["score"], x["_raw_norm"], x["_val_norm"], -x["_price"]),
+        reverse=True,
+    )
+
+    # Cleanup temporary fields
+    for p in results:
+        p.pop("_raw_norm", None)
+        p.pop("_val_norm", None)
+        p.pop("_price", None)
+        p.pop("_id", None)
+
+
+# Wrap the ranked list with facet counts over the returned phones
+def with_facets(results, index, result_ids):
+    counts = index.counts(index.bits_for_ids(result_ids))
+    return {"count": len(result_ids), "results": results, "facets": counts}
+
+# Catalogue positions matching the brand/facet filters, plus a hashable key for the filter set;
+# raises ValueError on bad input
+def catalogue_positions(catalogue: Catalogue, params: Mapping[str, str]) -> Tuple[List[int], tuple]:
+    selected = get_facet_index(catalogue).select(params)
+    positions = list(range(len(catalogue))) if selected is None else list(selected)
+    if (brand := (params.get("brand") or "").lower()):
+        positions = [p for p in positions if (catalogue.rows[p]["brand"] or "").lower() == brand]
+    filter_key = tuple(sorted((k, params[k].lower()) for k in FILTER_PARAMS if params.get(k)))
+    return positions, filter_key
+
+# Non-dominated phones on (raw_score, price), layer by layer, instead of the blended ranking
+def pareto_results(params: Mapping[str, str]) -> List[Dict[str, Any]]:
+    depth = max(1, min(int(params.get("layers", 1)), PARETO_MAX_LAYERS))
+    catalogue = get_catalogue()
+    positions, filter_key = catalogue_positions(catalogue, params)
+    layers = frontier(catalogue, positions, filter_key)
+
+    picked = sorted(
+        (layer, float(catalogue.rows[pos]["price_sgd"]), pos)
+        for pos, layer in layers.items() if layer < depth
+    )
+    results = []
+    for layer, _, pos in picked:
+        data = {k: v for k, v in catalogue.rows[pos].items() if k != "id"}
+        data["pareto_layer"] = layer
+        results.append(data)
+    return results
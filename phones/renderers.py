@@ -0,0 +1,64 @@
+import json
+from django.http import HttpResponse
+from django.utils.cache import patch_vary_headers
+from django.utils.functional import cached_property
+from rest_framework.renderers import JSONRenderer
+from rest_framework.utils.encoders import JSONEncoder
+
+from .compression import decompress
+
+try:
+    import orjson
+except ImportError:  # optional dependency; fall back to DRF's json encoder
+    orjson = None
+
+# Anything orjson can't encode natively (Decimal, lazy strings, timedelta...), and
+# datetimes, whose format differs, go through DRF's encoder so output matches JSONRenderer.
+_drf_default = JSONEncoder().default
+
+# Keep output a strict JavaScript subset, as JSONRenderer does
+_LS, _PS = "\u2028".encode(), "\u2029".encode()
+
+def encode_json(data, indent: bool = False) -> bytes:
+    if orjson is None:
+        return JSONRenderer().render(data, "application/json; indent=2" if indent else None)
+    option = orjson.OPT_NON_STR_KEYS | orjson.OPT_PASSTHROUGH_DATETIME | (orjson.OPT_INDENT_2 if indent else 0)
+    ret = orjson.dumps(data, default=_drf_default, option=option)
+    if _LS in ret or _PS in ret:
+        ret = ret.replace(_LS, b"\\u2028").replace(_PS, b"\\u2029")
+    return ret
+
+def decode_json(body: bytes):
+    return orjson.loads(body) if orjson is not None else json.loads(body)
+
+
+class EncodedJSONResponse(HttpResponse):
+    """Response for a body that is already JSON-encoded (e.g. from the cache).
+
+    Bypasses serialization and rendering entirely. ``encoding`` names the
+    content coding the body is already compressed with; ``data`` decodes
+    lazily for callers that expect DRF's Response interface.
+    """
+
+    def __init__(self, body: bytes, encoding: str = "identity", **kwargs):
+        kwargs.setdefault("content_type", "application/json")
+        super().__init__(body, **kwargs)
+        if encoding != "identity":
+            self["Content-Encoding"] = encoding
+        patch_vary_headers(self, ("Accept-Encoding",))
+
+    @cached_property
+    def data(self):
+        return decode_json(decompress(self.content, self.get("Content-Encoding")))
+
+
+class ORJSONRenderer(JSONRenderer):
+    """JSONRenderer backed by orjson when it is installed."""
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if orjson is None:
+            return super().render(data, accepted_media_type, renderer_context)
+        if data is None:
+            return b""
+        indent = self.get_indent(accepted_media_type, renderer_context or {})
+        return encode_json(data, indent=bool(indent))
@@ -1,5 +1,6 @@
 from __future__ import annotations
-from typing import Any, Tuple, Dict
+from dataclasses import dataclass
+from typing import Any, ClassVar, Tuple, Dict
 import re
 
 # Regex patterns
@@ -39,8 +40,16 @@ _W = {
     "protection" : 1.0,
 }
 MAX_SCORE = sum(_W.values())
+
+# Bump whenever weights, tier curves or lookup tables change, so cached
+# rankings and HTTP validators derived from scores are invalidated.
+SCORING_PROFILE_VERSION = 2
 _OLED_UNKNOWN_BASELINE = 0.5
 
+# Value bonus/penalty for trading below/above the 90-day average price
+_DEAL_WEIGHT = 0.5
+_DEAL_CAP = 0.2
+
 # IP protection
 _IP_SCORES = {
     "IP52": 0.20, "IP53": 0.25, "IP54": 0.30, "IP55": 0.35,
@@ -62,7 +71,22 @@ def _ip_score(ip_rating: Any) -> float:
     return _IP_SCORES.get(key, _IP_SCORES["UNKNOWN"])
 
 # Tier curves (SoC / RAM / Storage / Display)
-# Each function maps raw hardware values into a 0–2.0 scale contribution.
+# Each table maps raw hardware values into a 0–2.0 scale contribution:
+# (threshold, points) pairs, best first; the first threshold reached wins.
+_SOC_TIERS = ((9.0, 2.00), (8.0, 1.60), (7.0, 1.30), (6.0, 1.00), (5.0, 0.75), (4.0, 0.50))
+_RAM_TIERS = ((20, 2.0), (16, 1.75), (12, 1.5), (8, 1.0), (6, 0.5))
+_ROM_TIERS = ((1024, 2.0), (512, 1.75), (256, 1.5), (128, 1.0), (64, 0.5))
+_REFRESH_TIERS = ((120, 0.4), (90, 0.3), (60, 0.2))
+_RES_TIERS = ((1440, 0.6), (1200, 0.4), (1080, 0.3), (720, 0.2))
+_PPI_TIERS = ((450, 0.5), (390, 0.4))
+_PANEL_PTS = {True: 0.5, False: 0.25}
+
+# Points for the first tier whose threshold ``value`` reaches.
+def _tier_pts(value: float, tiers: tuple[tuple[float, float], ...], default: float = 0.0) -> float:
+    for threshold, pts in tiers:
+        if value >= threshold:
+            return pts
+    return default
 
 # Map SoC performance tier score to base points.
 def _soc_base_pts(soc_tier: float) -> float:
@@ -70,13 +94,7 @@ def _soc_base_pts(soc_tier: float) -> float:
         t = float(soc_tier)
     except (TypeError, ValueError):
         return 0.0
-    if t >= 9.0: return 2.00
-    if t >= 8.0: return 1.60
-    if t >= 7.0: return 1.30
-    if t >= 6.0: return 1.00
-    if t >= 5.0: return 0.75
-    if t >= 4.0: return 0.50
-    return 0.0
+    return _tier_pts(t, _SOC_TIERS)
 
 # Assign points based on RAM capacity.
 def _ram_base_pts(ram_gb: float) -> float:
@@ -84,12 +102,7 @@ def _ram_base_pts(ram_gb: float) -> float:
         r = float(ram_gb or 0)
     except (TypeError, ValueError):
         r = 0.0
-    if r >= 20: return 2.0
-    if r >= 16: return 1.75
-    if r >= 12: return 1.5
-    if r >= 8:  return 1.0
-    if r >= 6:  return 0.5
-    return 0.0
+    return _tier_pts(r, _RAM_TIERS)
 
 # Assign points based on storage capacity.
 def _rom_base_pts(storage_gb: float) -> float:
@@ -97,12 +110,7 @@ def _rom_base_pts(storage_gb: float) -> float:
         s = float(storage_gb or 0)
     except (TypeError, ValueError):
         s = 0.0
-    if s >= 1024: return 2.0
-    if s >= 512:  return 1.75
-    if s >= 256:  return 1.5
-    if s >= 128:  return 1.0
-    if s >= 64:   return 0.5
-    return 0.0
+    return _tier_pts(s, _ROM_TIERS)
 # Calculate display score from panel type, refresh rate, resolution, and PPI.
 def _display_base_pts(res_w: int, refresh: int, oled: bool, ppi: int) -> float:
     try:
@@ -112,21 +120,10 @@ def _display_base_pts(res_w: int, refresh: int, oled: bool, ppi: int) -> float:
     except (TypeError, ValueError):
         return 0.0
 
-    score = 0.0
-    score += 0.5 if oled else 0.25
-
-    if rr >= 120: score += 0.4
-    elif rr >= 90: score += 0.3
-    elif rr >= 60: score += 0.2
-
-    if ssw >= 1440: score += 0.6
-    elif ssw >= 1200: score += 0.4
-    elif ssw >= 1080: score += 0.3
-    elif ssw >= 720: score += 0.2
-
-    if dppi >= 450: score += 0.5
-    elif dppi >= 390: score += 0.4
-
+    score = _PANEL_PTS[bool(oled)]
+    score += _tier_pts(rr, _REFRESH_TIERS)
+    score += _tier_pts(ssw, _RES_TIERS)
+    score += _tier_pts(dppi, _PPI_TIERS)
     return _clamp(score, 0.0, 2.0)
 
 
@@ -166,29 +163,22 @@ def _camera_raw_score(mp: int | None, has_ois: bool, has_useful_uw: bool, brand:
 # Battery / charging
 # Assigns points for capacity (mAh) and charging wattage.
 
+_BATTERY_TIERS = ((6000, 2.0), (5500, 1.75), (5000, 1.5), (4500, 1.0), (4000, 0.75), (3000, 0.5))
+_CHARGING_TIERS = ((50, 2.0), (40, 1.5), (30, 1.0), (20, 0.75))
+
 def _battery_base_pts(mAh: int) -> float:
     try:
         b = int(mAh or 0)
     except (TypeError, ValueError):
         b = 0
-    if   b >= 6000: return 2.0
-    elif b >= 5500: return 1.75
-    elif b >= 5000: return 1.5
-    elif b >= 4500: return 1.0
-    elif b >= 4000: return 0.75
-    elif b >= 3000: return 0.5
-    return 0.0
+    return _tier_pts(b, _BATTERY_TIERS)
 
 def _charging_base_pts(watts: int) -> float:
     try:
         w = int(watts or 0)
     except (TypeError, ValueError):
         w = 0
-    if w >= 50: return 2.0
-    if w >= 40: return 1.5
-    if w >= 30: return 1.0
-    if w >= 20: return 0.75
-    return 0.0
+    return _tier_pts(w, _CHARGING_TIERS)
 
 
 # Durability
@@ -221,19 +211,17 @@ def _glass_baseline(glass_type: str | None) -> float:
     return 0.46
 
 # Calculate score adjustment from Mohs hardness rating.
+_MOHS_TIERS = ((6.5, 0.15), (6.0, 0.10), (5.5, 0.06), (5.0, 0.03), (4.5, 0.00), (4.0, -0.02))
+_MOHS_FLOOR = -0.08
+
 def _mohs_delta(mohs: float | int | None) -> float:
     try:
         m = float(mohs) if mohs is not None else None
     except (TypeError, ValueError):
         m = None
-    if m is None:  return 0.00
-    if m >= 6.5:   return 0.15
-    if m >= 6.0:   return 0.10
-    if m >= 5.5:   return 0.06
-    if m >= 5.0:   return 0.03
-    if m >= 4.5:   return 0.00
-    if m >= 4.0:   return -0.02
-    return -0.08
+    if m is None:
+        return 0.00
+    return _tier_pts(m, _MOHS_TIERS, _MOHS_FLOOR)
 
 # Combine glass baseline and Mohs delta, with caps based on glass family.
 def _durability_score(glass_type: str | None, mohs: float | int | None) -> float:
@@ -284,65 +272,168 @@ def _resolve_charging_w(phone: Any) -> int:
         return 0
 
 
+# Scoring input
+def _float(v: Any, default: float | None = 0.0) -> float | None:
+    try:
+        return float(v) if v is not None else default
+    except (TypeError, ValueError):
+        return default
+
+def _int(v: Any) -> int:
+    try:
+        return int(v or 0)
+    except (TypeError, ValueError):
+        return 0
+
+def _price(v: Any) -> float | None:
+    p = _float(v, None)
+    return p if p is not None and p == p else None
+
+@dataclass(slots=True)
+class PhoneSpec:
+    """Everything scoring reads, resolved once from a model, values_list row or raw dict."""
+
+    brand: str = ""
+    soc_score: float | None = None
+    ram_gb: float = 0.0
+    storage_gb: float = 0.0
+    short_side: int = 0
+    oled: bool = False
+    refresh_hz: int = 0
+    ppi: int = 0
+    main_mp: float = 0.0
+    front_mp: float = 0.0
+    has_ois: bool = False
+    useful_ultrawide: bool = False
+    battery_mah: int = 0
+    charging_w: int = 0
+    has_5g: bool = False
+    has_nfc: bool = False
+    has_stereo_speakers: bool = False
+    glass_type: str | None = None
+    mohs: float | None = None
+    ip_rating: str | None = None
+    price_sgd: float | None = None
+    price_avg_90d: float | None = None
+
+    # Phone columns in the order from_row expects: Phone.objects.values_list(*PhoneSpec.ROW_FIELDS)
+    ROW_FIELDS: ClassVar[Tuple[str, ...]] = (
+        "brand", "soc_score", "ram_gb", "storage_gb", "res_w", "res_h", "display_type",
+        "refresh_hz", "ppi", "main_mp", "front_mp", "camera_main_mp", "has_ois",
+        "battery_mah", "charging_w", "has_5g", "has_nfc", "has_stereo_speakers",
+        "glass_type", "mohs", "ip_rating", "price_sgd", "price_avg_90d",
+    )
+
+    @classmethod
+    def from_row(cls, row: Tuple[Any, ...]) -> "PhoneSpec":
+        return cls.from_fields(**dict(zip(cls.ROW_FIELDS, row)))
+
+    @classmethod
+    def from_model(cls, phone: Any) -> "PhoneSpec":
+        return cls.from_fields(**{f: getattr(phone, f, None) for f in cls.ROW_FIELDS})
+
+    # Raw/scraped dicts may use alias keys (refresh_rate, ip, display_protection, ...)
+    @classmethod
+    def from_dict(cls, d: Dict[str, Any]) -> "PhoneSpec":
+        fields = {f: d.get(f) for f in cls.ROW_FIELDS}
+        fields.update(
+            refresh_hz=_resolve_refresh(d), ppi=_resolve_ppi(d), charging_w=_resolve_charging_w(d),
+            glass_type=_resolve_glass(d), ip_rating=_resolve_ip(d),
+        )
+        return cls.from_fields(**fields)
+
+    @classmethod
+    def from_fields(cls, *, res_w=None, res_h=None, display_type=None, camera_main_mp=None,
+                    **f: Any) -> "PhoneSpec":
+        try:
+            short_side = min(int(res_w or 0), int(res_h or 0))
+        except (TypeError, ValueError):
+            short_side = 0
+        glass = f.get("glass_type")
+        return cls(
+            brand=f.get("brand") or "",
+            soc_score=_float(f.get("soc_score"), None),
+            ram_gb=_float(f.get("ram_gb") or 0),
+            storage_gb=_float(f.get("storage_gb") or 0),
+            short_side=short_side,
+            oled="oled" in str(display_type if display_type is not None else "").lower(),
+            refresh_hz=_int(f.get("refresh_hz")),
+            ppi=_int(f.get("ppi")),
+            main_mp=max(0.0, _float(f.get("main_mp"))),
+            front_mp=_float(f.get("front_mp")),
+            has_ois=bool(f.get("has_ois")),
+            useful_ultrawide=_has_useful_ultrawide(camera_main_mp),
+            battery_mah=_int(f.get("battery_mah")),
+            charging_w=_resolve_charging_w({"charging_w": f.get("charging_w")}),
+            has_5g=bool(f.get("has_5g")),
+            has_nfc=bool(f.get("has_nfc")),
+            has_stereo_speakers=bool(f.get("has_stereo_speakers")),
+            glass_type=_resolve_glass({"glass_type": glass}),
+            mohs=_float(f.get("mohs"), None),
+            ip_rating=_normalize_ip(f.get("ip_rating")),
+            price_sgd=_price(f.get("price_sgd")),
+            price_avg_90d=_price(f.get("price_avg_90d")),
+        )
+
+    # Accept a PhoneSpec as-is; convert dicts and model instances
+    @classmethod
+    def coerce(cls, phone: Any) -> "PhoneSpec":
+        if isinstance(phone, cls):
+            return phone
+        return cls.from_dict(phone) if isinstance(phone, dict) else cls.from_model(phone)
+
+
 # Core scoring
 def calculate_raw_score(phone: Any, mode: str = "mid") -> Tuple[float, Dict[str, float]]:
-    g, W = _get, _W
+    spec, W = PhoneSpec.coerce(phone), _W
     max_score = MAX_SCORE
 
     # SoC / RAM / Storage
-    soc_pts = (_soc_base_pts(g(phone, "soc_score", 0)) / 2.0) * W["soc"]
-    ram_pts = (_ram_base_pts(g(phone, "ram_gb", 0)) / 2.0) * W["ram"]
-    rom_pts = (_rom_base_pts(g(phone, "storage_gb", 0)) / 2.0) * W["storage"]
+    soc_pts = (_soc_base_pts(spec.soc_score) / 2.0) * W["soc"]
+    ram_pts = (_ram_base_pts(spec.ram_gb) / 2.0) * W["ram"]
+    rom_pts = (_rom_base_pts(spec.storage_gb) / 2.0) * W["storage"]
 
     # Display
-    res_w, res_h = g(phone, "res_w", 0), g(phone, "res_h", 0)
-    try:
-        short_side = min(int(res_w or 0), int(res_h or 0))
-    except (TypeError, ValueError):
-        short_side = 0
-
-    is_oled = "oled" in str(g(phone, "display_type", "")).lower()
     disp_base = (
-        _OLED_UNKNOWN_BASELINE if short_side == 0 and is_oled
+        _OLED_UNKNOWN_BASELINE if spec.short_side == 0 and spec.oled
         else _display_base_pts(
-            res_w=short_side,
-            refresh=_resolve_refresh(phone),
-            oled=is_oled,
-            ppi=_resolve_ppi(phone),
+            res_w=spec.short_side,
+            refresh=spec.refresh_hz,
+            oled=spec.oled,
+            ppi=spec.ppi,
         )
     )
     disp_pts = (disp_base / 2.0) * W["display"]
 
     # Camera
-    has_useful_uw = _has_useful_ultrawide(g(phone, "camera_main_mp", ""))
     cam_raw = _camera_raw_score(
-        mp=g(phone, "main_mp", 0),
-        has_ois=g(phone, "has_ois", False),
-        has_useful_uw=has_useful_uw,
-        brand=g(phone, "brand", ""),
-        front_mp=g(phone, "front_mp", None),
+        mp=spec.main_mp,
+        has_ois=spec.has_ois,
+        has_useful_uw=spec.useful_ultrawide,
+        brand=spec.brand,
+        front_mp=spec.front_mp,
     )
     cam_raw_capped = min(cam_raw, _CAMERA_RAW_MAX)
     camera_pts = (cam_raw_capped / _CAMERA_RAW_MAX) * W["camera"]
 
     # Battery / Charging
-    batt_pts = (_battery_base_pts(g(phone, "battery_mah", 0)) / 2.0) * W["battery"]
-    chg_pts  = (_charging_base_pts(_resolve_charging_w(phone)) / 2.0) * W["charging"]
+    batt_pts = (_battery_base_pts(spec.battery_mah) / 2.0) * W["battery"]
+    chg_pts  = (_charging_base_pts(spec.charging_w) / 2.0) * W["charging"]
 
     # Extras (5G, NFC, stereo speakers)
     extras_raw = (
-        (1.0 if g(phone, "has_5g", False) else 0.0) +
-        (0.5 if g(phone, "has_nfc", False) else 0.0) +
-        (0.5 if g(phone, "has_stereo_speakers", False) else 0.0)
+        (1.0 if spec.has_5g else 0.0) +
+        (0.5 if spec.has_nfc else 0.0) +
+        (0.5 if spec.has_stereo_speakers else 0.0)
     )
     extras_pts = (extras_raw / 2.0) * W["extras"]
 
     # Durability (glass + Mohs hardness)
-    durability_unit = _durability_score(_resolve_glass(phone), g(phone, "mohs", None))
+    durability_unit = _durability_score(spec.glass_type, spec.mohs)
     durability_pts  = durability_unit * W["durability"]
 
     # Protection 
-    protection_pts = _ip_score(_resolve_ip(phone)) * W["protection"]
+    protection_pts = _ip_score(spec.ip_rating) * W["protection"]
 
     # normalize to 0–10
     raw_score_pts = (
@@ -369,13 +460,16 @@ def calculate_raw_score(phone: Any, mode: str = "mid") -> Tuple[float, Dict[str,
 
 # Value wrapper
 def calculate_smartbuy_score(phone: Any, mode: str = "mid") -> tuple[float, float, Dict[str, float]]:
-    raw, breakdown = calculate_raw_score(phone, mode=mode)
-    price_raw = _get(phone, "price_sgd")
-    try:
-        price = float(price_raw)
-        if price <= 0:
-            return (0.0, raw, breakdown)
-    except (TypeError, ValueError):
+    spec = PhoneSpec.coerce(phone)
+    raw, breakdown = calculate_raw_score(spec, mode=mode)
+    price = spec.price_sgd
+    if price is None or price <= 0:
         return (0.0, raw, breakdown)
     smartbuy = (raw / price) * 100.0
+
+    # Price drops against the rolling average lift value; spikes lower it
+    avg = spec.price_avg_90d
+    if avg and avg > 0:
+        deal = _clamp((avg - price) / avg, -_DEAL_CAP, _DEAL_CAP)
+        smartbuy *= 1.0 + _DEAL_WEIGHT * deal
     return smartbuy, raw, breakdown
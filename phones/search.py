@@ -0,0 +1,87 @@
+from __future__ import annotations
+from typing import Any, Dict, List, Set
+import re
+
+from .catalogue import Catalogue, derived
+from .normalize import tidy_model_case
+
+_NON_ALNUM_RE = re.compile(r"[^a-z0-9]+")
+
+# Matches scoring below this Dice coefficient are dropped (typo tolerance floor)
+MIN_SIMILARITY = 0.3
+# Bonus per query token that appears verbatim in the phone's name
+_TOKEN_BONUS = 0.1
+
+# Same casing rules as the cleaning pipeline, then fold case and punctuation
+def normalize_text(text: str | None) -> str:
+    s = (tidy_model_case(text) or "").lower()
+    return _NON_ALNUM_RE.sub(" ", s).strip()
+
+def tokens(text: str | None) -> List[str]:
+    return normalize_text(text).split()
+
+# Padded trigrams per token, so "s25" and "25" still yield usable grams
+def trigrams(toks: List[str]) -> Set[str]:
+    grams: Set[str] = set()
+    for t in toks:
+        padded = f"${t}$"
+        grams.update(padded[i:i + 3] for i in range(len(padded) - 2))
+    return grams
+
+
+class SearchIndex:
+    """Inverted trigram index over brand, model and slug of every catalogue row."""
+
+    def __init__(self, catalogue: Catalogue):
+        self.rows = catalogue.rows
+        self.postings: Dict[str, List[int]] = {}
+        self.gram_counts: List[int] = []
+        self.token_sets: List[Set[str]] = []
+        for pos, row in enumerate(self.rows):
+            toks = tokens(f"{row.get('brand') or ''} {row.get('model') or ''}")
+            toks += [t for t in tokens(row.get("slug")) if t not in toks]
+            grams = trigrams(toks)
+            for g in grams:
+                self.postings.setdefault(g, []).append(pos)
+            self.gram_counts.append(len(grams))
+            self.token_sets.append(set(toks))
+
+    # Rank rows by trigram Dice similarity plus exact-token bonuses
+    def search(self, query: str, limit: int = 10) -> List[Dict[str, Any]]:
+        q_toks = tokens(query)
+        q_grams = trigrams(q_toks)
+        if not q_grams:
+            return []
+
+        overlap: Dict[int, int] = {}
+        for g in q_grams:
+            for pos in self.postings.get(g, ()):
+                overlap[pos] = overlap.get(pos, 0) + 1
+
+        scored = []
+        for pos, common in overlap.items():
+            sim = 2.0 * common / (len(q_grams) + self.gram_counts[pos])
+            if sim < MIN_SIMILARITY:
+                continue
+            hits = sum(1 for t in q_toks if t in self.token_sets[pos])
+            scored.append((sim + _TOKEN_BONUS * hits, pos))
+
+        # Best match first; stronger phones break ties
+        scored.sort(key=lambda x: (-x[0], -self.rows[x[1]]["raw_score"], x[1]))
+        return [self._hit(pos, score) for score, pos in scored[:limit]]
+
+    def _hit(self, pos: int, score: float) -> Dict[str, Any]:
+        row = self.rows[pos]
+        return {
+            "slug": row["slug"],
+            "brand": row["brand"],
+            "model": row["model"],
+            "price_sgd": row["price_sgd"],
+            "raw_score": row["raw_score"],
+            "smartbuy_score": row["smartbuy_score"],
+            "match": round(score, 4),
+        }
+
+
+def get_search_index(catalogue: Catalogue | None = None) -> SearchIndex:
+    return derived("search", SearchIndex, catalogue)
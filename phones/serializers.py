@@ -1,5 +1,5 @@
 from rest_framework import serializers
-from .models import Phone
+from .models import CatalogueChange, Phone
 
 
 class PhoneSerializer(serializers.ModelSerializer):
@@ -10,7 +10,7 @@ class PhoneSerializer(serializers.ModelSerializer):
             "model", "slug", "brand", "source_url", "warranty", "scraped_at",
 
             # Pricing
-            "price_sgd", "price_url",
+            "price_sgd", "price_url", "price_retailer", "price_min_90d", "price_avg_90d",
 
             # SoC / platform
             "soc_score", "chipset", "gpu", "bt_ver",
@@ -36,3 +36,9 @@ class PhoneSerializer(serializers.ModelSerializer):
             # Durability / protection
             "glass_type", "mohs", "ip_rating",
         ]
+
+
+class CatalogueChangeSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = CatalogueChange
+        fields = ["id", "version", "slug", "action", "changed_fields", "old_score", "new_score", "created_at"]
@@ -0,0 +1,36 @@
+from django.db.models.signals import post_delete, post_save, pre_save
+from django.dispatch import receiver
+
+from .catalogue import notify_catalogue_changed
+from .models import Phone
+from .scoring import PhoneSpec
+
+# Columns the stored scores are computed from
+SCORING_INPUTS = frozenset(PhoneSpec.ROW_FIELDS)
+
+
+# Any saved or deleted phone invalidates snapshots and derived indexes
+@receiver(post_save, sender=Phone)
+@receiver(post_delete, sender=Phone)
+def phone_changed(sender, **kwargs):
+    notify_catalogue_changed()
+
+
+# Any save may change scoring inputs, so stored scores go stale until the next rescore
+@receiver(pre_save, sender=Phone)
+def phone_saving(sender, instance, **kwargs):
+    instance.scoring_profile = 0
+
+
+# bulk_update skips the signals above, so bulk writers go through here: stored scores
+# go stale when a scoring input is written, and the catalogue change is announced
+def bulk_update_phones(phones, fields, batch_size=500):
+    if not phones:
+        return
+    fields = list(fields)
+    if SCORING_INPUTS.intersection(fields):
+        for phone in phones:
+            phone.scoring_profile = 0
+        fields.append("scoring_profile")
+    Phone.objects.bulk_update(phones, fields, batch_size=batch_size)
+    notify_catalogue_changed()
@@ -0,0 +1,139 @@
+from __future__ import annotations
+from typing import Any, Callable, Dict, List, Sequence, Tuple
+import heapq
+import math
+
+from .catalogue import Catalogue, derived
+
+# Dimensions: each score_breakdown section plus log price
+SECTIONS = (
+    "soc", "ram", "storage", "display", "camera",
+    "battery", "charging", "extras", "durability", "protection",
+)
+# Catalogues larger than this are queried through the KD-tree
+KD_TREE_THRESHOLD = 2000
+_LEAF_SIZE = 16
+
+Vector = Tuple[float, ...]
+
+def _price(row: Dict[str, Any]) -> float | None:
+    try:
+        p = float(row.get("price_sgd"))
+    except (TypeError, ValueError):
+        return None
+    return p if p > 0 else None
+
+def _sqdist(a: Sequence[float], b: Sequence[float]) -> float:
+    return sum((x - y) * (x - y) for x, y in zip(a, b))
+
+# Min-max scale every dimension to [0, 1] across the catalogue
+def build_vectors(rows: List[Dict[str, Any]]) -> List[Vector]:
+    raw = []
+    for row in rows:
+        bd = row.get("score_breakdown") or {}
+        price = _price(row)
+        raw.append([float(bd.get(s, 0.0)) for s in SECTIONS] + [math.log(price) if price else 0.0])
+    if not raw:
+        return []
+    lows = [min(col) for col in zip(*raw)]
+    highs = [max(col) for col in zip(*raw)]
+    return [
+        tuple(0.0 if hi <= lo else (v - lo) / (hi - lo) for v, lo, hi in zip(vec, lows, highs))
+        for vec in raw
+    ]
+
+
+class KDTree:
+    """Static KD-tree over row positions; nodes are (dim, split, left, right) or a leaf list."""
+
+    def __init__(self, vectors: List[Vector]):
+        self.vectors = vectors
+        self.root = self._build(list(range(len(vectors))), 0) if vectors else []
+
+    def _build(self, idx: List[int], depth: int):
+        if len(idx) <= _LEAF_SIZE:
+            return idx
+        dim = depth % len(self.vectors[0])
+        idx.sort(key=lambda i: self.vectors[i][dim])
+        mid = len(idx) // 2
+        return (dim, self.vectors[idx[mid]][dim], self._build(idx[:mid], depth + 1), self._build(idx[mid:], depth + 1))
+
+    # k nearest accepted positions as (sqdist, pos), nearest first
+    def query(self, point: Vector, k: int, accept: Callable[[int], bool]) -> List[Tuple[float, int]]:
+        best: List[Tuple[float, int]] = []  # max-heap via negated distance
+
+        def visit(node):
+            if isinstance(node, list):
+                for i in node:
+                    if not accept(i):
+                        continue
+                    d = _sqdist(point, self.vectors[i])
+                    if len(best) < k:
+                        heapq.heappush(best, (-d, i))
+                    elif d < -best[0][0]:
+                        heapq.heapreplace(best, (-d, i))
+                return
+            dim, split, left, right = node
+            diff = point[dim] - split
+            near, far = (left, right) if diff < 0 else (right, left)
+            visit(near)
+            if len(best) < k or diff * diff < -best[0][0]:
+                visit(far)
+
+        visit(self.root)
+        return sorted((-d, i) for d, i in best)
+
+
+class SimilarityIndex:
+    def __init__(self, catalogue: Catalogue, use_tree: bool | None = None):
+        self.rows = catalogue.rows
+        self.by_slug = catalogue.by_slug
+        self.vectors = build_vectors(self.rows)
+        if use_tree is None:
+            use_tree = len(self.rows) > KD_TREE_THRESHOLD
+        self.tree = KDTree(self.vectors) if use_tree else None
+
+    def similar(self, slug: str, k: int = 5, max_price: float | None = None,
+                exclude_brands: Sequence[str] = ()) -> List[Dict[str, Any]] | None:
+        pos = self.by_slug.get(slug)
+        if pos is None:
+            return None
+        excluded = {b.strip().lower() for b in exclude_brands if b.strip()}
+
+        def accept(i: int) -> bool:
+            if i == pos:
+                return False
+            row = self.rows[i]
+            if excluded and (row.get("brand") or "").lower() in excluded:
+                return False
+            if max_price is not None:
+                price = _price(row)
+                if price is None or price > max_price:
+                    return False
+            return True
+
+        point = self.vectors[pos]
+        if self.tree is not None:
+            hits = self.tree.query(point, k, accept)
+        else:
+            # Brute force over all rows is fastest for small catalogues
+            hits = heapq.nsmallest(
+                k, ((_sqdist(point, v), i) for i, v in enumerate(self.vectors) if accept(i))
+            )
+        return [self._hit(i, d) for d, i in hits]
+
+    def _hit(self, pos: int, sqdist: float) -> Dict[str, Any]:
+        row = self.rows[pos]
+        return {
+            "slug": row["slug"],
+            "brand": row["brand"],
+            "model": row["model"],
+            "price_sgd": row["price_sgd"],
+            "raw_score": row["raw_score"],
+            "smartbuy_score": row["smartbuy_score"],
+            "distance": round(math.sqrt(sqdist), 6),
+        }
+
+
+def get_similarity_index(catalogue: Catalogue | None = None) -> SimilarityIndex:
+    return derived("similar", SimilarityIndex, catalogue)
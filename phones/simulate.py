@@ -0,0 +1,141 @@
+from __future__ import annotations
+from bisect import bisect_left
+from dataclasses import dataclass
+from typing import Any, Dict, List, Mapping, Tuple
+
+from .catalogue import Catalogue, derived
+from .prices import parse_price
+from .ranking import blend_one, catalogue_positions, parse_mode, tiebreak_price
+from .scoring import PhoneSpec, calculate_smartbuy_score
+
+SIMULATE_MAX_SLUGS = 20
+# Distinct (mode, filter set) baselines kept per catalogue version before the cache is reset
+MAX_CACHED_SCOPES = 64
+# Anything scoring reads may be overridden
+SIMULATE_FIELDS = frozenset(PhoneSpec.ROW_FIELDS)
+_PRICE_FIELDS = ("price_sgd", "price_avg_90d")
+
+
+# Ranking state for one (mode, filter set) over the catalogue's stored scores.
+# The sorted arrays hold (-score, pos), so ties keep catalogue (pk) order exactly
+# like the stable sorts in blend_scores.
+@dataclass
+class _Baseline:
+    positions: List[int]
+    raw: Dict[int, float]
+    val: Dict[int, float]
+    price: Dict[int, float]
+    raw_sorted: List[Tuple[float, int]]
+    val_sorted: List[Tuple[float, int]]
+    raw_rank: Dict[int, int]
+    val_rank: Dict[int, int]
+    rank: Dict[int, int]
+
+
+# Blend keys (the sort key blend_scores uses) for every position
+def _keys(b: _Baseline, mode: str) -> Dict[int, Tuple[float, float, float, float]]:
+    if not b.positions:
+        return {}
+    bounds = (-b.raw_sorted[-1][0], -b.raw_sorted[0][0], -b.val_sorted[-1][0], -b.val_sorted[0][0])
+    max_rank = len(b.positions) - 1 or 1
+    return {
+        p: (*blend_one(b.raw[p], b.val[p], b.raw_rank[p], b.val_rank[p], bounds, max_rank, mode), -b.price[p])
+        for p in b.positions
+    }
+
+def _build(catalogue: Catalogue, positions: List[int], mode: str) -> _Baseline:
+    rows = [catalogue.rows[p] for p in positions]
+    raw = {p: row["raw_score"] for p, row in zip(positions, rows)}
+    val = {p: row["smartbuy_score"] for p, row in zip(positions, rows)}
+    price = {p: tiebreak_price(row["price_sgd"]) for p, row in zip(positions, rows)}
+    raw_sorted = sorted((-raw[p], p) for p in positions)
+    val_sorted = sorted((-val[p], p) for p in positions)
+    b = _Baseline(
+        positions, raw, val, price, raw_sorted, val_sorted,
+        raw_rank={p: i for i, (_, p) in enumerate(raw_sorted)},
+        val_rank={p: i for i, (_, p) in enumerate(val_sorted)},
+        rank={},
+    )
+    keys = _keys(b, mode)
+    b.rank = {p: i for i, p in enumerate(sorted(positions, key=keys.__getitem__, reverse=True))}
+    return b
+
+def _baseline(catalogue: Catalogue, params: Mapping[str, str], mode: str) -> _Baseline:
+    positions, filter_key = catalogue_positions(catalogue, params)
+    cache = derived("simulate", lambda _: {}, catalogue)
+    key = (mode, filter_key)
+    if key not in cache:
+        if len(cache) >= MAX_CACHED_SCOPES:
+            cache.clear()
+        cache[key] = _build(catalogue, positions, mode)
+    return cache[key]
+
+# Move one entry of a sorted (-score, pos) array; only ranks between its old and new slot shift
+def _move(arr: List[Tuple[float, int]], ranks: Dict[int, int], old: Tuple[float, int], new: Tuple[float, int]) -> None:
+    i = bisect_left(arr, old)
+    del arr[i]
+    j = bisect_left(arr, new)
+    arr.insert(j, new)
+    for k in range(min(i, j), max(i, j) + 1):
+        ranks[arr[k][1]] = k
+
+# Validate {slug: {field: value}}; raises ValueError on bad input
+def parse_overrides(data: Any) -> Dict[str, Dict[str, Any]]:
+    if not isinstance(data, dict) or not data:
+        raise ValueError("overrides")
+    if len(data) > SIMULATE_MAX_SLUGS:
+        raise ValueError("too many slugs")
+    out = {}
+    for slug, fields in data.items():
+        if not isinstance(fields, dict) or not fields or not set(fields) <= SIMULATE_FIELDS:
+            raise ValueError(slug)
+        for name, value in fields.items():
+            if not isinstance(value, (str, int, float, bool)) and value is not None:
+                raise ValueError(name)
+            if name in _PRICE_FIELDS and value is not None and parse_price(value) is None:
+                raise ValueError(name)
+        out[str(slug)] = fields
+    return out
+
+# Ranks of the overridden phones if their fields changed, without touching the DB.
+# Raw/value scores are recomputed for those phones only; the global min/max and rank
+# normalizers are updated by moving their entries in the baseline's sorted arrays.
+def simulate(catalogue: Catalogue, params: Mapping[str, str], overrides: Dict[str, Dict[str, Any]]) -> Dict[str, Any]:
+    mode, scoring_mode = parse_mode(params)
+    base = _baseline(catalogue, params, mode)
+    sim = _Baseline(
+        base.positions, dict(base.raw), dict(base.val), dict(base.price),
+        list(base.raw_sorted), list(base.val_sorted), dict(base.raw_rank), dict(base.val_rank), base.rank,
+    )
+
+    changed, missing = [], []
+    for slug, fields in overrides.items():
+        pos = catalogue.by_slug.get(slug)
+        # Scope is decided on current catalogue values; filtered-out phones are reported
+        if pos is None or pos not in sim.raw:
+            missing.append(slug)
+            continue
+        row = catalogue.rows[pos]
+        smartbuy, raw, _ = calculate_smartbuy_score(PhoneSpec.from_dict({**row, **fields}), mode=scoring_mode)
+        _move(sim.raw_sorted, sim.raw_rank, (-sim.raw[pos], pos), (-raw, pos))
+        _move(sim.val_sorted, sim.val_rank, (-sim.val[pos], pos), (-float(smartbuy), pos))
+        sim.raw[pos], sim.val[pos] = float(raw), float(smartbuy)
+        sim.price[pos] = tiebreak_price(fields.get("price_sgd", row["price_sgd"]))
+        changed.append((slug, pos))
+
+    results = []
+    if changed:
+        keys = _keys(sim, mode)
+        for slug, pos in changed:
+            # Stable descending sort: better keys, then equal keys earlier in pk order, come first
+            k = keys[pos]
+            rank = sum(1 for p, other in keys.items() if other > k or (other == k and p < pos))
+            results.append({
+                "slug": slug,
+                "rank_before": base.rank[pos] + 1,
+                "rank": rank + 1,
+                "score": k[0],
+                "raw_score": sim.raw[pos],
+                "smartbuy_score": sim.val[pos],
+            })
+    return {"mode": mode, "count": len(base.positions), "results": results, "missing": missing}
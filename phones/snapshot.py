@@ -0,0 +1,171 @@
+from __future__ import annotations
+from collections.abc import Sequence
+from typing import Any, Dict, List, Tuple
+import hashlib
+import math
+import mmap
+import os
+import struct
+import tempfile
+
+from django.db import models
+
+from .models import Phone
+from .scoring import SCORING_PROFILE_VERSION
+from .serializers import PhoneSerializer
+from .similar import SECTIONS
+
+# Binary catalogue snapshot: a header, one fixed-width record per row, then a
+# UTF-8 string table. Workers mmap the file read-only so every process shares
+# the same page-cache pages instead of rebuilding rows from the ORM.
+
+MAGIC = b"SBCAT\x00\x02\x00"
+_INT_NULL = -(2 ** 63)
+_STR_NULL = 0xFFFFFFFF
+
+# Column kinds: int64, float64 (NaN = null), tri-state int8 bool, string-table ref
+_CODES = {"i": "q", "f": "d", "b": "b", "s": "II"}
+
+
+def _kind(field: models.Field) -> str:
+    if isinstance(field, models.BooleanField):
+        return "b"
+    if isinstance(field, (models.IntegerField, models.AutoField)):
+        return "i"
+    if isinstance(field, models.FloatField):
+        return "f"
+    # Decimal and datetime fields serialize as strings
+    return "s"
+
+# Serialized fields, then the keys the catalogue adds, then one column per breakdown section
+def _layout() -> List[Tuple[str, str]]:
+    cols = [(name, _kind(Phone._meta.get_field(name))) for name in PhoneSerializer.Meta.fields]
+    cols += [("id", "i"), ("smartbuy_score", "f"), ("raw_score", "f")]
+    cols += [(f"breakdown.{s}", "f") for s in SECTIONS]
+    return cols
+
+LAYOUT = _layout()
+RECORD = struct.Struct("<" + "".join(_CODES[k] for _, k in LAYOUT))
+# Changes whenever the record layout does, so old files are never misread
+LAYOUT_HASH = hashlib.sha1(repr(LAYOUT).encode()).digest()[:16]
+# magic, layout, stamp, scoring profile, rows, record size, string table offset
+HEADER = struct.Struct("<8s16s48sQQQQ")
+
+
+class _Strings:
+    def __init__(self):
+        self.buf = bytearray()
+        self.seen: Dict[str, Tuple[int, int]] = {}
+
+    def ref(self, value: str | None) -> Tuple[int, int]:
+        if value is None:
+            return 0, _STR_NULL
+        if value not in self.seen:
+            raw = value.encode()
+            self.seen[value] = (len(self.buf), len(raw))
+            self.buf += raw
+        return self.seen[value]
+
+
+def _pack(row: Dict[str, Any], strings: _Strings) -> bytes:
+    breakdown = row.get("score_breakdown") or {}
+    values: List[Any] = []
+    for name, kind in LAYOUT:
+        v = breakdown.get(name[10:]) if name.startswith("breakdown.") else row.get(name)
+        if kind == "s":
+            values.extend(strings.ref(None if v is None else str(v)))
+        elif kind == "i":
+            values.append(_INT_NULL if v is None else int(v))
+        elif kind == "f":
+            values.append(math.nan if v is None else float(v))
+        else:
+            values.append(-1 if v is None else int(bool(v)))
+    return RECORD.pack(*values)
+
+# Write rows to ``path`` via a temp file + rename, so readers only ever see a complete file
+def write_snapshot(path: str, stamp: str, rows: Sequence[Dict[str, Any]]) -> None:
+    stamp_bytes = stamp.encode()
+    if len(stamp_bytes) > 48:
+        raise ValueError("catalogue stamp too long for snapshot header")
+    strings = _Strings()
+    records = b"".join(_pack(row, strings) for row in rows)
+    header = HEADER.pack(
+        MAGIC, LAYOUT_HASH, stamp_bytes, SCORING_PROFILE_VERSION, len(rows), RECORD.size,
+        HEADER.size + len(records),
+    )
+    directory = os.path.dirname(os.path.abspath(path))
+    fd, tmp = tempfile.mkstemp(dir=directory, prefix=".snapshot-")
+    try:
+        with os.fdopen(fd, "wb") as fh:
+            fh.write(header)
+            fh.write(records)
+            fh.write(strings.buf)
+            fh.flush()
+            os.fsync(fh.fileno())
+        os.replace(tmp, path)
+    except BaseException:
+        if os.path.exists(tmp):
+            os.unlink(tmp)
+        raise
+
+
+class MappedRows(Sequence):
+    """Read-only row sequence over a mapped snapshot; each access decodes one record."""
+
+    def __init__(self, buf: mmap.mmap, count: int, strings_at: int):
+        self._buf = buf
+        self._count = count
+        self._strings_at = strings_at
+
+    def __len__(self) -> int:
+        return self._count
+
+    def __getitem__(self, pos):
+        if isinstance(pos, slice):
+            return [self[i] for i in range(*pos.indices(self._count))]
+        if pos < 0:
+            pos += self._count
+        if not 0 <= pos < self._count:
+            raise IndexError(pos)
+        values = iter(RECORD.unpack_from(self._buf, HEADER.size + pos * RECORD.size))
+        row: Dict[str, Any] = {}
+        breakdown: Dict[str, float] = {}
+        for name, kind in LAYOUT:
+            if kind == "s":
+                off, size = next(values), next(values)
+                v = None if size == _STR_NULL else self._string(off, size)
+            elif kind == "i":
+                v = next(values)
+                v = None if v == _INT_NULL else v
+            elif kind == "f":
+                v = next(values)
+                v = None if math.isnan(v) else v
+            else:
+                v = next(values)
+                v = None if v < 0 else bool(v)
+            if name.startswith("breakdown."):
+                breakdown[name[10:]] = v
+            else:
+                row[name] = v
+        row["score_breakdown"] = breakdown
+        return row
+
+    def _string(self, off: int, size: int) -> str:
+        start = self._strings_at + off
+        return self._buf[start:start + size].decode()
+
+
+# Map ``path`` read-only; returns (stamp, rows), or None if missing, from another layout,
+# or scored under another profile (the stamp alone doesn't change when tiers do)
+def open_snapshot(path: str) -> Tuple[str, MappedRows] | None:
+    try:
+        with open(path, "rb") as fh:
+            buf = mmap.mmap(fh.fileno(), 0, access=mmap.ACCESS_READ)
+    except (FileNotFoundError, ValueError):
+        return None
+    if len(buf) < HEADER.size:
+        return None
+    magic, layout, stamp, profile, count, size, strings_at = HEADER.unpack_from(buf, 0)
+    if magic != MAGIC or layout != LAYOUT_HASH or profile != SCORING_PROFILE_VERSION or size != RECORD.size:
+        return None
+    return stamp.rstrip(b"\0").decode(), MappedRows(buf, count, strings_at)
@@ -0,0 +1,149 @@
+from __future__ import annotations
+from contextlib import contextmanager
+from typing import Any, Dict, Iterable, Iterator, List, Sequence, Tuple
+
+from django.core.exceptions import ValidationError
+from django.db import connection, transaction
+
+from .catalogue import notify_catalogue_changed
+from .models import Phone
+from .signals import SCORING_INPUTS
+
+STAGING_TABLE = "phones_phone_staging"
+STAGING_BATCH_SIZE = 1000
+# Problems listed in the error before the rest are summarized
+MAX_REPORTED_PROBLEMS = 10
+
+
+# Column layout for imported Phone rows: prepares rows once, then either upserts them
+# straight into Phone or loads them into a temporary per-connection staging table that
+# is checked and upserted into Phone with one statement
+class PhoneStaging:
+    # ``insert_only`` columns seed new rows but are left alone when the slug already exists
+    def __init__(self, names: Sequence[str], insert_only: Iterable[str] = ()):
+        # New rows start with stale stored scores; updates only go stale when a scoring
+        # input changes (see _upsert_clause)
+        self.fields = [Phone._meta.get_field(n) for n in ("slug", *names, "scoring_profile")]
+        self.insert_only = frozenset(insert_only)
+
+    def _q(self, name: str) -> str:
+        return connection.ops.quote_name(name)
+
+    def _columns(self) -> str:
+        return ", ".join(self._q(f.column) for f in self.fields)
+
+    def create(self) -> None:
+        with connection.cursor() as cursor:
+            cursor.execute(f"DROP TABLE IF EXISTS {self._q(STAGING_TABLE)}")
+            cursor.execute(
+                f"CREATE TEMPORARY TABLE {self._q(STAGING_TABLE)} AS "
+                f"SELECT * FROM {self._q(Phone._meta.db_table)} WHERE 1 = 0"
+            )
+
+    def drop(self) -> None:
+        with connection.cursor() as cursor:
+            cursor.execute(f"DROP TABLE IF EXISTS {self._q(STAGING_TABLE)}")
+
+    # DB values for one row in column order; raises ValueError naming the bad field
+    def prepare(self, slug: str, values: Dict[str, Any]) -> Tuple[Any, ...]:
+        row = {**values, "slug": slug, "scoring_profile": 0}
+        out = []
+        for field in self.fields:
+            try:
+                out.append(field.get_db_prep_save(field.to_python(row.get(field.name)), connection))
+            except (ValidationError, TypeError, ValueError):
+                raise ValueError(f"{slug}: invalid {field.name} {row.get(field.name)!r}")
+        return tuple(out)
+
+    def _insert_sql(self, table: str) -> str:
+        placeholders = ", ".join(["%s"] * len(self.fields))
+        return f"INSERT INTO {self._q(table)} ({self._columns()}) VALUES ({placeholders})"
+
+    def _upsert_clause(self) -> str:
+        phone = self._q(Phone._meta.db_table)
+        updates = [
+            f"{self._q(f.column)} = excluded.{self._q(f.column)}"
+            for f in self.fields if f.name not in ("slug", "scoring_profile", *self.insert_only)
+        ]
+        # IS NOT is SQLite's null-safe "differs"
+        changed = " OR ".join(
+            f"{phone}.{self._q(f.column)} IS NOT excluded.{self._q(f.column)}"
+            for f in self.fields if f.name in SCORING_INPUTS and f.name not in self.insert_only
+        ) or "0"
+        profile = self._q("scoring_profile")
+        updates.append(f"{profile} = CASE WHEN {changed} THEN 0 ELSE {phone}.{profile} END")
+        return f"ON CONFLICT ({self._q('slug')}) DO UPDATE SET {', '.join(updates)}"
+
+    # executemany prepared rows into the staging table; ``replace`` slugs staged earlier are dropped first
+    def load(self, rows: Sequence[Tuple[Any, ...]], replace: Iterable[str] = ()) -> int:
+        with transaction.atomic(), connection.cursor() as cursor:
+            if (replace := list(replace)):
+                cursor.execute(
+                    f"DELETE FROM {self._q(STAGING_TABLE)} WHERE {self._q('slug')} IN "
+                    f"({', '.join(['%s'] * len(replace))})", replace,
+                )
+            for start in range(0, len(rows), STAGING_BATCH_SIZE):
+                cursor.executemany(self._insert_sql(STAGING_TABLE), rows[start:start + STAGING_BATCH_SIZE])
+        return len(rows)
+
+    # Upsert prepared rows straight into Phone with executemany, committed together;
+    # returns (created, updated)
+    def upsert(self, rows: Sequence[Tuple[Any, ...]]) -> Tuple[int, int]:
+        if not rows:
+            return 0, 0
+        with transaction.atomic(), connection.cursor() as cursor:
+            existing = Phone.objects.filter(slug__in=[row[0] for row in rows]).count()
+            cursor.executemany(f"{self._insert_sql(Phone._meta.db_table)} {self._upsert_clause()}", rows)
+        return self._written(len(rows) - existing, existing)
+
+    # Check the staged rows against Phone's NOT NULL columns; raises ValueError on problems
+    def validate(self) -> None:
+        problems = []
+        slug = self._q("slug")
+        with connection.cursor() as cursor:
+            for field in self.fields:
+                if field.null:
+                    continue
+                cursor.execute(
+                    f"SELECT {slug} FROM {self._q(STAGING_TABLE)} WHERE {self._q(field.column)} IS NULL"
+                )
+                problems += [f"{s}: missing {field.name}" for (s,) in cursor.fetchall()]
+        if problems:
+            raise ValueError(summarize(problems))
+
+    # Upsert every staged row into Phone in one statement; returns (created, updated).
+    # Call inside the transaction that should publish the import.
+    def swap(self) -> Tuple[int, int]:
+        phone, staging = self._q(Phone._meta.db_table), self._q(STAGING_TABLE)
+        slug = self._q("slug")
+        with connection.cursor() as cursor:
+            cursor.execute(f"SELECT COUNT(*) FROM {staging}")
+            (total,) = cursor.fetchone()
+            cursor.execute(f"SELECT COUNT(*) FROM {staging} s JOIN {phone} p ON p.{slug} = s.{slug}")
+            (existing,) = cursor.fetchone()
+            # WHERE 1 = 1 keeps SQLite from reading ON CONFLICT as part of the SELECT's join
+            cursor.execute(
+                f"INSERT INTO {phone} ({self._columns()}) SELECT {self._columns()} FROM {staging} WHERE 1 = 1 "
+                f"{self._upsert_clause()}"
+            )
+        return self._written(total - existing, existing)
+
+    # Raw SQL skips the save signals, so announce the change here
+    def _written(self, created: int, updated: int) -> Tuple[int, int]:
+        notify_catalogue_changed()
+        return created, updated
+
+    # Staging table that lives for the duration of the block
+    @contextmanager
+    def table(self) -> Iterator["PhoneStaging"]:
+        self.create()
+        try:
+            yield self
+        finally:
+            self.drop()
+
+
+def summarize(problems: List[str]) -> str:
+    shown = problems[:MAX_REPORTED_PROBLEMS]
+    more = len(problems) - len(shown)
+    return "; ".join(shown) + (f" (+{more} more)" if more else "")
@@ -0,0 +1,35 @@
+from django.urls import reverse
+from rest_framework.test import APITestCase
+from phones.models import Phone
+from phones.testing import make_phone
+
+
+class AsyncRecommendationTest(APITestCase):
+    def setUp(self):
+        make_phone("alpha", soc_score=9, price_sgd=899.00)
+        make_phone("beta", soc_score=6, price_sgd=349.00)
+        make_phone("gamma", soc_score=4, has_5g=False, price_sgd=199.00)
+
+    # Async endpoint returns the same ranking as the DRF view
+    def test_matches_sync_view(self):
+        for params in ({}, {"mode": "flagship"}, {"has_5g": "1", "facets": "1"}, {"view": "pareto"}):
+            sync = self.client.get(reverse("recommendation"), params)
+            asyn = self.client.get(reverse("recommendation-async"), params)
+            self.assertEqual(asyn.status_code, 200)
+            self.assertEqual(asyn.json(), sync.json())
+
+    # Bad filters 400, non-GET methods 405
+    def test_invalid_input_and_method(self):
+        url = reverse("recommendation-async")
+        self.assertEqual(self.client.get(url, {"min_price": "cheap"}).status_code, 400)
+        self.assertEqual(self.client.post(url).status_code, 405)
+
+    # Ranked payloads are served from cache until the catalogue version changes
+    def test_cached_until_version_bump(self):
+        url = reverse("recommendation-async")
+        first = self.client.get(url, {"mode": "budget"}).json()
+        Phone.objects.filter(slug="gamma").update(price_sgd=99)  # bypasses signals: no bump
+        self.assertEqual(self.client.get(url, {"mode": "budget"}).json(), first)
+
+        make_phone("delta")
+        self.assertEqual(len(self.client.get(url, {"mode": "budget"}).json()), 4)
@@ -0,0 +1,76 @@
+import json
+import os
+import tempfile
+from io import StringIO
+from unittest import mock
+from django.core.management import call_command
+from django.db import DatabaseError
+from django.urls import reverse
+from rest_framework.test import APITestCase
+from phones.catalogue import catalogue_version
+from phones import scoring
+from phones.models import CatalogueChange, Phone
+from phones.testing import make_phone, spec
+
+
+class ChangeFeedTest(APITestCase):
+    def _import(self, items, *args):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "spec.json")
+            with open(path, "w") as fh:
+                json.dump(items, fh)
+            call_command("import_phones", path, *args, stdout=StringIO())
+
+    # Imports append created/updated rows with field diffs, scores and the published version
+    def test_import_writes_changes(self):
+        self._import([spec("alpha"), spec("beta")])
+        v1 = catalogue_version()
+        self.assertEqual(
+            sorted(CatalogueChange.objects.filter(version=v1).values_list("slug", "action")),
+            [("alpha", "created"), ("beta", "created")],
+        )
+
+        self._import([spec("alpha", price_sgd=349.0, soc_score=9), spec("beta")])
+        change = CatalogueChange.objects.get(version__gt=v1)
+        self.assertEqual((change.slug, change.action), ("alpha", "updated"))
+        self.assertEqual(change.changed_fields["price_sgd"], ["399.00", "349.00"])
+        self.assertEqual(change.changed_fields["soc_score"], [6, 9])
+        self.assertGreater(change.new_score, change.old_score)
+
+    # Diffs read the stored scores: each changed phone is scored once per import, and the
+    # rescore that follows has nothing left to do
+    def test_changed_phones_scored_once(self):
+        with mock.patch.object(scoring, "calculate_raw_score", wraps=scoring.calculate_raw_score) as scored:
+            self._import([spec("alpha"), spec("beta")])
+            self.assertEqual(scored.call_count, 2)
+            scored.reset_mock()
+            self._import([spec("alpha", soc_score=9), spec("beta")], "--atomic")
+            self.assertEqual(scored.call_count, 1)
+        self.assertEqual(CatalogueChange.objects.count(), 3)
+
+    # The change rows commit with the data and the version they describe, or none of them do
+    def test_changes_commit_with_the_import(self):
+        v = catalogue_version()
+        with mock.patch.object(CatalogueChange.objects, "bulk_create", side_effect=DatabaseError("boom")):
+            with self.assertRaises(DatabaseError):
+                self._import([spec("alpha")], "--atomic")
+        self.assertFalse(Phone.objects.exists())
+        self.assertEqual(catalogue_version(), v)
+
+    # The feed filters by version and pages with an opaque cursor
+    def test_feed_since_and_cursor(self):
+        for i in range(3):
+            CatalogueChange.objects.create(version=i + 1, slug=f"p{i}", action="updated")
+        url = reverse("changes")
+        r = self.client.get(url, {"since": 1, "limit": 1})
+        self.assertEqual(r.status_code, 200)
+        self.assertEqual([c["slug"] for c in r.data["results"]], ["p1"])
+        r = self.client.get(r.data["next"])
+        self.assertEqual([c["slug"] for c in r.data["results"]], ["p2"])
+        self.assertIsNone(r.data["next"])
+        self.assertEqual(self.client.get(url, {"since": "x"}).status_code, 400)
+
+    # Saving outside the importers leaves the feed alone
+    def test_plain_saves_not_logged(self):
+        make_phone("gamma")
+        self.assertFalse(CatalogueChange.objects.exists())
@@ -0,0 +1,39 @@
+from django.urls import reverse
+from rest_framework.test import APITestCase
+from phones.compare import COMPARE_MAX_SLUGS
+from phones.testing import make_phone
+
+
+class CompareAPITest(APITestCase):
+    def setUp(self):
+        make_phone("flagship", soc_score=9, ram_gb=12, price_sgd=1199.00)
+        make_phone("budget", soc_score=4, ram_gb=4, refresh_hz=60, price_sgd=199.00)
+        make_phone("twin", soc_score=9, ram_gb=8, price_sgd=899.00)
+
+    # Columns are aligned to the requested order and unknown slugs are reported
+    def test_columns_follow_request_order(self):
+        r = self.client.get(reverse("phone-compare"), {"slugs": "budget,nope,flagship,budget"})
+        self.assertEqual(r.status_code, 200)
+        self.assertEqual(r.data["slugs"], ["budget", "flagship"])
+        self.assertEqual(r.data["missing"], ["nope"])
+        self.assertEqual(r.data["columns"]["ram_gb"], [4, 12])
+        self.assertEqual(len(r.data["breakdown"]["soc"]), 2)
+        self.assertNotIn("score_breakdown", r.data["columns"])
+
+    # Winners are per section, ties included; cheapest wins on price
+    def test_winners(self):
+        r = self.client.post(reverse("phone-compare"), {"slugs": ["flagship", "budget", "twin"]}, format="json")
+        self.assertEqual(r.status_code, 200)
+        winners = r.data["winners"]
+        self.assertEqual(winners["soc"], ["flagship", "twin"])
+        self.assertEqual(winners["ram"], ["flagship"])
+        self.assertEqual(winners["price_sgd"], ["budget"])
+
+    # Missing, oversized and all-unknown requests are rejected
+    def test_errors(self):
+        url = reverse("phone-compare")
+        self.assertEqual(self.client.get(url).status_code, 400)
+        self.assertEqual(self.client.post(url, {"slugs": [1, 2]}, format="json").status_code, 400)
+        many = ",".join(f"p{i}" for i in range(COMPARE_MAX_SLUGS + 1))
+        self.assertEqual(self.client.get(url, {"slugs": many}).status_code, 400)
+        self.assertEqual(self.client.get(url, {"slugs": "nope"}).status_code, 404)
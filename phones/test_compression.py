@@ -0,0 +1,44 @@
+import gzip
+import json
+import unittest
+from unittest import mock
+from django.urls import reverse
+from rest_framework.test import APITestCase
+from phones.compression import encode_variants, negotiate_encoding
+from phones.testing import make_phone
+
+
+class NegotiationTest(unittest.TestCase):
+    # q-values and wildcards pick a supported coding, identity otherwise
+    def test_negotiate_encoding(self):
+        self.assertEqual(negotiate_encoding("gzip, deflate"), "gzip")
+        self.assertEqual(negotiate_encoding("deflate"), "identity")
+        self.assertEqual(negotiate_encoding("gzip;q=0"), "identity")
+        self.assertEqual(negotiate_encoding(""), "identity")
+        self.assertIn(negotiate_encoding("*"), ("br", "gzip"))
+
+    # Tiny bodies are not compressed
+    def test_small_bodies_stay_identity(self):
+        self.assertEqual(list(encode_variants(b"[]")), ["identity"])
+
+
+class CompressedRecommendationsTest(APITestCase):
+    def setUp(self):
+        for i in range(5):
+            make_phone(f"phone-{i}", price_sgd=199.00 + 100 * i)
+
+    # gzip clients get the precompressed payload; compression is paid once per cached entry
+    def test_gzip_served_from_cache(self):
+        for name in ("recommendation", "recommendation-async"):
+            url = reverse(name)
+            plain = self.client.get(url, {"mode": "midrange"})
+            self.assertNotIn("Content-Encoding", plain)
+
+            with mock.patch("phones.compression.compress", wraps=gzip.compress) as compress:
+                r = self.client.get(url, {"mode": "midrange"}, HTTP_ACCEPT_ENCODING="gzip")
+            compress.assert_not_called()
+            self.assertEqual(r["Content-Encoding"], "gzip")
+            self.assertIn("Accept-Encoding", r["Vary"])
+            self.assertLess(len(r.content), len(plain.content))
+            self.assertEqual(json.loads(gzip.decompress(r.content)), plain.json())
+            self.assertNotEqual(r["ETag"], plain["ETag"])
@@ -0,0 +1,44 @@
+from unittest import mock
+from django.urls import reverse
+from rest_framework.test import APITestCase
+from phones.testing import make_phone
+
+
+class ConditionalRequestTest(APITestCase):
+    def setUp(self):
+        make_phone("alpha", price_sgd=899.00)
+        make_phone("beta", price_sgd=349.00)
+
+    # Matching If-None-Match returns 304 without ranking anything, with the 200's Vary
+    def test_not_modified_skips_ranking(self):
+        for name in ("recommendation", "recommendation-async"):
+            url = reverse(name)
+            first = self.client.get(url, {"mode": "budget"})
+            self.assertEqual(first.status_code, 200)
+            etag = first["ETag"]
+            with mock.patch("phones.views.ranked_variants") as rank, mock.patch("phones.views.arank_phones") as arank:
+                r = self.client.get(url, {"mode": "budget"}, HTTP_IF_NONE_MATCH=etag)
+            self.assertEqual(r.status_code, 304)
+            self.assertEqual(r["ETag"], etag)
+            self.assertEqual(r["Vary"], first["Vary"])
+            rank.assert_not_called()
+            arank.assert_not_called()
+
+    # ETag follows the normalized query and the catalogue version
+    def test_etag_changes_with_query_and_version(self):
+        url = reverse("recommendation")
+        etag = self.client.get(url, {"mode": "Budget", "brand": "TestBrand"})["ETag"]
+        self.assertEqual(self.client.get(url, {"brand": "testbrand", "mode": "budget", "utm": "x"})["ETag"], etag)
+        self.assertNotEqual(self.client.get(url, {"mode": "flagship"})["ETag"], etag)
+
+        make_phone("gamma")
+        r = self.client.get(url, {"mode": "budget", "brand": "TestBrand"}, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(r.status_code, 200)
+        self.assertNotEqual(r["ETag"], etag)
+
+    # Responses carry CDN-friendly caching headers
+    def test_cache_control_headers(self):
+        r = self.client.get(reverse("recommendation"), {"view": "pareto"})
+        self.assertIn("public", r["Cache-Control"])
+        self.assertIn("max-age=60", r["Cache-Control"])
+        self.assertIn("ETag", r)
@@ -0,0 +1,59 @@
+from django.urls import reverse
+from rest_framework.test import APITestCase
+from phones.catalogue import get_catalogue
+from phones.explain import explain
+from phones.scoring import calculate_raw_score
+from phones.testing import make_phone
+
+
+class ExplainAPITest(APITestCase):
+    def setUp(self):
+        self.phone = make_phone("mid", soc_score=6, ram_gb=8, mohs=None)
+
+    def _factor(self, data, section, name):
+        return next(f for f in data["sections"][section]["factors"] if f["factor"] == name)
+
+    # Each tiered factor reports the threshold it hit and what the next one is worth
+    def test_tier_trace(self):
+        r = self.client.get(reverse("phone-explain", args=["mid"]))
+        self.assertEqual(r.status_code, 200)
+        self.assertAlmostEqual(r.data["raw_score"], calculate_raw_score(self.phone)[0], places=4)
+
+        ram = self._factor(r.data, "ram", "ram_gb")
+        self.assertEqual((ram["tier"], ram["points"]), (8, 1.0))
+        self.assertEqual(ram["next"]["target"], 12)
+        self.assertEqual(ram["next"]["gap"], 4)
+        bumped = make_phone("mid-12", soc_score=6, ram_gb=12, mohs=None)
+        self.assertAlmostEqual(
+            ram["next"]["score_gain"], calculate_raw_score(bumped)[0] - r.data["raw_score"], places=3,
+        )
+
+        refresh = self._factor(r.data, "display", "refresh_hz")
+        self.assertEqual(refresh["level"], refresh["levels"])
+        self.assertIsNone(refresh["next"])
+        self.assertGreater(self._factor(r.data, "camera", "ois")["next"]["score_gain"], 0)
+        self.assertEqual(self._factor(r.data, "protection", "ip_rating")["next"]["target"], "IP69")
+        # Unknown Mohs hardness has no tier to climb from
+        self.assertIsNone(self._factor(r.data, "durability", "mohs")["next"])
+
+    # Section contributions add up to the overall raw score
+    def test_contributions_sum_to_raw(self):
+        r = self.client.get(reverse("phone-explain", args=["mid"]))
+        total = sum(s["contribution"] for s in r.data["sections"].values())
+        self.assertAlmostEqual(total, r.data["raw_score"], places=2)
+
+    # Explanations are memoized per catalogue version and rebuilt after a change
+    def test_memoized_per_version(self):
+        first = explain(get_catalogue(), "mid")
+        self.assertIs(explain(get_catalogue(), "mid"), first)
+        self.phone.ram_gb = 16
+        self.phone.save()
+        second = explain(get_catalogue(), "mid")
+        self.assertIsNot(second, first)
+        self.assertNotEqual(second["catalogue"], first["catalogue"])
+        self.assertEqual(self._factor(second, "ram", "ram_gb")["tier"], 16)
+
+    # Unknown slugs are a 404
+    def test_unknown_slug(self):
+        r = self.client.get(reverse("phone-explain", args=["nope"]))
+        self.assertEqual(r.status_code, 404)
@@ -0,0 +1,61 @@
+import os
+import tempfile
+import unittest
+from io import StringIO
+from unittest import mock
+from django.core.management import call_command
+from django.urls import reverse
+from rest_framework.test import APITestCase
+from phones import export
+from phones.models import Phone
+from phones.renderers import decode_json
+from phones.rescore import rescore
+from phones.scoring import SCORING_PROFILE_VERSION, calculate_smartbuy_score
+from phones.testing import make_phone
+
+
+class ExportTest(APITestCase):
+    def setUp(self):
+        make_phone("alpha", price_sgd=899.00)
+        make_phone("beta", price_sgd=349.00)
+
+    # NDJSON stream carries one flat, scored row per phone in pk order
+    def test_ndjson_endpoint(self):
+        r = self.client.get(reverse("phone-export"))
+        self.assertEqual(r.status_code, 200)
+        self.assertEqual(r["Content-Type"], "application/x-ndjson")
+        rows = [decode_json(line) for line in b"".join(r.streaming_content).splitlines()]
+        self.assertEqual([row["slug"] for row in rows], ["alpha", "beta"])
+        self.assertEqual(list(rows[0]), export.COLUMNS)
+        self.assertEqual(rows[1]["price_sgd"], 349.0)
+        self.assertGreater(rows[0]["breakdown_soc"], 0)
+
+    # Fresh stored scores are read as-is; only stale phones are scored during the request
+    def test_reads_stored_scores(self):
+        rescore()
+        Phone.objects.filter(slug="beta").update(scoring_profile=0)
+        with mock.patch("phones.rescore.calculate_smartbuy_score", wraps=calculate_smartbuy_score) as score:
+            r = self.client.get(reverse("phone-export"))
+            rows = [decode_json(line) for line in b"".join(r.streaming_content).splitlines()]
+        self.assertEqual(score.call_count, 1)
+        self.assertEqual(rows[0]["raw_score"], Phone.objects.get(slug="alpha").raw_score)
+
+    # Unknown formats are rejected
+    def test_unknown_format(self):
+        self.assertEqual(self.client.get(reverse("phone-export"), {"format": "csv"}).status_code, 400)
+
+    # The command rescores stale phones, then streams in small chunks to a file
+    def test_command_writes_file(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "catalogue.ndjson")
+            call_command("export_catalogue", path, chunk_size=1, stderr=StringIO())
+            with open(path, "rb") as fh:
+                self.assertEqual(len(fh.read().splitlines()), 2)
+        self.assertFalse(Phone.objects.exclude(scoring_profile=SCORING_PROFILE_VERSION).exists())
+
+    # Arrow IPC round-trips through pyarrow when it is installed
+    @unittest.skipIf(export.pa is None, "pyarrow not installed")
+    def test_arrow_endpoint(self):
+        r = self.client.get(reverse("phone-export"), {"format": "arrow"})
+        table = export.pa.ipc.open_stream(b"".join(r.streaming_content)).read_all()
+        self.assertEqual(table.column("slug").to_pylist(), ["alpha", "beta"])
@@ -0,0 +1,108 @@
+from django.urls import reverse
+from rest_framework.test import APITestCase
+from phones.catalogue import catalogue_batch, catalogue_version, get_catalogue
+from phones.facets import bits_to_positions, positions_to_bits, get_facet_index
+from phones.testing import make_phone
+
+
+
+class FacetFilterAPITest(APITestCase):
+    def setUp(self):
+        make_phone("full-house")
+        make_phone("no-5g", has_5g=False, refresh_hz=90, ip_rating="IP54")
+        make_phone("lcd-4g", has_5g=False, has_nfc=False, display_type="lcd_ips",
+                   ram_gb=4, refresh_hz=60, ip_rating=None, price_sgd=149.00)
+
+    # Boolean facets intersect with each other and with the DB filters
+    def test_boolean_facets_intersect(self):
+        url = reverse("recommendation")
+        r = self.client.get(url, {"has_5g": "true", "oled": "1"})
+        self.assertEqual(r.status_code, 200)
+        self.assertEqual([p["slug"] for p in r.data], ["full-house"])
+
+        r = self.client.get(url, {"has_5g": "false", "max_price": 200})
+        self.assertEqual([p["slug"] for p in r.data], ["lcd-4g"])
+
+    # Numeric lower bounds and IP ratings narrow the candidate set
+    def test_numeric_and_keyed_facets(self):
+        url = reverse("recommendation")
+        r = self.client.get(url, {"min_ram": 8, "min_refresh": 100})
+        self.assertEqual([p["slug"] for p in r.data], ["full-house"])
+
+        r = self.client.get(url, {"ip_rating": "ip68,IP54"})
+        self.assertEqual(sorted(p["slug"] for p in r.data), ["full-house", "no-5g"])
+
+    # facets=1 wraps the list with counts over the returned phones
+    def test_facet_counts_in_response(self):
+        r = self.client.get(reverse("recommendation"), {"facets": "1", "has_nfc": "yes"})
+        self.assertEqual(r.status_code, 200)
+        self.assertEqual(r.data["count"], 2)
+        self.assertEqual(r.data["facets"]["has_nfc"], 2)
+        self.assertEqual(r.data["facets"]["has_5g"], 1)
+        self.assertEqual(r.data["facets"]["ip_rating"], {"IP54": 1, "IP68": 1})
+
+    # Malformed facet values are rejected like other filters
+    def test_invalid_facet_value_returns_400(self):
+        url = reverse("recommendation")
+        self.assertEqual(self.client.get(url, {"has_5g": "maybe"}).status_code, 400)
+        self.assertEqual(self.client.get(url, {"min_ram": "lots"}).status_code, 400)
+
+    # Index is rebuilt after a catalogue change
+    def test_index_rebuilt_on_version_bump(self):
+        before = get_facet_index()
+        make_phone("late-arrival")
+        after = get_facet_index()
+        self.assertIsNot(before, after)
+        self.assertEqual(after.n, 4)
+
+    # A batch of writes bumps the version once
+    def test_catalogue_batch_bumps_once(self):
+        v = catalogue_version()
+        with catalogue_batch():
+            make_phone("batch-a")
+            make_phone("batch-b")
+        self.assertEqual(catalogue_version(), v + 1)
+        self.assertIn("batch-b", get_catalogue().by_slug)
+
+    # Bitset helpers round-trip positions
+    def test_bitset_round_trip(self):
+        positions = [0, 3, 8, 63, 64, 130]
+        self.assertEqual(bits_to_positions(positions_to_bits(positions, 200)), positions)
+
+
+class RangeFilterAPITest(APITestCase):
+    def setUp(self):
+        make_phone("cheap", price_sgd=199.00, soc_score=4, ram_gb=4)
+        make_phone("middle", price_sgd=449.00)
+        make_phone("pricey", price_sgd=1299.00, soc_score=9, ram_gb=16, storage_gb=512)
+
+    # Price band is inclusive on both ends
+    def test_price_band(self):
+        url = reverse("recommendation")
+        r = self.client.get(url, {"min_price": 300, "max_price": "449.00"})
+        self.assertEqual(r.status_code, 200)
+        self.assertEqual([p["slug"] for p in r.data], ["middle"])
+
+    # min_score bounds raw_score and combines with the price band
+    def test_min_score_with_price_band(self):
+        url = reverse("recommendation")
+        pricey_raw = get_catalogue().rows[get_catalogue().by_slug["pricey"]]["raw_score"]
+        r = self.client.get(url, {"min_score": pricey_raw})
+        self.assertEqual([p["slug"] for p in r.data], ["pricey"])
+
+        r = self.client.get(url, {"min_score": pricey_raw, "max_price": 500})
+        self.assertEqual(r.data, [])
+
+    # Sorted-array lookups return positions in catalogue order
+    def test_range_index_between(self):
+        index = get_facet_index()
+        price = index.ranges["price_sgd"]
+        self.assertEqual(price.values, sorted(price.values))
+        self.assertEqual(index.select({"min_price": "200"}), [1, 2])
+        self.assertEqual(index.select({"has_5g": "1", "max_price": "500"}), [0, 1])
+
+    # Non-finite bounds are rejected
+    def test_non_finite_bound_returns_400(self):
+        url = reverse("recommendation")
+        self.assertEqual(self.client.get(url, {"max_price": "nan"}).status_code, 400)
+        self.assertEqual(self.client.get(url, {"min_score": "inf"}).status_code, 400)
@@ -0,0 +1,90 @@
+from unittest import mock
+from django.core.cache import cache
+from django.test import TestCase
+from django.urls import reverse
+from rest_framework.test import APITestCase
+from phones.catalogue import get_catalogue
+from phones.leaderboards import MODES, get_leaderboards, leaderboard_results, materialize_leaderboards
+from phones.models import LeaderboardSnapshot
+from phones.ranking import filtered_queryset, lean_values, rank_phones
+from phones.renderers import encode_json
+from phones.testing import make_phone
+
+
+def _make_catalogue():
+    make_phone("g-top", brand="Google", soc_score=9, ram_gb=12, price_sgd=1299.00)
+    make_phone("g-mid", brand="Google", soc_score=7, ram_gb=8, price_sgd=649.00)
+    make_phone("s-top", brand="Samsung", soc_score=9, ram_gb=16, price_sgd=1599.00)
+    make_phone("s-low", brand="Samsung", soc_score=4, ram_gb=4, price_sgd=199.00, refresh_hz=60)
+    make_phone("s-twin", brand="samsung", soc_score=4, ram_gb=4, price_sgd=199.00, refresh_hz=60)
+    make_phone("x-solo", brand="Nothing", soc_score=6, ram_gb=8, price_sgd=499.00)
+    make_phone("x-nobrand", brand="", soc_score=5, ram_gb=6, price_sgd=329.00)
+
+
+class LeaderboardTest(TestCase):
+    def setUp(self):
+        cache.clear()
+        _make_catalogue()
+
+    # Every mode x brand slice is byte-identical to the full ranking path
+    def test_matches_full_ranking(self):
+        for mode in MODES:
+            for brand in (None, "Google", "SAMSUNG", "Nothing", "Apple"):
+                params = {"mode": mode, **({"brand": brand} if brand else {})}
+                with self.subTest(**params):
+                    qs, index = filtered_queryset(params)
+                    expected = rank_phones(lean_values(qs), params, index)
+                    self.assertEqual(encode_json(leaderboard_results(params)), encode_json(expected))
+
+    # offset/limit slice the stored ordering
+    def test_slice(self):
+        full = leaderboard_results({"mode": "flagship"})
+        page = leaderboard_results({"mode": "flagship", "offset": "2", "limit": "3"})
+        self.assertEqual([p["slug"] for p in page], [p["slug"] for p in full[2:5]])
+
+    # Facet and range queries still take the full ranking path
+    def test_filtered_queries_fall_back(self):
+        self.assertIsNone(leaderboard_results({"mode": "budget", "has_5g": "1"}))
+        self.assertIsNone(leaderboard_results({"mode": "budget", "max_price": "500"}))
+        self.assertIsNone(leaderboard_results({"mode": "budget", "facets": "1"}))
+
+    # Leaderboards materialized on import are picked up by other processes without a rebuild
+    def test_materialized_boards_are_shared(self):
+        boards = materialize_leaderboards()
+        # Storing the same version again (another worker racing) is harmless
+        materialize_leaderboards()
+        self.assertEqual(LeaderboardSnapshot.objects.count(), 1)
+        # A fresh process starts with no derived structures and its own empty cache
+        cache.clear()
+        with mock.patch.dict("phones.catalogue._derived", clear=True), \
+                mock.patch("phones.leaderboards.build_leaderboards") as build:
+            self.assertEqual(get_leaderboards(get_catalogue()), boards)
+        build.assert_not_called()
+
+    # Only the current version's boards are kept
+    def test_old_versions_are_dropped(self):
+        materialize_leaderboards()
+        make_phone("late", brand="Google")
+        materialize_leaderboards()
+        self.assertEqual(list(LeaderboardSnapshot.objects.values_list("stamp", flat=True)), [get_catalogue().stamp])
+
+
+class LeaderboardAPITest(APITestCase):
+    def setUp(self):
+        cache.clear()
+        _make_catalogue()
+
+    # The list endpoint pages through the leaderboard and rejects bad bounds
+    def test_paging(self):
+        url = reverse("recommendation")
+        full = self.client.get(url, {"mode": "midrange"}).data
+        page = self.client.get(url, {"mode": "midrange", "offset": 1, "limit": 2}).data
+        self.assertEqual([p["slug"] for p in page], [p["slug"] for p in full[1:3]])
+        self.assertEqual(self.client.get(url, {"offset": "-1"}).status_code, 400)
+        self.assertEqual(self.client.get(url, {"limit": "x"}).status_code, 400)
+
+    # With facets, count stays the size of the whole filtered set
+    def test_facet_count_is_total(self):
+        r = self.client.get(reverse("recommendation"), {"facets": "1", "limit": 2})
+        self.assertEqual(len(r.data["results"]), 2)
+        self.assertEqual(r.data["count"], 7)
@@ -0,0 +1,53 @@
+from decimal import Decimal
+from unittest import mock
+from django.test import TestCase
+from phones.catalogue import _build_catalogue
+from phones.models import Phone
+from phones.ranking import card_from_row, lean_values, rank_phones
+from phones.rescore import rescore
+from phones.scoring import calculate_smartbuy_score
+from phones.serializers import PhoneSerializer
+from phones.testing import make_phone
+
+
+class LeanPathTest(TestCase):
+    def setUp(self):
+        make_phone("alpha", price_sgd=Decimal("899.90"), mohs=None, glass_type="Victus 2")
+        make_phone("beta", price_sgd=349.00, price_avg_90d=Decimal("400.00"), display_type=None)
+
+    # Lean rows project to exactly what the serializer produced
+    def test_card_matches_serializer(self):
+        rows = {r[0]: r for r in lean_values(Phone.objects.all())}
+        for phone in Phone.objects.all():
+            self.assertEqual(card_from_row(rows[phone.pk]), dict(PhoneSerializer(phone).data))
+
+    # Scores from lean rows match scoring the model instance
+    def test_scores_match_model_path(self):
+        ranked = {p["slug"]: p for p in rank_phones(lean_values(Phone.objects.all()), {"mode": "budget"})}
+        for phone in Phone.objects.all():
+            smartbuy, raw, breakdown = calculate_smartbuy_score(phone, mode="budget")
+            self.assertEqual(ranked[phone.slug]["smartbuy_score"], float(smartbuy))
+            self.assertEqual(ranked[phone.slug]["raw_score"], float(raw))
+            self.assertEqual(ranked[phone.slug]["score_breakdown"], breakdown)
+
+    # The catalogue build yields the serializer's rows plus scores, stale or stored
+    def test_catalogue_rows_match_model_path(self):
+        for stored in (False, True):
+            if stored:
+                rescore()
+            with self.subTest(stored=stored):
+                rows = _build_catalogue(1, "1").rows
+                for phone, row in zip(Phone.objects.order_by("pk"), rows):
+                    smartbuy, raw, breakdown = calculate_smartbuy_score(phone)
+                    expected = {**PhoneSerializer(phone).data, "id": phone.pk, "smartbuy_score": float(smartbuy),
+                                "raw_score": float(raw), "score_breakdown": breakdown}
+                    self.assertEqual(row, expected)
+
+    # With fresh stored scores the build neither scores nor instantiates Phone models
+    def test_catalogue_build_stays_lean(self):
+        rescore()
+        with mock.patch("phones.rescore.calculate_smartbuy_score") as score, \
+                mock.patch.object(Phone, "from_db") as from_db:
+            self.assertEqual(len(_build_catalogue(1, "1")), 2)
+        score.assert_not_called()
+        from_db.assert_not_called()
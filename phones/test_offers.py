@@ -0,0 +1,99 @@
+import json
+import os
+import tempfile
+from decimal import Decimal
+from io import StringIO
+from unittest import mock
+from django.core.management import call_command
+from django.urls import reverse
+from rest_framework.test import APITestCase
+from phones.catalogue import catalogue_version
+from phones.models import Offer, Phone, PriceObservation
+from phones.offers import OfferRow, ingest_offers
+from phones.quarantine import REASONS_KEY
+from phones.testing import make_phone, spec
+
+
+class OfferTest(APITestCase):
+    def setUp(self):
+        self.phone = make_phone("alpha", price_sgd=900.00)
+
+    def _price(self):
+        return Phone.objects.values_list("price_sgd", "price_retailer").get(pk=self.phone.pk)
+
+    # The cheapest offer is materialized onto the phone; re-ingesting a retailer replaces its offer
+    def test_best_offer_materialized(self):
+        ingest_offers([
+            OfferRow(self.phone.pk, "Lazada", 900, "http://l"),
+            OfferRow(self.phone.pk, "shopee", "849.50", "http://s"),
+        ])
+        self.assertEqual(self._price(), (Decimal("849.50"), "shopee"))
+
+        ingest_offers([OfferRow(self.phone.pk, "shopee", 999, "http://s")])
+        self.assertEqual(self._price(), (Decimal("900.00"), "lazada"))
+        self.assertEqual(Offer.objects.count(), 2)
+
+    # Unchanged offers leave the phone and catalogue version alone
+    def test_unchanged_offer_does_not_bump(self):
+        ingest_offers([OfferRow(self.phone.pk, "lazada", 800, "http://l")])
+        v = catalogue_version()
+        self.assertEqual(ingest_offers([OfferRow(self.phone.pk, "lazada", 800, "http://l")]), [])
+        self.assertEqual(catalogue_version(), v)
+
+    # The command ingests by slug, ranks on the new price and records history
+    def test_command_and_ranking(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "offers.json")
+            with open(path, "w") as fh:
+                json.dump([{"slug": "alpha", "retailer": "shopee", "price_sgd": 500, "url": "http://s"},
+                           {"slug": "nope", "retailer": "shopee", "price_sgd": 1, "url": "http://s"}], fh)
+            out = StringIO()
+            call_command("import_offers", path, stdout=out)
+        self.assertIn("skipped=1 best_price_changes=1", out.getvalue())
+        r = self.client.get(reverse("recommendation"), {"max_price": 600})
+        self.assertEqual([(p["slug"], p["price_retailer"]) for p in r.data], [("alpha", "shopee")])
+        self.assertEqual(PriceObservation.objects.get().price_sgd, Decimal("500.00"))
+
+    # The final_spec price is just the Lazada offer: re-importing never puts it on the
+    # phone over a cheaper offer, not even before the offers are published
+    def test_import_price_is_an_offer(self):
+        ingest_offers([OfferRow(self.phone.pk, "shopee", 500, "http://s")])
+        seen = []
+
+        def spy(rows):
+            seen.append(self._price())
+            return ingest_offers(rows)
+
+        for args in ((), ("--atomic",)):
+            with tempfile.TemporaryDirectory() as tmp, \
+                    mock.patch("phones.management.commands.import_phones.ingest_offers", side_effect=spy):
+                path = os.path.join(tmp, "spec.json")
+                with open(path, "w") as fh:
+                    json.dump([spec("alpha", price_sgd=700, price_url="http://l2"), spec("beta", price_sgd=650)], fh)
+                call_command("import_phones", path, *args, stdout=StringIO())
+            self.assertEqual(self._price(), (Decimal("500.00"), "shopee"))
+        self.assertEqual(seen, [(Decimal("500.00"), "shopee")] * 2)
+        self.assertEqual(Offer.objects.get(phone=self.phone, retailer="lazada").price_sgd, Decimal("700.00"))
+        beta = Phone.objects.get(slug="beta")
+        self.assertEqual((beta.price_sgd, beta.price_retailer), (Decimal("650.00"), "lazada"))
+
+    # Malformed items are quarantined with reason codes instead of crashing the run or
+    # being ingested with made-up values; the good offers still land
+    def test_command_quarantines_malformed_items(self):
+        good = {"slug": "alpha", "retailer": "shopee", "price_sgd": 500, "url": "http://s",
+                "seen_at": "2025-07-15T15:20:25+00:00"}
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "offers.json")
+            with open(path, "w") as fh:
+                json.dump([good, "garbage", {**good, "slug": ["alpha"]}, {**good, "seen_at": "last tuesday"},
+                           {**good, "retailer": " ", "price_sgd": "free"}], fh)
+            out = StringIO()
+            call_command("import_offers", path, stdout=out)
+            with open(os.path.join(tmp, "offers.quarantine.json")) as fh:
+                reasons = [item[REASONS_KEY] for item in json.load(fh)]
+        self.assertIn("offers=1 skipped=0 best_price_changes=1 quarantined=4", out.getvalue())
+        self.assertIn("bad_type=1, invalid=2, missing=1, not_an_object=1", out.getvalue())
+        self.assertEqual(reasons, [
+            ["not_an_object"], ["bad_type:slug"], ["invalid:seen_at"], ["missing:retailer", "invalid:price_sgd"],
+        ])
+        self.assertEqual(Offer.objects.get().seen_at.isoformat(), "2025-07-15T15:20:25+00:00")
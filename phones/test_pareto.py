@@ -0,0 +1,49 @@
+import unittest
+from django.urls import reverse
+from rest_framework.test import APITestCase
+from phones.pareto import pareto_layers
+from phones.testing import make_phone
+
+
+class ParetoLayersTest(unittest.TestCase):
+    # Dominated points fall to later layers and exact duplicates share one;
+    # the sweep matches a brute-force peel
+    def test_layers_match_brute_force(self):
+        points = [(100, 5.0, "a"), (200, 7.0, "b"), (150, 4.0, "c"), (300, 6.5, "d"),
+                  (250, 8.0, "e"), (120, 3.0, "f"), (200, 6.0, "g"), (200, 7.0, "b2"), (150, 4.0, "c2")]
+        layers = pareto_layers(points)
+
+        remaining, expected, depth = list(points), {}, 0
+        while remaining:
+            front = [p for p in remaining if not any(
+                q[0] <= p[0] and q[1] >= p[1] and (q[0], q[1]) != (p[0], p[1]) for q in remaining)]
+            for p in front:
+                expected[p[2]] = depth
+            remaining = [p for p in remaining if p not in front]
+            depth += 1
+        self.assertEqual(layers, expected)
+        self.assertEqual(sorted(k for k, v in layers.items() if v == 0), ["a", "b", "b2", "e"])
+
+
+class ParetoViewAPITest(APITestCase):
+    def setUp(self):
+        make_phone("cheap-ok", soc_score=5, price_sgd=199.00)
+        make_phone("mid-strong", soc_score=9, ram_gb=12, price_sgd=499.00)
+        make_phone("mid-weak", soc_score=5, price_sgd=549.00)
+
+    # view=pareto returns the frontier ordered by price
+    def test_frontier_only_by_default(self):
+        r = self.client.get(reverse("recommendation"), {"view": "pareto"})
+        self.assertEqual(r.status_code, 200)
+        self.assertEqual([p["slug"] for p in r.data], ["cheap-ok", "mid-strong"])
+        self.assertTrue(all(p["pareto_layer"] == 0 for p in r.data))
+
+    # layers=N adds next-best tiers; filters apply before the sweep
+    def test_layers_and_filters(self):
+        url = reverse("recommendation")
+        r = self.client.get(url, {"view": "pareto", "layers": 2})
+        self.assertEqual([p["slug"] for p in r.data], ["cheap-ok", "mid-strong", "mid-weak"])
+        self.assertEqual(r.data[-1]["pareto_layer"], 1)
+
+        r = self.client.get(url, {"view": "pareto", "min_price": 500})
+        self.assertEqual([p["slug"] for p in r.data], ["mid-weak"])
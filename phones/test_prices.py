@@ -0,0 +1,53 @@
+from datetime import timedelta
+from decimal import Decimal
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework.test import APITestCase
+from phones.models import Phone, PriceObservation
+from phones.prices import record_prices, refresh_rolling_prices
+from phones.scoring import calculate_smartbuy_score
+from phones.testing import make_phone
+
+
+class PriceHistoryTest(APITestCase):
+    def setUp(self):
+        self.phone = make_phone("alpha", price_sgd=900.00)
+        self.now = timezone.now()
+
+    def _observe(self, *steps):
+        for days_ago, price in steps:
+            record_prices([(self.phone.pk, price, self.now - timedelta(days=days_ago))])
+
+    # Unchanged prices are not stored again
+    def test_dedup(self):
+        self._observe((30, 900), (20, "900.00"), (10, 800), (5, 800))
+        prices = list(PriceObservation.objects.order_by("observed_at").values_list("price_sgd", flat=True))
+        self.assertEqual(prices, [Decimal("900.00"), Decimal("800.00")])
+
+    # Rolling columns are time-weighted and include the price in effect at window start
+    def test_rolling_columns(self):
+        self._observe((120, 1000), (60, 900), (30, 600))
+        refresh_rolling_prices(now=self.now)
+        self.phone.refresh_from_db()
+        self.assertEqual(self.phone.price_min_90d, Decimal("600.00"))
+        self.assertEqual(self.phone.price_avg_90d, Decimal("833.33"))
+
+    # A price below the rolling average lifts the value score
+    def test_drop_lifts_value(self):
+        base, _, _ = calculate_smartbuy_score(self.phone)
+        self.phone.price_avg_90d = Decimal("1100.00")
+        lifted, _, _ = calculate_smartbuy_score(self.phone)
+        self.assertGreater(lifted, base)
+
+    # The endpoint downsamples steps and 404s on unknown phones
+    def test_endpoint(self):
+        self._observe((300, 1000), (200, 950), (199, 940), (10, 900))
+        r = self.client.get(reverse("phone-prices", args=["alpha"]), {"days": 365, "points": 10})
+        self.assertEqual(r.status_code, 200)
+        pts = r.data["points"]
+        self.assertLessEqual(len(pts), 10)
+        self.assertEqual(pts[0]["price"], 1000.0)
+        self.assertEqual(pts[-1]["price"], 900.0)
+        self.assertTrue(any(p["min"] == 940.0 and p["max"] == 1000.0 for p in pts))
+        self.assertEqual(self.client.get(reverse("phone-prices", args=["nope"])).status_code, 404)
+        self.assertEqual(Phone.objects.count(), 1)
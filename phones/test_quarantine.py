@@ -0,0 +1,81 @@
+import json
+import os
+import tempfile
+from io import StringIO
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.test import TestCase, override_settings
+from phones.models import Phone
+from phones.quarantine import REASONS_KEY, check_values
+from phones.testing import spec
+
+
+class QuarantineImportTest(TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        self.path = os.path.join(self.tmp.name, "spec.json")
+        self.quarantine = os.path.join(self.tmp.name, "spec.quarantine.json")
+
+    def _import(self, items, *args, path=None):
+        path = path or self.path
+        with open(path, "w") as fh:
+            json.dump(items, fh)
+        out = StringIO()
+        call_command("import_phones", path, *args, stdout=out)
+        return out.getvalue()
+
+    def _quarantined(self):
+        with open(self.quarantine) as fh:
+            return {item.get("slug"): item[REASONS_KEY] for item in json.load(fh)}
+
+    # Bad rows are held back with reason codes while the rest of the file is imported
+    def test_quarantines_bad_rows(self):
+        out = self._import([
+            spec("alpha"),
+            spec("beta", battery_mah="90000 mAh", price_sgd=0),
+            spec("gamma", chipset="Snapdragon Imaginary", has_5g="yes"),
+            spec("delta", price_sgd="399"),
+            {"model": "No Slug"},
+            spec("epsilon", chipset="Mediatek Dimensity 7025 (Global)", refresh_hz=120),
+        ])
+        self.assertEqual(sorted(Phone.objects.values_list("slug", flat=True)), ["alpha", "epsilon"])
+        self.assertIn("created=2 quarantined=4", out)
+        self.assertIn("bad_type=2, missing_slug=1, out_of_range=2, unknown_chipset=1", out)
+        self.assertEqual(self._quarantined(), {
+            "beta": ["out_of_range:battery_mah", "out_of_range:price_sgd"],
+            "gamma": ["unknown_chipset", "bad_type:has_5g"],
+            "delta": ["bad_type:price_sgd"],
+            None: ["missing_slug"],
+        })
+
+    # Non-object items and non-string slugs are quarantined, in both modes
+    def test_malformed_items(self):
+        items = [spec("alpha"), "garbage", {**spec("beta"), "slug": ["not", "a", "slug"]}]
+        out = self._import(items)
+        self.assertIn("created=1 quarantined=2", out)
+        self.assertIn("bad_type=1, not_an_object=1", out)
+        with self.assertRaisesMessage(CommandError, "2 items quarantined"):
+            self._import(items, "--atomic")
+
+    # The quarantine file is itself importable once its rows are fixed
+    def test_fixed_quarantine_file_imports(self):
+        self._import([spec("alpha"), spec("beta", refresh_hz=999)])
+        with open(self.quarantine) as fh:
+            items = json.load(fh)
+        items[0]["refresh_hz"] = 120
+        self._import(items, path=os.path.join(self.tmp.name, "fixed.json"))
+        self.assertEqual(Phone.objects.get(slug="beta").refresh_hz, 120)
+
+    # --atomic still writes nothing, but reports the rows to fix
+    def test_atomic_rejects_and_reports(self):
+        with self.assertRaisesMessage(CommandError, "1 items quarantined (out_of_range=1)"):
+            self._import([spec("alpha"), spec("beta", price_sgd=-5)], "--atomic")
+        self.assertFalse(Phone.objects.exists())
+        self.assertEqual(self._quarantined(), {"beta": ["out_of_range:price_sgd"]})
+
+    # Without a soc_scores map every chipset is accepted
+    @override_settings(SOC_SCORES_PATH=None)
+    def test_chipset_check_disabled(self):
+        values = [{"chipset": "Snapdragon Imaginary"}]
+        self.assertEqual(check_values(["chipset"], values), [[]])
@@ -0,0 +1,30 @@
+import json
+from datetime import datetime, timezone
+from decimal import Decimal
+from django.test import SimpleTestCase
+from rest_framework.renderers import JSONRenderer
+from phones.renderers import EncodedJSONResponse, ORJSONRenderer, encode_json
+
+
+class ORJSONRendererTest(SimpleTestCase):
+    # Decimal, datetime and nested payloads encode to the same bytes as DRF's renderer
+    def test_matches_drf_json_renderer(self):
+        data = [{"price_sgd": Decimal("399.00"), "scraped_at": datetime(2025, 8, 1, 12, 30, tzinfo=timezone.utc),
+                 "t": datetime(2025, 8, 1, 12, 30, 5, 123456, tzinfo=timezone.utc),
+                 "score_breakdown": {"soc": 7.5}, "name": "Pixel \u2028 9a", "ok": None}]
+        self.assertEqual(encode_json(data), JSONRenderer().render(data))
+        ours = json.loads(ORJSONRenderer().render(data))
+        theirs = json.loads(JSONRenderer().render(data))
+        self.assertEqual(ours[0]["price_sgd"], theirs[0]["price_sgd"])
+        self.assertEqual(ours[0]["score_breakdown"], theirs[0]["score_breakdown"])
+        self.assertEqual(ours[0]["name"], theirs[0]["name"])
+        self.assertTrue(ours[0]["scraped_at"].startswith("2025-08-01T12:30:00"))
+        self.assertNotIn("\u2028".encode(), ORJSONRenderer().render(data))
+
+    # Pre-encoded responses expose the decoded payload as .data
+    def test_encoded_response(self):
+        body = encode_json([{"slug": "a"}])
+        resp = EncodedJSONResponse(body)
+        self.assertEqual(resp["Content-Type"], "application/json")
+        self.assertEqual(resp.content, body)
+        self.assertEqual(resp.data, [{"slug": "a"}])
@@ -0,0 +1,44 @@
+from io import StringIO
+from django.core.management import call_command
+from django.test import TestCase
+from phones.models import Phone
+from phones.rescore import current_scores, pk_ranges, rescore
+from phones.scoring import SCORING_PROFILE_VERSION, calculate_smartbuy_score
+from phones.testing import make_phone
+
+
+class RescoreTest(TestCase):
+    def setUp(self):
+        for i in range(5):
+            make_phone(f"p{i}", soc_score=4 + i, price_sgd=300 + 100 * i)
+
+    # pk ranges cover every phone in bounded chunks
+    def test_pk_ranges(self):
+        pks = list(Phone.objects.order_by("pk").values_list("pk", flat=True))
+        ranges = pk_ranges(Phone.objects.all(), 2)
+        self.assertEqual(len(ranges), 3)
+        self.assertEqual((ranges[0][0], ranges[-1][1]), (pks[0], pks[-1]))
+
+    # Stored scores match a fresh calculation and are marked current
+    def test_rescore_writes_scores(self):
+        self.assertEqual(rescore(workers=0, chunk_size=2), 5)
+        for phone in Phone.objects.all():
+            smartbuy, raw, breakdown = calculate_smartbuy_score(phone)
+            self.assertEqual(phone.scoring_profile, SCORING_PROFILE_VERSION)
+            self.assertEqual((phone.smartbuy_score, phone.raw_score, phone.score_breakdown),
+                             (smartbuy, raw, breakdown))
+            self.assertEqual(current_scores(phone), (smartbuy, raw, breakdown))
+
+    # Saving a phone marks it stale; --stale-only rescoring touches just that one
+    def test_stale_only(self):
+        rescore(workers=0)
+        phone = Phone.objects.get(slug="p0")
+        phone.soc_score = 9
+        phone.save()
+        self.assertEqual(Phone.objects.get(slug="p0").scoring_profile, 0)
+
+        out = StringIO()
+        call_command("rescore", workers=0, stale_only=True, stdout=out)
+        self.assertIn("Rescored 1 phones", out.getvalue())
+        phone.refresh_from_db()
+        self.assertEqual(phone.raw_score, calculate_smartbuy_score(phone)[1])
@@ -6,7 +6,8 @@ from .scoring import (
     calculate_raw_score, calculate_smartbuy_score,
     _normalize_ip, _ip_score,
     _durability_score, _has_useful_ultrawide,
-    _resolve_ppi, _resolve_refresh, _resolve_charging_w, _resolve_ip, _resolve_glass
+    _resolve_ppi, _resolve_refresh, _resolve_charging_w, _resolve_ip, _resolve_glass,
+    PhoneSpec,
 )
 
 class TestScoring(unittest.TestCase):
@@ -204,6 +205,30 @@ class TestScoring(unittest.TestCase):
         smartbuy, raw, _ = calculate_smartbuy_score(phone)
         self.assertGreaterEqual(smartbuy, 500)
         self.assertGreater(raw, 0)
+    # Test PhoneSpec resolves aliases once and scores like the raw dict
+    def test_phone_spec_from_dict_matches_dict_scoring(self):
+        phone = {
+            "soc_score": 8.7, "ram_gb": 12, "storage_gb": 512, "res_w": 1080, "res_h": 2400,
+            "battery_mah": 5200, "main_mp": 108, "charging_speed": "67W",
+            "pixel_density": 395, "refresh_rate": 120, "display_type": "OLED",
+            "has_5g": True, "ip": "ip67", "display_protection": "Gorilla Glass 5",
+            "brand": "Samsung", "price_sgd": "349", "camera_main_mp": "108MP + 12MP",
+        }
+        spec = PhoneSpec.from_dict(phone)
+        self.assertEqual((spec.ppi, spec.refresh_hz, spec.charging_w), (395, 120, 67))
+        self.assertEqual((spec.ip_rating, spec.short_side, spec.oled), ("IP67", 1080, True))
+        self.assertTrue(spec.useful_ultrawide)
+        self.assertEqual(calculate_smartbuy_score(spec), calculate_smartbuy_score(phone))
+        self.assertFalse(hasattr(spec, "__dict__"))
+
+    # Test from_row follows ROW_FIELDS order and tolerates junk values
+    def test_phone_spec_from_row(self):
+        row = dict.fromkeys(PhoneSpec.ROW_FIELDS)
+        row.update(brand="Google", ram_gb="junk", res_w=1080, price_sgd="N/A", charging_w=30)
+        spec = PhoneSpec.from_row(tuple(row[f] for f in PhoneSpec.ROW_FIELDS))
+        self.assertEqual((spec.brand, spec.ram_gb, spec.short_side, spec.charging_w), ("Google", 0.0, 0, 30))
+        self.assertIsNone(spec.price_sgd)
+        self.assertEqual(calculate_smartbuy_score(spec)[0], 0.0)
 
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,45 @@
+from django.urls import reverse
+from rest_framework.test import APITestCase
+from phones.normalize import tidy_model_case
+from phones.search import normalize_text, get_search_index
+from phones.testing import make_phone
+
+
+class PhoneSearchAPITest(APITestCase):
+    def setUp(self):
+        make_phone("samsung-galaxy-s25-ultra", brand="Samsung", model="Galaxy S25 Ultra")
+        make_phone("samsung-galaxy-s25", brand="Samsung", model="Galaxy S25")
+        make_phone("xiaomi-redmi-note-14-pro", brand="Xiaomi", model="Redmi Note 14 Pro")
+        make_phone("apple-iphone-16", brand="Apple", model="iphone 16")
+
+    def _slugs(self, q):
+        r = self.client.get(reverse("phone-search"), {"q": q})
+        self.assertEqual(r.status_code, 200)
+        return [hit["slug"] for hit in r.data]
+
+    # Partial model names rank the closest phone first
+    def test_ranked_partial_match(self):
+        self.assertEqual(self._slugs("s25 ultra")[0], "samsung-galaxy-s25-ultra")
+        self.assertEqual(self._slugs("redmi note 14 pro")[0], "xiaomi-redmi-note-14-pro")
+
+    # Misspelled queries still find the phone
+    def test_typo_tolerance(self):
+        self.assertEqual(self._slugs("galaxy s25 ultar")[0], "samsung-galaxy-s25-ultra")
+        self.assertEqual(self._slugs("iphne 16")[0], "apple-iphone-16")
+
+    # Unrelated queries return nothing; a missing query is a 400
+    def test_no_match_and_missing_query(self):
+        self.assertEqual(self._slugs("zzzz qqqq"), [])
+        r = self.client.get(reverse("phone-search"))
+        self.assertEqual(r.status_code, 400)
+
+    # Query normalization follows tidy_model_case
+    def test_normalization_matches_cleaning(self):
+        self.assertEqual(normalize_text("Apple IPHONE 16 (256gb)"), "apple iphone 16 256gb")
+        self.assertEqual(tidy_model_case(" iphone 15 128gb "), "iPhone 15 128GB")
+
+    # Index follows catalogue changes
+    def test_index_sees_new_phones(self):
+        self.assertEqual(get_search_index().search("pixel 9a"), [])
+        make_phone("google-pixel-9a", brand="Google", model="Pixel 9a")
+        self.assertEqual(get_search_index().search("pixel 9a")[0]["slug"], "google-pixel-9a")
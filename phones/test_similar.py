@@ -0,0 +1,48 @@
+import random
+import unittest
+from django.urls import reverse
+from rest_framework.test import APITestCase
+from phones.similar import KDTree, _sqdist
+from phones.testing import make_phone
+
+
+class SimilarPhonesAPITest(APITestCase):
+    def setUp(self):
+        make_phone("flagship-a", brand="Alpha", soc_score=9, ram_gb=12, storage_gb=256, price_sgd=1199.00)
+        make_phone("flagship-b", brand="Beta", soc_score=9, ram_gb=12, storage_gb=256, price_sgd=999.00)
+        make_phone("flagship-c", brand="Alpha", soc_score=9, ram_gb=12, storage_gb=512, price_sgd=1299.00)
+        make_phone("budget", brand="Gamma", soc_score=4, ram_gb=4, storage_gb=64,
+                   has_5g=False, has_nfc=False, refresh_hz=60, price_sgd=149.00)
+
+    def _slugs(self, slug, **params):
+        r = self.client.get(reverse("phone-similar", args=[slug]), params)
+        self.assertEqual(r.status_code, 200)
+        return [hit["slug"] for hit in r.data]
+
+    # Nearest neighbours exclude the phone itself and put the budget phone last
+    def test_nearest_neighbours(self):
+        slugs = self._slugs("flagship-a", k=3)
+        self.assertNotIn("flagship-a", slugs)
+        self.assertEqual(slugs[-1], "budget")
+
+    # Price ceiling and brand exclusion filter candidates
+    def test_price_ceiling_and_brand_exclusion(self):
+        self.assertEqual(self._slugs("flagship-a", max_price=1000), ["flagship-b", "budget"])
+        self.assertEqual(self._slugs("flagship-a", exclude_brand="beta,gamma"), ["flagship-c"])
+
+    # Unknown slugs 404
+    def test_unknown_slug(self):
+        r = self.client.get(reverse("phone-similar", args=["nope"]))
+        self.assertEqual(r.status_code, 404)
+
+
+class KDTreeTest(unittest.TestCase):
+    # KD-tree answers match brute force, including with a predicate
+    def test_matches_brute_force(self):
+        rng = random.Random(7)
+        vectors = [tuple(rng.random() for _ in range(11)) for _ in range(500)]
+        tree = KDTree(vectors)
+        accept = lambda i: i % 3 != 0
+        for point in vectors[:20]:
+            expected = sorted((_sqdist(point, v), i) for i, v in enumerate(vectors) if accept(i))[:5]
+            self.assertEqual(tree.query(point, 5, accept), expected)
@@ -0,0 +1,73 @@
+from django.urls import reverse
+from rest_framework.test import APITestCase
+from phones.models import Phone
+from phones.simulate import SIMULATE_MAX_SLUGS
+from phones.testing import make_phone
+
+
+class SimulateAPITest(APITestCase):
+    def setUp(self):
+        specs = [
+            ("alpha", dict(soc_score=9, ram_gb=12, price_sgd=1299.00, brand="Google")),
+            ("bravo", dict(soc_score=8, ram_gb=8, price_sgd=899.00, brand="Google")),
+            ("charlie", dict(soc_score=7, ram_gb=8, price_sgd=649.00)),
+            ("delta", dict(soc_score=6, ram_gb=8, price_sgd=499.00)),
+            ("echo", dict(soc_score=5, ram_gb=6, price_sgd=329.00)),
+            ("foxtrot", dict(soc_score=4, ram_gb=4, price_sgd=199.00, refresh_hz=60)),
+            ("golf", dict(soc_score=6, ram_gb=8, price_sgd=499.00)),
+        ]
+        for slug, fields in specs:
+            make_phone(slug, **fields)
+
+    def _simulate(self, overrides, **params):
+        url = reverse("simulate")
+        if params:
+            url += "?" + "&".join(f"{k}={v}" for k, v in params.items())
+        return self.client.post(url, {"overrides": overrides}, format="json")
+
+    def _live_rank(self, slug, **params):
+        r = self.client.get(reverse("recommendation"), params)
+        return [p["slug"] for p in r.data].index(slug) + 1
+
+    # Simulated ranks match what the live ranking returns once the change is really made
+    def test_matches_live_ranking(self):
+        cases = [
+            ({"bravo": {"price_sgd": 549}}, {"mode": "budget"}),
+            ({"alpha": {"price_sgd": 1099}, "foxtrot": {"ram_gb": 12}}, {"mode": "flagship"}),
+            ({"golf": {"soc_score": 9, "price_sgd": 459}}, {"mode": "midrange"}),
+            ({"bravo": {"price_sgd": 599}}, {"mode": "budget", "brand": "Google"}),
+        ]
+        for overrides, params in cases:
+            with self.subTest(params=params):
+                before = {slug: self._live_rank(slug, **params) for slug in overrides}
+                r = self._simulate(overrides, **params)
+                self.assertEqual(r.status_code, 200)
+                for slug, fields in overrides.items():
+                    phone = Phone.objects.get(slug=slug)
+                    for k, v in fields.items():
+                        setattr(phone, k, v)
+                    phone.save()
+                got = {row["slug"]: (row["rank_before"], row["rank"]) for row in r.data["results"]}
+                live = {slug: self._live_rank(slug, **params) for slug in overrides}
+                self.assertEqual(got, {slug: (before[slug], live[slug]) for slug in overrides})
+                self._reset()
+
+    def _reset(self):
+        Phone.objects.all().delete()
+        self.setUp()
+
+    # Phones outside the filtered scope are reported, and an all-missing request is a 404
+    def test_missing(self):
+        r = self._simulate({"delta": {"price_sgd": 99}, "nope": {"price_sgd": 1}}, brand="Google")
+        self.assertEqual(r.status_code, 404)
+        r = self._simulate({"bravo": {"price_sgd": 99}, "nope": {"price_sgd": 1}})
+        self.assertEqual(r.data["missing"], ["nope"])
+        self.assertEqual(r.data["results"][0]["rank"], 1)
+
+    # Unknown fields, junk prices and oversized requests are rejected
+    def test_errors(self):
+        self.assertEqual(self._simulate({"bravo": {"colour": "red"}}).status_code, 400)
+        self.assertEqual(self._simulate({"bravo": {"price_sgd": "free"}}).status_code, 400)
+        self.assertEqual(self._simulate([]).status_code, 400)
+        many = {f"p{i}": {"price_sgd": 1} for i in range(SIMULATE_MAX_SLUGS + 1)}
+        self.assertEqual(self._simulate(many).status_code, 400)
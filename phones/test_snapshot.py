@@ -0,0 +1,74 @@
+from io import StringIO
+from unittest import mock
+import os
+import tempfile
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from rest_framework.test import APITestCase
+from phones.catalogue import _build_catalogue, catalogue_stamp, get_catalogue
+from phones.snapshot import MappedRows, open_snapshot, write_snapshot
+from phones.testing import make_phone
+
+
+class SnapshotFileTest(TestCase):
+    def setUp(self):
+        make_phone("alpha", price_sgd=899.00, ip_rating=None, has_ois=None)
+        make_phone("beta", price_sgd=349.00)
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp.name, "catalogue.bin")
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    # Mapped rows decode to exactly what the ORM build produces, nulls included
+    def test_round_trip(self):
+        built = _build_catalogue(1, "1-abc")
+        write_snapshot(self.path, "1-abc", built.rows)
+        stamp, rows = open_snapshot(self.path)
+        self.assertEqual(stamp, "1-abc")
+        self.assertEqual(list(rows), list(built.rows))
+        self.assertEqual(rows[-1], built.rows[-1])
+
+    # Missing or foreign files are ignored
+    def test_rejects_bad_files(self):
+        self.assertIsNone(open_snapshot(self.path))
+        with open(self.path, "wb") as fh:
+            fh.write(b"not a snapshot" * 10)
+        self.assertIsNone(open_snapshot(self.path))
+
+    # Files scored under an older profile are ignored even though the stamp still matches
+    def test_rejects_other_scoring_profile(self):
+        write_snapshot(self.path, "1-abc", _build_catalogue(1, "1-abc").rows)
+        with mock.patch("phones.snapshot.SCORING_PROFILE_VERSION", 999):
+            self.assertIsNone(open_snapshot(self.path))
+
+
+class MappedCatalogueTest(APITestCase):
+    def setUp(self):
+        make_phone("alpha", price_sgd=899.00)
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp.name, "catalogue.bin")
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    # get_catalogue maps the shared file and rewrites it after a version bump
+    def test_get_catalogue_swaps_file(self):
+        with override_settings(CATALOGUE_SNAPSHOT_PATH=self.path):
+            cat = get_catalogue()
+            self.assertIsInstance(cat.rows, MappedRows)
+            self.assertEqual(open_snapshot(self.path)[0], catalogue_stamp())
+
+            make_phone("beta", price_sgd=349.00)
+            cat = get_catalogue()
+            self.assertEqual(open_snapshot(self.path)[0], catalogue_stamp())
+            self.assertEqual(sorted(cat.by_slug), ["alpha", "beta"])
+
+            r = self.client.get(reverse("phone-search"), {"q": "beta"})
+            self.assertEqual(r.data[0]["slug"], "beta")
+
+    # The command pre-writes the file for the current stamp
+    def test_command(self):
+        call_command("snapshot_catalogue", self.path, stdout=StringIO())
+        self.assertEqual(open_snapshot(self.path)[0], catalogue_stamp())
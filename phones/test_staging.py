@@ -0,0 +1,105 @@
+import json
+import os
+import tempfile
+from io import StringIO
+from unittest import mock
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.test import TestCase
+from phones.catalogue import catalogue_version
+from phones.management.commands.import_phones import PHONE_FIELDS, normalized_chunks, phone_defaults
+from phones.models import CatalogueChange, Offer, Phone
+from phones.rescore import rescore
+from phones.scoring import SCORING_PROFILE_VERSION
+from phones.staging import PhoneStaging
+from phones.testing import spec
+
+# Columns an import writes, compared between ORM upserts and the bulk import paths
+_COMPARED = ["slug", *PHONE_FIELDS, "scoring_profile"]
+
+
+class AtomicImportTest(TestCase):
+    def _import(self, items, *args):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "spec.json")
+            with open(path, "w") as fh:
+                json.dump(items, fh)
+            out = StringIO()
+            call_command("import_phones", path, *args, stdout=out)
+            return out.getvalue()
+
+    def _state(self):
+        return sorted(Phone.objects.values_list(*_COMPARED))
+
+    # Reference state: the same items written one by one through the ORM, then rescored
+    def _orm_import(self, *batches):
+        for items in batches:
+            for item in items:
+                Phone.objects.update_or_create(slug=item["slug"], defaults=phone_defaults(item))
+            rescore(stale_only=True)
+        state = self._state()
+        Phone.objects.all().delete()
+        return state
+
+    # Bulk writes match ORM upserts for creates, updates and duplicates, in both modes,
+    # whether normalised in-process or on the pool and whatever the chunking
+    def test_matches_orm_upserts(self):
+        first = [spec("alpha", ram_gb="12 GB", resolution="1080 x 2400"), spec("beta", ip="IP68 dust")]
+        second = [spec("alpha", price_sgd=349.0, soc_score=9), spec("gamma", refresh_rate="120Hz"),
+                  spec("gamma", refresh_rate="90Hz")]
+        expected = self._orm_import(first, second)
+
+        for args in ([], ["--atomic"], ["--workers", "0"], ["--atomic", "--chunk-size", "1"],
+                     ["--chunk-size", "1", "--workers", "1"]):
+            with self.subTest(args=args):
+                Phone.objects.all().delete()
+                self._import(first, *args)
+                out = self._import(second, *args)
+                self.assertIn("created=1", out)
+                self.assertEqual(self._state(), expected)
+                self.assertEqual(Offer.objects.count(), 3)
+
+    # One version bump per run, a change-feed row per changed phone, and rescored stored scores
+    def test_single_bump_and_changes(self):
+        self._import([spec("alpha"), spec("beta")], "--atomic")
+        Phone.objects.filter(slug="alpha").update(scoring_profile=99)
+        before = catalogue_version()
+
+        self._import([spec("alpha", soc_score=9), spec("beta")], "--atomic")
+        self.assertEqual(catalogue_version(), before + 1)
+        self.assertEqual(
+            list(CatalogueChange.objects.filter(version=before + 1).values_list("slug", "action")),
+            [("alpha", "updated")],
+        )
+        self.assertEqual(Phone.objects.get(slug="alpha").scoring_profile, SCORING_PROFILE_VERSION)
+
+    # A bad row rejects the whole file before anything reaches Phone
+    def test_invalid_rows_write_nothing(self):
+        self._import([spec("alpha")], "--atomic")
+        before = (catalogue_version(), self._state())
+        for bad in (spec("beta", price_url=None), spec("beta", scraped_at="not a date"),
+                    spec("beta", soc_score="fast")):
+            with self.subTest(bad=bad), self.assertRaises(CommandError):
+                self._import([spec("alpha", soc_score=9), bad], "--atomic")
+            self.assertEqual((catalogue_version(), self._state()), before)
+
+    # Upserts only mark stored scores stale when a scoring input changes
+    def test_unchanged_inputs_keep_stored_scores(self):
+        staging = PhoneStaging(PHONE_FIELDS)
+        item = spec("alpha", refresh_rate="120Hz", display_type="OLED")
+        staging.upsert([staging.prepare("alpha", phone_defaults(item))])
+        Phone.objects.update(scoring_profile=SCORING_PROFILE_VERSION)
+
+        staging.upsert([staging.prepare("alpha", phone_defaults({**item, "warranty": "2"}))])
+        self.assertEqual(Phone.objects.get().scoring_profile, SCORING_PROFILE_VERSION)
+        staging.upsert([staging.prepare("alpha", phone_defaults({**item, "price_sgd": 299.0}))])
+        self.assertEqual(Phone.objects.get().scoring_profile, 0)
+
+    # Small files are normalised in-process; only larger ones start a pool
+    def test_pool_only_for_large_files(self):
+        items = [spec(f"p{i}") for i in range(4)]
+        with mock.patch("phones.management.commands.import_phones.ProcessPoolExecutor") as pool:
+            self.assertEqual(sum(len(c.rows) for c in normalized_chunks(items, 4, chunk_size=2)), 4)
+            pool.assert_not_called()
+            list(normalized_chunks(items, 4, chunk_size=1))
+            pool.assert_called_once()
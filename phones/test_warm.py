@@ -0,0 +1,61 @@
+import json
+import os
+import tempfile
+from io import StringIO
+from unittest import mock
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.test import override_settings
+from django.urls import reverse
+from rest_framework.test import APITestCase
+from phones.management.commands.warm_recommendations import common_queries
+from phones.testing import make_phone, spec
+
+
+class WarmRecommendationsTest(APITestCase):
+    def setUp(self):
+        make_phone("alpha", price_sgd=899.00)
+        make_phone("beta", brand="OtherBrand", price_sgd=349.00)
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+
+    # A file cache is shared by every process on the host, like the web workers' would be
+    def _shared_cache(self):
+        return override_settings(CACHES={"default": {
+            "BACKEND": "django.core.cache.backends.filebased.FileBasedCache",
+            "LOCATION": os.path.join(self.tmp.name, "cache"),
+        }})
+
+    # Enumerates every mode x (all + brand) x (no cap + cap)
+    def test_common_queries(self):
+        queries = list(common_queries(["A"], ["500"]))
+        self.assertEqual(len(queries), 3 * 2 * 2)
+        self.assertIn({"mode": "flagship", "brand": "A", "max_price": "500"}, queries)
+        self.assertIn({"mode": "budget"}, queries)
+
+    # Warmed queries are served from the cache without ranking
+    def test_warm_then_hit(self):
+        out = StringIO()
+        with self._shared_cache():
+            call_command("warm_recommendations", workers=0, price_caps="500", stdout=out)
+            self.assertIn("Warmed 18", out.getvalue())
+
+            with mock.patch("phones.views.ranked_variants") as rank:
+                r = self.client.get(reverse("recommendation"),
+                                    {"mode": "Budget", "brand": "otherbrand", "max_price": "500"})
+        self.assertEqual(r.status_code, 200)
+        rank.assert_not_called()
+        self.assertEqual([p["slug"] for p in r.data], ["beta"])
+
+    # A process-local cache is refused; import --warm reports it and still imports
+    def test_refuses_process_local_cache(self):
+        with self.assertRaisesMessage(CommandError, "local to this process"):
+            call_command("warm_recommendations", workers=0, stdout=StringIO())
+
+        path = os.path.join(self.tmp.name, "spec.json")
+        with open(path, "w") as fh:
+            json.dump([spec("gamma")], fh)
+        out = StringIO()
+        call_command("import_phones", path, "--warm", stdout=out)
+        self.assertIn("created=1", out.getvalue())
+        self.assertIn("Skipped warming", out.getvalue())
@@ -0,0 +1,32 @@
+from datetime import datetime
+from django.utils.timezone import make_aware
+from phones.models import Phone
+
+
+# Create a fully populated Phone; keyword overrides replace any field
+def make_phone(slug, **overrides):
+    fields = dict(
+        model=slug.title(), slug=slug, brand="TestBrand",
+        source_url="http://x", warranty="1",
+        soc_score=6, ram_gb=8, storage_gb=128, battery_mah=5000,
+        display_in=6.5, refresh_hz=120, ppi=400, charging_w=30,
+        main_mp=50, front_mp=16, res_w=1080, res_h=2400, bt_ver=5.2,
+        has_nfc=True, has_fast_charging=True, has_5g=True,
+        has_wireless_charging=False, has_reverse_wireless_charging=False,
+        has_ois=False, has_stereo_speakers=False, has_aptx=False, has_ldac=False,
+        display_type="oled", ip_rating="IP68",
+        price_sgd=399.00, price_url="http://x",
+        scraped_at=make_aware(datetime.now()),
+    )
+    fields.update(overrides)
+    return Phone.objects.create(**fields)
+
+# Minimal final_spec item for import_phones; keyword overrides replace any key
+def spec(slug, **overrides):
+    item = {
+        "slug": slug, "model": slug.title(), "brand": "TestBrand", "source_url": "http://x",
+        "soc_score": 6, "ram_gb": 8, "storage_gb": 128, "price_sgd": 399.0, "price_url": "http://x",
+        "scraped_at": "2025-07-15T15:20:25+00:00", "warranty": "1",
+    }
+    item.update(overrides)
+    return item
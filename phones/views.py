@@ -1,112 +1,288 @@
-from decimal import Decimal, InvalidOperation
-from rest_framework import status
+from asgiref.sync import sync_to_async
+from django.http import HttpResponseNotAllowed, JsonResponse, StreamingHttpResponse
+from django.utils.cache import get_conditional_response, patch_cache_control, patch_vary_headers
+from rest_framework import generics, status
+from rest_framework.pagination import CursorPagination
 from rest_framework.views import APIView
 from rest_framework.response import Response
 from rest_framework.permissions import AllowAny
-from .models import Phone
-from .serializers import PhoneSerializer
-from .scoring import calculate_smartbuy_score 
+from django.conf import settings
+from django.core.cache import cache
+from .explain import explain
+from .leaderboards import leaderboard_results
+from .export import available_formats, export_rows, iter_arrow, iter_ndjson
+from .facets import parse_bound
+from .models import CatalogueChange, Phone
+from .serializers import CatalogueChangeSerializer
+from .prices import price_history
+from .search import get_search_index
+from .similar import get_similarity_index
+from .simulate import parse_overrides, simulate
+from .catalogue import acatalogue_stamp, catalogue_stamp, get_catalogue
+from .compare import COMPARE_MAX_SLUGS, compare, parse_slugs
+from .compression import encode_variants, negotiate_encoding
+from .renderers import EncodedJSONResponse, encode_json
+from .ranking import (
+    arank_phones, filtered_queryset, lean_values, pareto_results, ranked_cache_key, ranked_etag,
+    ranked_variants,
+)
+
+SEARCH_MAX_LIMIT = 50
+SIMILAR_MAX_K = 50
+PRICE_HISTORY_MAX_POINTS = 500
+PRICE_HISTORY_MAX_DAYS = 3650
 
 
 class RecommendationView(APIView):
     permission_classes = [AllowAny]
 
     def get(self, request):
-        # Determine scoring mode
-        mode = (request.query_params.get("mode", "budget") or "budget").lower()
-        scoring_mode = "mid" if mode == "midrange" else mode
+        params = request.query_params
+
+        # Revalidation needs only the catalogue stamp: answer 304 before any ranking
+        stamp = catalogue_stamp()
+        encoding = negotiate_encoding(request.META.get("HTTP_ACCEPT_ENCODING"))
+        etag = ranked_etag(stamp, params, encoding)
+        if (not_modified := get_conditional_response(request, etag=etag)) is not None:
+            return _cacheable(not_modified, etag)
+
+        try:
+            if params.get("view") == "pareto":
+                variants = encode_variants(encode_json(pareto_results(params)), [encoding])
+                return _ranked_response(variants, encoding, etag)
+        except ValueError:
+            return Response({"detail": "Invalid filter input."}, status=status.HTTP_400_BAD_REQUEST)
+
+        # Ranked payloads are cached pre-encoded and precompressed per catalogue
+        # version and normalized query, so a hit skips serialization, encoding
+        # and compression
+        key = ranked_cache_key(stamp, params)
+        if (variants := cache.get(key)) is not None:
+            return _ranked_response(variants, encoding, etag)
+
+        try:
+            variants = ranked_variants(params)
+        except ValueError:
+            return Response({"detail": "Invalid filter input."}, status=status.HTTP_400_BAD_REQUEST)
+        cache.set(key, variants, settings.RANKED_CACHE_TIMEOUT)
+        return _ranked_response(variants, encoding, etag)
+
+
+# Async twin of RecommendationView for ASGI servers: the ORM fetch and cache
+# lookups are awaited, and ranking runs on a bounded executor.
+async def async_recommendations(request):
+    if request.method != "GET":
+        return HttpResponseNotAllowed(["GET"])
+    params = request.GET
+    stamp = await acatalogue_stamp()
+    encoding = negotiate_encoding(request.META.get("HTTP_ACCEPT_ENCODING"))
+    etag = ranked_etag(stamp, params, encoding)
+    if (not_modified := get_conditional_response(request, etag=etag)) is not None:
+        return _cacheable(not_modified, etag)
+
+    try:
+        if params.get("view") == "pareto":
+            body = encode_json(await sync_to_async(pareto_results)(params))
+            return _ranked_response(encode_variants(body, [encoding]), encoding, etag)
+
+        key = ranked_cache_key(stamp, params)
+        if (variants := await cache.aget(key)) is not None:
+            return _ranked_response(variants, encoding, etag)
+
+        results = await sync_to_async(leaderboard_results)(params)
+        if results is None:
+            qs, index = await sync_to_async(filtered_queryset)(params)
+            rows = [row async for row in lean_values(qs)]
+    except ValueError:
+        return JsonResponse({"detail": "Invalid filter input."}, status=status.HTTP_400_BAD_REQUEST)
+
+    if results is None:
+        results = await arank_phones(rows, params, index)
+    variants = encode_variants(encode_json(results))
+    await cache.aset(key, variants, settings.RANKED_CACHE_TIMEOUT)
+    return _ranked_response(variants, encoding, etag)
+
+
+# Streamable export formats and their content types (Parquet is command-only)
+EXPORT_CONTENT_TYPES = {
+    "ndjson": "application/x-ndjson",
+    "arrow": "application/vnd.apache.arrow.stream",
+}
+
+# Stream the scored catalogue for analytics without touching the ranking path
+def export_catalogue(request):
+    if request.method != "GET":
+        return HttpResponseNotAllowed(["GET"])
+    fmt = request.GET.get("format", "ndjson")
+    if fmt not in EXPORT_CONTENT_TYPES or fmt not in available_formats():
+        return JsonResponse({"detail": f"Unsupported export format: {fmt}."}, status=400)
+
+    rows = export_rows()
+    body = iter_ndjson(rows) if fmt == "ndjson" else iter_arrow(rows)
+    response = StreamingHttpResponse(body, content_type=EXPORT_CONTENT_TYPES[fmt])
+    response["Content-Disposition"] = f'attachment; filename="catalogue.{fmt}"'
+    return response
+
+
+# Serve the precompressed variant the client accepts; tiny bodies only have identity
+def _ranked_response(variants, encoding, etag):
+    if encoding not in variants:
+        encoding = "identity"
+    return _cacheable(EncodedJSONResponse(variants[encoding], encoding=encoding), etag)
+
+
+# ETag plus CDN-friendly caching headers for ranked payloads; 304s vary like the 200s
+def _cacheable(response, etag):
+    response["ETag"] = etag
+    patch_vary_headers(response, ("Accept-Encoding",))
+    patch_cache_control(
+        response, public=True,
+        max_age=settings.RANKED_MAX_AGE,
+        stale_while_revalidate=settings.RANKED_STALE_WHILE_REVALIDATE,
+    )
+    return response
+
+
+class PhoneSearchView(APIView):
+    permission_classes = [AllowAny]
+
+    # Fuzzy lookup by brand/model/slug over the in-memory trigram index
+    def get(self, request):
+        q = (request.query_params.get("q") or "").strip()
+        if not q:
+            return Response({"detail": "Missing search query."}, status=status.HTTP_400_BAD_REQUEST)
+        try:
+            limit = max(1, min(int(request.query_params.get("limit", 10)), SEARCH_MAX_LIMIT))
+        except ValueError:
+            return Response({"detail": "Invalid filter input."}, status=status.HTTP_400_BAD_REQUEST)
+        return Response(get_search_index().search(q, limit=limit))
+
+
+class PhoneCompareView(APIView):
+    permission_classes = [AllowAny]
+
+    # Side-by-side columns for ?slugs=a,b,c
+    def get(self, request):
+        return self._compare(request.query_params.get("slugs") or "")
 
-        qs = Phone.objects.all()
+    # Same comparison with {"slugs": [...]} (or a bare list) in the body, for long lists
+    def post(self, request):
+        data = request.data
+        return self._compare(data.get("slugs") or [] if hasattr(data, "get") else data)
 
-        # Apply query parameter filters
+    def _compare(self, raw):
         try:
-            if (v := request.query_params.get("max_price")):
-                qs = qs.filter(price_sgd__lte=Decimal(v))
-        except (ValueError, InvalidOperation):
+            slugs = parse_slugs(raw)
+        except ValueError:
             return Response({"detail": "Invalid filter input."}, status=status.HTTP_400_BAD_REQUEST)
+        if not slugs:
+            return Response({"detail": "Missing slugs."}, status=status.HTTP_400_BAD_REQUEST)
+        if len(slugs) > COMPARE_MAX_SLUGS:
+            return Response({"detail": f"At most {COMPARE_MAX_SLUGS} phones per comparison."},
+                            status=status.HTTP_400_BAD_REQUEST)
 
-        if (v := request.query_params.get("brand")):
-            qs = qs.filter(brand__iexact=v)
-
-        # Compute raw and SmartBuy scores
-        results = []
-        for phone in qs:
-            smartbuy, raw, breakdown = calculate_smartbuy_score(phone, mode=scoring_mode)
-            data = PhoneSerializer(phone).data
-            data["smartbuy_score"] = float(smartbuy)
-            data["raw_score"] = float(raw)
-            data["score_breakdown"] = breakdown
-            data["_id"] = data.get("slug") or str(data.get("id"))  # stable identifier
-            results.append(data)
-
-        if not results:
-            return Response([])
-
-        # Continuous normalizers
-        raw_vals = [p["raw_score"] for p in results]
-        val_vals = [p["smartbuy_score"] for p in results]
-        raw_min, raw_max = min(raw_vals), max(raw_vals)
-        val_min, val_max = min(val_vals), max(val_vals)
-
-        def _norm(x, lo, hi):
-            return 0.5 if hi <= lo else (x - lo) / (hi - lo)
-
-        # Rank-based normalizers
-        ranked_by_raw = sorted(results, key=lambda x: x["raw_score"], reverse=True)
-        ranked_by_val = sorted(results, key=lambda x: x["smartbuy_score"], reverse=True)
-        raw_ranks = {p["_id"]: i for i, p in enumerate(ranked_by_raw)}
-        val_ranks = {p["_id"]: i for i, p in enumerate(ranked_by_val)}
-        max_rank = len(results) - 1 or 1
-
-        # Final blended scoring
-        for p in results:
-            raw_norm_c = _norm(p["raw_score"], raw_min, raw_max)
-            val_norm_c = _norm(p["smartbuy_score"], val_min, val_max)
-            raw_norm_r = 1 - (raw_ranks[p["_id"]] / max_rank)
-            val_norm_r = 1 - (val_ranks[p["_id"]] / max_rank)
-
-            # Blend continuous + rank-based
-            raw_norm = 0.7 * raw_norm_c + 0.3 * raw_norm_r
-            val_norm = 0.7 * val_norm_c + 0.3 * val_norm_r
-
-            # Guardrails adjust value normalization
-            if p["raw_score"] < 6.0:
-                val_norm *= 0.85
-            elif p["raw_score"] >= 7.5:
-                val_norm *= 1.05
-
-            # Mode-specific weighting of raw vs value
-            if mode == "budget":
-                score = 0.30 * raw_norm + 0.70 * val_norm
-            elif mode == "midrange":
-                score = 0.50 * raw_norm + 0.50 * val_norm
-            elif mode == "flagship":
-                score = 0.90 * raw_norm + 0.10 * val_norm
-            else:
-                score = 0.30 * raw_norm + 0.70 * val_norm
-
-            # Safe price parsing for tiebreakers
-            try:
-                price_val = float(p.get("price_sgd", float("inf")))
-            except (TypeError, ValueError):
-                price_val = float("inf")
-
-            p["_raw_norm"] = round(raw_norm, 6)
-            p["_val_norm"] = round(val_norm, 6)
-            p["_price"] = price_val
-            p["score"] = round(score, 6)
-
-        # Sort with deterministic tiebreakers
-        results.sort(
-            key=lambda x: (x["score"], x["_raw_norm"], x["_val_norm"], -x["_price"]),
-            reverse=True,
-        )
-
-        # Cleanup temporary fields
-        for p in results:
-            p.pop("_raw_norm", None)
-            p.pop("_val_norm", None)
-            p.pop("_price", None)
-            p.pop("_id", None)
-
-        return Response(results)
+        result = compare(get_catalogue(), slugs)
+        if not result["slugs"]:
+            return Response({"detail": "Not found."}, status=status.HTTP_404_NOT_FOUND)
+        return Response(result)
+
+
+class SimilarPhonesView(APIView):
+    permission_classes = [AllowAny]
+
+    # k nearest phones by normalized breakdown + price vector
+    def get(self, request, slug):
+        params = request.query_params
+        try:
+            k = max(1, min(int(params.get("k", 5)), SIMILAR_MAX_K))
+            max_price = parse_bound(v) if (v := params.get("max_price")) else None
+        except ValueError:
+            return Response({"detail": "Invalid filter input."}, status=status.HTTP_400_BAD_REQUEST)
+        exclude = (params.get("exclude_brand") or "").split(",")
+
+        hits = get_similarity_index().similar(slug, k=k, max_price=max_price, exclude_brands=exclude)
+        if hits is None:
+            return Response({"detail": "Not found."}, status=status.HTTP_404_NOT_FOUND)
+        return Response(hits)
+
+
+class PhoneExplainView(APIView):
+    permission_classes = [AllowAny]
+
+    # Per-section tier trace (threshold hit, next tier, score gain); built lazily per phone
+    def get(self, request, slug):
+        result = explain(get_catalogue(), slug)
+        if result is None:
+            return Response({"detail": "Not found."}, status=status.HTTP_404_NOT_FOUND)
+        return Response(result)
+
+
+class PriceHistoryView(APIView):
+    permission_classes = [AllowAny]
+
+    # Downsampled price steps plus the rolling columns used by value scoring
+    def get(self, request, slug):
+        params = request.query_params
+        try:
+            days = max(1, min(int(params.get("days", 365)), PRICE_HISTORY_MAX_DAYS))
+            points = max(1, min(int(params.get("points", 90)), PRICE_HISTORY_MAX_POINTS))
+        except ValueError:
+            return Response({"detail": "Invalid filter input."}, status=status.HTTP_400_BAD_REQUEST)
+        phone = Phone.objects.filter(slug=slug).first()
+        if phone is None:
+            return Response({"detail": "Not found."}, status=status.HTTP_404_NOT_FOUND)
+
+        def num(v):
+            return float(v) if v is not None else None
+
+        history = price_history(phone, days=days, points=points)
+        return Response({
+            "slug": phone.slug,
+            "price_sgd": num(phone.price_sgd),
+            "price_min_90d": num(phone.price_min_90d),
+            "price_avg_90d": num(phone.price_avg_90d),
+            "points": [
+                {"t": p["t"], "price": num(p["price"]), "min": num(p["min"]), "max": num(p["max"])}
+                for p in history
+            ],
+        })
+
+
+class SimulateView(APIView):
+    permission_classes = [AllowAny]
+
+    # What-if ranks for {"overrides": {slug: {field: value}}} under the query string's mode/filters
+    def post(self, request):
+        data = request.data
+        try:
+            overrides = parse_overrides(data.get("overrides") if hasattr(data, "get") else None)
+            result = simulate(get_catalogue(), request.query_params, overrides)
+        except ValueError:
+            return Response({"detail": "Invalid filter input."}, status=status.HTTP_400_BAD_REQUEST)
+        if not result["results"]:
+            return Response({"detail": "Not found."}, status=status.HTTP_404_NOT_FOUND)
+        return Response(result)
+
+
+class ChangeCursorPagination(CursorPagination):
+    ordering = "id"
+    page_size = 100
+    page_size_query_param = "limit"
+    max_page_size = 1000
+
+
+class ChangeFeedView(generics.ListAPIView):
+    permission_classes = [AllowAny]
+    serializer_class = CatalogueChangeSerializer
+    pagination_class = ChangeCursorPagination
+
+    # Changes published after catalogue version ?since=, oldest first
+    def get_queryset(self):
+        since = self.request.query_params.get("since") or "0"
+        return CatalogueChange.objects.filter(version__gt=int(since))
+
+    def list(self, request, *args, **kwargs):
+        try:
+            return super().list(request, *args, **kwargs)
+        except ValueError:
+            return Response({"detail": "Invalid filter input."}, status=status.HTTP_400_BAD_REQUEST)
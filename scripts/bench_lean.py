@@ -0,0 +1,94 @@
+"""Benchmark the per-row cost of the ranking data path.
+
+Compares Phone model instances + PhoneSerializer (the old path) with the
+values_list lean path used by rank_phones and the catalogue build, on a
+throwaway in-memory test database filled with synthetic phones.
+
+    python scripts/bench_lean.py [rows] [repeats]
+"""
+import os
+import sys
+import time
+from datetime import datetime, timezone
+from decimal import Decimal
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "smartbuy.settings")
+
+import django
+django.setup()
+
+from django.db import connection
+from django.test.utils import setup_test_environment
+from phones.catalogue import _build_catalogue
+from phones.models import Phone
+from phones.ranking import card_from_row, lean_values, spec_from_row
+from phones.rescore import rescore
+from phones.scoring import calculate_smartbuy_score
+from phones.serializers import PhoneSerializer
+
+# Synthetic phones with every column populated
+def make_phones(n: int):
+    now = datetime.now(timezone.utc)
+    Phone.objects.bulk_create([Phone(
+        model=f"Phone {i}", slug=f"phone-{i}", brand=("Samsung", "Google", "Xiaomi")[i % 3],
+        source_url="https://example.com/p", warranty="1", chipset="Snapdragon 7 Gen 3", gpu="Adreno 720",
+        soc_score=4 + i % 6, ram_gb=8.0, storage_gb=256.0, battery_mah=5000, display_in=6.7,
+        refresh_hz=120, ppi=400, display_type="oled", charging_w=45, main_mp=50, front_mp=16,
+        camera_main_mp="50MP + 12MP", res_w=1080, res_h=2400, bt_ver=5.3, weight_g=190.0, thickness_mm=8.1,
+        has_nfc=True, has_fast_charging=True, has_5g=True, has_wireless_charging=False,
+        has_reverse_wireless_charging=False, has_ois=True, has_stereo_speakers=True, has_aptx=False,
+        has_ldac=False, glass_type="Gorilla Glass 5", ip_rating="IP68", mohs=None,
+        price_sgd=Decimal("299.00") + i, price_url="https://example.com/x", scraped_at=now,
+    ) for i in range(n)], batch_size=500)
+
+def model_path():
+    out = []
+    for phone in Phone.objects.all():
+        smartbuy, raw, breakdown = calculate_smartbuy_score(phone)
+        out.append(dict(PhoneSerializer(phone).data))
+    return out
+
+def lean_path():
+    out = []
+    for row in lean_values(Phone.objects.all()):
+        smartbuy, raw, breakdown = calculate_smartbuy_score(spec_from_row(row))
+        out.append(card_from_row(row))
+    return out
+
+def fetch_models():
+    return list(Phone.objects.all())
+
+def fetch_lean():
+    return list(lean_values(Phone.objects.all()))
+
+def bench(label: str, fn, n: int, repeats: int) -> None:
+    fn()
+    t0 = time.perf_counter()
+    for _ in range(repeats):
+        fn()
+    per_row = (time.perf_counter() - t0) / repeats / n
+    print(f"{label:<22} {per_row * 1e6:8.2f} us/row")
+
+def main() -> None:
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 5000
+    repeats = int(sys.argv[2]) if len(sys.argv) > 2 else 5
+
+    setup_test_environment()
+    old_name = connection.creation.create_test_db(verbosity=0)
+    try:
+        make_phones(n)
+        print(f"{n} rows, {repeats} repeats")
+        bench("fetch: model instances", fetch_models, n, repeats)
+        bench("fetch: values_list", fetch_lean, n, repeats)
+        bench("model + serializer", model_path, n, repeats)
+        bench("lean path", lean_path, n, repeats)
+        bench("catalogue: stale", lambda: _build_catalogue(0, "0"), n, repeats)
+        rescore()
+        bench("catalogue: stored", lambda: _build_catalogue(0, "0"), n, repeats)
+    finally:
+        connection.creation.destroy_test_db(old_name, verbosity=0)
+
+if __name__ == "__main__":
+    main()
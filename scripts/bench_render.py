@@ -0,0 +1,63 @@
+"""Benchmark JSON encoding of a ranked recommendations payload.
+
+Compares DRF's JSONRenderer, the orjson-backed renderer and a cache hit
+(pre-encoded bytes) on a synthetic list shaped like /api/recommendations/.
+
+    python scripts/bench_render.py [rows] [repeats]
+"""
+import os
+import sys
+import time
+from datetime import datetime, timezone
+from decimal import Decimal
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "smartbuy.settings")
+
+import django
+django.setup()
+
+from rest_framework.renderers import JSONRenderer
+from phones.renderers import ORJSONRenderer, encode_json
+
+SECTIONS = ("soc", "ram", "storage", "display", "camera", "battery", "charging", "extras", "durability", "protection")
+
+# One row per phone with the fields the ranked payload carries
+def make_rows(n: int):
+    now = datetime.now(timezone.utc)
+    return [{
+        "model": f"Phone {i}", "slug": f"phone-{i}", "brand": "Brand", "source_url": "https://example.com/p",
+        "warranty": "1", "scraped_at": now, "price_sgd": Decimal("399.00") + i, "price_url": "https://example.com/x",
+        "soc_score": 7, "chipset": "Snapdragon 7 Gen 3", "gpu": "Adreno 720", "bt_ver": 5.3,
+        "ram_gb": 8.0, "storage_gb": 256.0, "display_in": 6.7, "refresh_hz": 120, "ppi": 400,
+        "res_w": 1080, "res_h": 2400, "display_type": "oled", "battery_mah": 5000, "charging_w": 45,
+        "main_mp": 50, "camera_main_mp": "50MP + 12MP", "front_mp": 16, "has_ois": True,
+        "has_5g": True, "has_nfc": True, "has_fast_charging": True, "has_wireless_charging": False,
+        "has_reverse_wireless_charging": False, "has_stereo_speakers": True, "has_aptx": False, "has_ldac": False,
+        "glass_type": "Gorilla Glass 5", "mohs": None, "ip_rating": "IP68",
+        "smartbuy_score": 1.8 + i / n, "raw_score": 7.1, "score": 0.5,
+        "score_breakdown": {s: 6.5 for s in SECTIONS},
+    } for i in range(n)]
+
+def bench(label: str, fn, repeats: int) -> None:
+    fn()
+    t0 = time.perf_counter()
+    for _ in range(repeats):
+        size = len(fn())
+    per_req = (time.perf_counter() - t0) / repeats
+    print(f"{label:<14} {per_req * 1000:8.2f} ms/request  {size / per_req / 1e6:10.1f} MB/s  ({size} bytes)")
+
+def main() -> None:
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 1000
+    repeats = int(sys.argv[2]) if len(sys.argv) > 2 else 50
+    rows = make_rows(n)
+    cached = encode_json(rows)
+
+    print(f"{n} rows, {repeats} repeats")
+    bench("JSONRenderer", lambda: JSONRenderer().render(rows), repeats)
+    bench("ORJSONRenderer", lambda: ORJSONRenderer().render(rows), repeats)
+    bench("cache hit", lambda: cached, repeats)
+
+if __name__ == "__main__":
+    main()
@@ -3,6 +3,10 @@ from datetime import datetime
 from pathlib import Path
 from typing import Dict, Any, Optional, Tuple
 
+# Model-name casing is shared with the search index in the phones app
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from phones.normalize import tidy_model_case
+
 # Load SoC scores from a local JSON map
 SOC_SCORE_PATH = Path("soc_scores.json")
 try:
@@ -74,14 +78,6 @@ def canonical_display(raw: Optional[str]) -> Optional[str]:
         return "lcd_other"
     return None
 
-# Fix common casing issues in model strings
-def tidy_model_case(m: Optional[str]) -> Optional[str]:
-    if not m:
-        return None
-    m = re.sub(r"\biphone\b", "iPhone", m, flags=re.I)
-    m = re.sub(r"gb\b", "GB", m, flags=re.I)
-    return m.strip()
-
 # Convert checkmarks/yes/no glyphs and text to booleans
 def to_bool(x) -> Optional[bool]:
     if x is None or isinstance(x, bool):
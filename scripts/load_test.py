@@ -0,0 +1,80 @@
+"""Compare the WSGI and ASGI recommendation endpoints under concurrent load.
+
+Start one worker per server, e.g.:
+    gunicorn smartbuy.wsgi -w 1 --threads 8 -b 127.0.0.1:8000
+    uvicorn smartbuy.asgi:application --workers 1 --port 8001
+
+then run:
+    python scripts/load_test.py http://127.0.0.1:8000/api/recommendations/ \
+        http://127.0.0.1:8001/api/recommendations/async/ --concurrency 64 --requests 2000
+"""
+import argparse
+import asyncio
+import statistics
+import time
+from urllib.parse import urlencode, urlsplit
+
+# Query mix that mirrors the frontend's mode -> brand -> list flow
+QUERIES = [
+    {"mode": "budget"},
+    {"mode": "midrange"},
+    {"mode": "flagship"},
+    {"mode": "budget", "max_price": "500"},
+    {"mode": "midrange", "brand": "Samsung"},
+    {"mode": "flagship", "has_5g": "1", "min_ram": "12"},
+]
+
+# Minimal HTTP/1.1 GET over asyncio streams so the client itself never needs threads
+async def fetch(url: str) -> int:
+    parts = urlsplit(url)
+    reader, writer = await asyncio.open_connection(parts.hostname, parts.port or 80)
+    path = parts.path + (f"?{parts.query}" if parts.query else "")
+    writer.write(f"GET {path} HTTP/1.1\r\nHost: {parts.netloc}\r\nConnection: close\r\n\r\n".encode())
+    await writer.drain()
+    status_line = await reader.readline()
+    await reader.read()
+    writer.close()
+    await writer.wait_closed()
+    return int(status_line.split()[1])
+
+async def run(base_url: str, concurrency: int, total: int) -> dict:
+    latencies, errors = [], 0
+    sem = asyncio.Semaphore(concurrency)
+
+    async def one(i: int):
+        nonlocal errors
+        url = f"{base_url}?{urlencode(QUERIES[i % len(QUERIES)])}"
+        async with sem:
+            t0 = time.perf_counter()
+            try:
+                status = await fetch(url)
+            except OSError:
+                status = 0
+            latencies.append(time.perf_counter() - t0)
+            errors += status != 200
+
+    t0 = time.perf_counter()
+    await asyncio.gather(*(one(i) for i in range(total)))
+    elapsed = time.perf_counter() - t0
+
+    latencies.sort()
+    return {
+        "rps": total / elapsed,
+        "p50_ms": statistics.median(latencies) * 1000,
+        "p99_ms": latencies[int(len(latencies) * 0.99) - 1] * 1000,
+        "errors": errors,
+    }
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("urls", nargs="+", help="Endpoints to compare")
+    parser.add_argument("--concurrency", type=int, default=64)
+    parser.add_argument("--requests", type=int, default=2000)
+    args = parser.parse_args()
+
+    for url in args.urls:
+        r = asyncio.run(run(url, args.concurrency, args.requests))
+        print(f"{url}\n  {r['rps']:.1f} req/s  p50={r['p50_ms']:.1f}ms  p99={r['p99_ms']:.1f}ms  errors={r['errors']}")
+
+if __name__ == "__main__":
+    main()
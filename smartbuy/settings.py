@@ -28,6 +28,8 @@ INSTALLED_APPS = [
 # Middleware stack
 MIDDLEWARE = [
     "django.middleware.security.SecurityMiddleware",
+    # Compresses other responses; precompressed API payloads pass through untouched
+    "django.middleware.gzip.GZipMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
     "django.middleware.common.CommonMiddleware",
     "django.middleware.csrf.CsrfViewMiddleware",
@@ -68,6 +70,34 @@ DATABASES = {
     }
 }
 
+# Django REST framework: orjson-backed JSON output (falls back to json if orjson is missing)
+REST_FRAMEWORK = {
+    "DEFAULT_RENDERER_CLASSES": [
+        "phones.renderers.ORJSONRenderer",
+        "rest_framework.renderers.BrowsableAPIRenderer",
+    ],
+}
+
+# Cache for ranked recommendation payloads (use a shared backend across workers)
+CACHES = {
+    "default": {
+        "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+    }
+}
+# Keys embed the catalogue version, so entries never go stale; the timeout only bounds memory
+RANKED_CACHE_TIMEOUT = 60 * 60
+# Cache-Control for ranked payloads; clients and CDNs revalidate with If-None-Match
+RANKED_MAX_AGE = 60
+RANKED_STALE_WHILE_REVALIDATE = 300
+# Shared mmap'd catalogue file for all workers (None builds per process from the ORM)
+CATALOGUE_SNAPSHOT_PATH = None
+# Chipset -> SoC score map; imports quarantine chipsets missing from it (None skips the check)
+SOC_SCORES_PATH = BASE_DIR / "data" / "soc_scores.json"
+# max_price caps primed by the warm_recommendations command
+WARM_PRICE_CAPS = [300, 500, 800, 1200]
+# Threads that rank phones for the async recommendations endpoint
+RANKING_WORKERS = 4
+
 # Password validation rules
 AUTH_PASSWORD_VALIDATORS = [
     {"NAME": "django.contrib.auth.password_validation.UserAttributeSimilarityValidator"},
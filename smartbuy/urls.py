@@ -1,9 +1,21 @@
 from django.contrib import admin
 from django.urls import path
-from phones.views import RecommendationView
+from phones.views import (
+    ChangeFeedView, PhoneCompareView, PhoneExplainView, PhoneSearchView, RecommendationView, SimilarPhonesView, async_recommendations,
+    PriceHistoryView, SimulateView, export_catalogue,
+)
 
 urlpatterns = [
     path("admin/", admin.site.urls),
     path("api/recommendations/", RecommendationView.as_view(), name="recommendation"),
+    path("api/recommendations/async/", async_recommendations, name="recommendation-async"),
+    path("api/simulate/", SimulateView.as_view(), name="simulate"),
+    path("api/changes/", ChangeFeedView.as_view(), name="changes"),
+    path("api/phones/search/", PhoneSearchView.as_view(), name="phone-search"),
+    path("api/phones/export/", export_catalogue, name="phone-export"),
+    path("api/phones/compare/", PhoneCompareView.as_view(), name="phone-compare"),
+    path("api/phones/<slug:slug>/similar/", SimilarPhonesView.as_view(), name="phone-similar"),
+    path("api/phones/<slug:slug>/explain/", PhoneExplainView.as_view(), name="phone-explain"),
+    path("api/phones/<slug:slug>/prices/", PriceHistoryView.as_view(), name="phone-prices"),
 
 ]